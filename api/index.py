@@ -1,14 +1,31 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import json
 import urllib.request
 import os
+import sys
 from datetime import datetime
 
+# Shared scanner infrastructure lives in the v2 project tree
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'enhanced-squeeze-scanner-v2'))
+
+from scanner_core.credit_budget import credit_budget
+from scanner_core.http_client import http_client
+from scanner_core.ortex_client import ortex_client, ortex_headers
+from scanner_core.scoring_profiles import profile_registry, score_profiles, summarize
+from scanner_core.static_assets import page_cache
+
 app = Flask(__name__)
 
-@app.route('/')
-def index():
-    return '''<!DOCTYPE html>
+# US first, then NASDAQ - the endpoint memo remembers which one works per ticker
+ORTEX_SHORT_INTEREST_ENDPOINTS = [
+    'https://api.ortex.com/api/v1/stock/us/{ticker}/short_interest?format=json',
+    'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
+]
+ORTEX_CTB_ENDPOINTS = [
+    'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/ctb/new',
+]
+
+INDEX_HTML = '''<!DOCTYPE html>
 <html><head><title>Enhanced Squeeze Scanner v2.0</title><meta name="viewport" content="width=device-width,initial-scale=1">
 <style>
 body{font-family:Arial,sans-serif;margin:0;padding:20px;background:linear-gradient(135deg,#0f172a 0%,#1e293b 50%,#334155 100%);color:white;min-height:100vh}
@@ -165,6 +182,14 @@ window.addEventListener('load', () => {
 </script>
 </body></html>'''
 
+@app.route('/')
+def index():
+    # Encoded, compressed and ETagged once per process; repeat visits get a 304
+    status, headers, body = page_cache.respond(page_cache.page('index', INDEX_HTML),
+                                               request.headers.get('Accept-Encoding'),
+                                               request.headers.get('If-None-Match'))
+    return Response(body, status=status, headers=headers)
+
 @app.route('/api/scan', methods=['POST'])
 def scan():
     try:
@@ -175,6 +200,14 @@ def scan():
         if not ortex_key:
             return jsonify({'success': False, 'error': 'Ortex API key required'})
         
+        # The 'index' profile is this app's formula; scoring_profile / profiles pick others by name
+        try:
+            primary_profile, profiles = profile_registry.selection(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        scoring = primary_profile or profile_registry.get('index')
+        profiles = [scoring] + [profile for profile in profiles if profile is not scoring]
+        
         tickers = [t.strip().upper() for t in tickers_input.replace(',', ' ').split() if t.strip()]
         tickers = tickers[:10]  # Increased limit
         
@@ -192,7 +225,7 @@ def scan():
                 price_change_pct = 0
                 volume = 0
                 
-                with urllib.request.urlopen(req, timeout=5) as response:
+                with http_client.urlopen(req, timeout=5) as response:
                     price_data = json.loads(response.read())
                     
                     if 'chart' in price_data and price_data['chart']['result']:
@@ -210,63 +243,34 @@ def scan():
                 credits_used = 0
                 data_sources = []
                 
-                # Try multiple Ortex endpoints
-                ortex_endpoints = [
-                    f"https://api.ortex.com/api/v1/stock/us/{ticker}/short_interest?format=json",
-                    f"https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest",
-                ]
-                
-                for endpoint in ortex_endpoints:
-                    try:
-                        ortex_req = urllib.request.Request(endpoint)
-                        ortex_req.add_header('Ortex-Api-Key', ortex_key)
-                        ortex_req.add_header('User-Agent', 'Enhanced-Ultimate-Squeeze-Scanner/2.0')
-                        
-                        with urllib.request.urlopen(ortex_req, timeout=8) as ortex_response:
-                            if ortex_response.getcode() == 200:
-                                ortex_data = json.loads(ortex_response.read())
-                                if 'rows' in ortex_data and ortex_data['rows']:
-                                    row = ortex_data['rows'][0]
-                                    short_interest = row.get('shortInterestPcFreeFloat', 0)
-                                    credits_used += ortex_data.get('creditsUsed', 0)
-                                    data_sources.append('ortex_si')
-                                    break
-                    except:
-                        continue
+                # Metered through ortex_client: a refused credit reservation reads as no data
+                headers = ortex_headers(ortex_key, 'Enhanced-Ultimate-Squeeze-Scanner/2.0')
+                with credit_budget.caller('index_scan'):
+                    _, ortex_data = ortex_client.fetch_json(ticker, 'short_interest', ORTEX_SHORT_INTEREST_ENDPOINTS,
+                                                            headers, timeout=8)
+                    _, ctb_data = ortex_client.fetch_json(ticker, 'cost_to_borrow', ORTEX_CTB_ENDPOINTS,
+                                                          headers, timeout=5)
                 
-                # Try cost to borrow endpoint
-                try:
-                    ctb_req = urllib.request.Request(f"https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/ctb/new")
-                    ctb_req.add_header('Ortex-Api-Key', ortex_key)
-                    with urllib.request.urlopen(ctb_req, timeout=5) as ctb_response:
-                        ctb_data = json.loads(ctb_response.read())
-                        if 'rows' in ctb_data and ctb_data['rows']:
-                            cost_to_borrow = ctb_data['rows'][0].get('costToBorrow', 0)
-                            credits_used += ctb_data.get('creditsUsed', 0)
-                            data_sources.append('ortex_ctb')
-                except:
-                    pass
+                if isinstance(ortex_data, dict) and ortex_data.get('rows'):
+                    short_interest = ortex_data['rows'][0].get('shortInterestPcFreeFloat', 0)
+                    credits_used += ortex_data.get('creditsUsed', 0)
+                    data_sources.append('ortex_si')
                 
-                # Enhanced squeeze score calculation
-                score = 0
-                score += min(short_interest * 1.5, 40)  # Short Interest (0-40 points)
-                score += min(cost_to_borrow * 1.2, 25)  # Cost to Borrow (0-25 points)
-                score += min(max(0, price_change_pct) * 0.8, 15)  # Price momentum (0-15 points)
+                if isinstance(ctb_data, dict) and ctb_data.get('rows'):
+                    cost_to_borrow = ctb_data['rows'][0].get('costToBorrow', 0)
+                    credits_used += ctb_data.get('creditsUsed', 0)
+                    data_sources.append('ortex_ctb')
                 
-                squeeze_score = min(int(score), 100)
+                # Squeeze score and risk classification from the selected scoring profile(s)
+                scores = score_profiles(profiles, {'short_interest': short_interest, 'cost_to_borrow': cost_to_borrow},
+                                        {'price_change_pct': price_change_pct})
+                if 'error' in scores[scoring.name]:
+                    raise ValueError(scores[scoring.name]['error'])
+                squeeze_score = scores[scoring.name]['score']
+                risk_type = scores[scoring.name]['level']
                 total_credits += credits_used
                 
-                # Determine risk classification
-                if squeeze_score >= 80:
-                    risk_type = "EXTREME SQUEEZE RISK"
-                elif squeeze_score >= 60:
-                    risk_type = "HIGH SQUEEZE RISK"
-                elif squeeze_score >= 40:
-                    risk_type = "MODERATE SQUEEZE RISK"
-                else:
-                    risk_type = "Low Risk"
-                
-                results.append({
+                result = {
                     'ticker': ticker,
                     'current_price': round(current_price, 2),
                     'price_change_pct': round(price_change_pct, 2),
@@ -281,7 +285,10 @@ def scan():
                     },
                     'credits_used': credits_used,
                     'success': True
-                })
+                }
+                if len(profiles) > 1:
+                    result['profile_scores'] = summarize(scores)
+                results.append(result)
                         
             except Exception as e:
                 results.append({
@@ -301,6 +308,8 @@ def scan():
                     'success': False
                 })
         
+        profile_registry.record_pass(len(results), len(profiles))
+        
         # Sort by squeeze score
         results.sort(key=lambda x: x['squeeze_score'], reverse=True)
         
@@ -310,6 +319,7 @@ def scan():
             'total_tickers': len(results),
             'high_risk_count': len([r for r in results if r['squeeze_score'] >= 60]),
             'total_credits_used': total_credits,
+            'scoring_profile': scoring.name,
             'scan_timestamp': datetime.now().isoformat(),
             'message': f'Enhanced squeeze scan complete - {len(results)} tickers analyzed'
         })
@@ -317,6 +327,11 @@ def scan():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/credits')
+def credits():
+    """Ortex credit budgets, what is left, and spend per data type and per caller"""
+    return jsonify({'success': True, 'credits': credit_budget.stats()})
+
 @app.route('/api')
 def api_info():
     return jsonify({
@@ -325,6 +340,7 @@ def api_info():
         'endpoints': {
             '/': 'Enhanced Professional Homepage', 
             '/api/scan': 'Enhanced Squeeze Scan Endpoint',
+            '/api/credits': 'Ortex credit budgets and spend per caller',
             '/api': 'API Information'
         },
         'features': [
@@ -333,8 +349,11 @@ def api_info():
             'Advanced squeeze scoring algorithm',
             'Professional responsive UI',
             'Risk classification system',
-            'Auto-save API key functionality'
+            'Auto-save API key functionality',
+            'Pooled keep-alive connections for Ortex and Yahoo'
         ],
+        'http_pool': http_client.stats(),
+        'page_cache': page_cache.stats(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -1,21 +1,42 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, abort
 from flask_cors import CORS
 import os
 import json
 from .index import handler
+from scanner_core.static_assets import StaticFiles, page_cache
 
 app = Flask(__name__, 
             template_folder='../templates',
             static_folder='../static')
 CORS(app)
+static_files = StaticFiles(app.static_folder)
+
+def asset_response(response):
+    status, headers, body = response
+    return Response(body, status=status, headers=headers)
+
+@app.url_defaults
+def version_static_urls(endpoint, values):
+    if endpoint == 'static' and 'v' not in values:
+        version = static_files.version(values.get('filename', ''))
+        if version:
+            values['v'] = version
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    page = page_cache.render('index', lambda: render_template('index.html'))
+    return asset_response(page_cache.respond(page, request.headers.get('Accept-Encoding'),
+                                             request.headers.get('If-None-Match')))
+
+def send_static(filename):
+    response = static_files.respond(filename, request.args.get('v'), request.headers.get('Accept-Encoding'),
+                                    request.headers.get('If-None-Match'))
+    if response is None:
+        abort(404)
+    return asset_response(response)
 
-@app.route('/static/<path:path>')
-def send_static(path):
-    return send_from_directory('../static', path)
+# Replaces Flask's built-in /static/<filename> view with the precompressed one
+app.view_functions['static'] = send_static
 
 @app.route('/api/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE'])
 def api_handler(path):
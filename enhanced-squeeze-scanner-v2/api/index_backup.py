@@ -6,6 +6,15 @@ import os
 from datetime import datetime
 import time
 
+from scanner_core.circuit_breaker import ortex_breakers
+from scanner_core.hedged import price_racer
+from scanner_core.http_client import http_client
+from scanner_core.static_assets import page_cache
+from scanner_core.step_tables import professional_scorer
+
+# 'hedged' races price providers; 'sequential' tries them strictly in order
+PRICE_FETCH_MODE = os.environ.get('PRICE_FETCH_MODE', 'hedged')
+
 class handler(BaseHTTPRequestHandler):
     
     def validate_ortex_api_key(self, ortex_key):
@@ -48,7 +57,7 @@ class handler(BaseHTTPRequestHandler):
                     req.add_header('Accept', 'application/json')
                     req.add_header('Ortex-Api-Key', ortex_key)
                     
-                    with urllib.request.urlopen(req, timeout=10) as response:
+                    with http_client.urlopen(req, timeout=10) as response:
                         status = response.getcode()
                         content_type = response.headers.get('Content-Type', 'unknown')
                         data = response.read()[:500].decode('utf-8', errors='ignore')
@@ -109,7 +118,7 @@ class handler(BaseHTTPRequestHandler):
                         }
                         
                         req = urllib.request.Request(endpoint_url, headers=headers)
-                        with urllib.request.urlopen(req, timeout=15) as response:
+                        with http_client.urlopen(req, timeout=15) as response:
                             response_text = response.read().decode()
                             
                             result = {
@@ -243,7 +252,7 @@ class handler(BaseHTTPRequestHandler):
                 req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/2.1')
                 req.add_header('Accept', 'application/json')
                 
-                with urllib.request.urlopen(req, timeout=20) as response:
+                with http_client.urlopen(req, timeout=20) as response:
                     # Get all response details
                     status_code = response.getcode()
                     headers = dict(response.headers)
@@ -433,62 +442,62 @@ class handler(BaseHTTPRequestHandler):
             # ✅ DOCUMENTED endpoint from docs.ortex.com/reference/stock_availability_list
             {
                 'name': 'DOCUMENTED: Stock Availability',
-                'url': f"https://api.ortex.com/api/v1/stock/{ticker}/availability",
+                'url': "https://api.ortex.com/api/v1/stock/{ticker}/availability",
                 'priority': 'highest'  # This is confirmed to exist!
             },
             # From your screenshots - these looked like real endpoints
             {
                 'name': 'Short Interest Estimates', 
-                'url': f"https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest",
+                'url': "https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest",
                 'priority': 'high'
             },
             {
                 'name': 'NYSE Short Interest',
-                'url': f"https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest", 
+                'url': "https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest", 
                 'priority': 'high'
             },
             # Try other potential patterns
             {
                 'name': 'Cost to Borrow',
-                'url': f"https://api.ortex.com/api/v1/stock/{ticker}/ctb",
+                'url': "https://api.ortex.com/api/v1/stock/{ticker}/ctb",
                 'priority': 'high'
             },
             {
                 'name': 'Utilization',
-                'url': f"https://api.ortex.com/api/v1/stock/{ticker}/utilization",
+                'url': "https://api.ortex.com/api/v1/stock/{ticker}/utilization",
                 'priority': 'high'
             },
             # Strategy 3: Specialized endpoints (from screenshots)
             {
                 'name': 'Short Interest Estimates',
-                'url': f"https://api.ortex.com/short-interest/estimates/{ticker}",
+                'url': "https://api.ortex.com/short-interest/estimates/{ticker}",
                 'priority': 'medium'
             },
             {
                 'name': 'Short Availability',
-                'url': f"https://api.ortex.com/short-interest/availability/{ticker}",
+                'url': "https://api.ortex.com/short-interest/availability/{ticker}",
                 'priority': 'medium'
             },
             {
                 'name': 'Cost to Borrow',
-                'url': f"https://api.ortex.com/cost-to-borrow/{ticker}",
+                'url': "https://api.ortex.com/cost-to-borrow/{ticker}",
                 'priority': 'medium'
             },
             # Strategy 4: Alternative domain formats
             {
                 'name': 'Public Ortex API',
-                'url': f"https://public.ortex.com/api/short-interest/{ticker}",
+                'url': "https://public.ortex.com/api/short-interest/{ticker}",
                 'priority': 'low'
             },
             {
                 'name': 'Data Ortex API',
-                'url': f"https://data.ortex.com/api/v1/short/{ticker}",
+                'url': "https://data.ortex.com/api/v1/short/{ticker}",
                 'priority': 'low'
             },
             # Strategy 5: REST-style endpoints
             {
                 'name': 'REST Short Interest',
-                'url': f"https://api.ortex.com/rest/short-interest/{ticker}",
+                'url': "https://api.ortex.com/rest/short-interest/{ticker}",
                 'priority': 'low'
             }
         ]
@@ -510,9 +519,16 @@ class handler(BaseHTTPRequestHandler):
         
         # Try each endpoint strategy
         for strategy in endpoint_strategies:
-            url = strategy['url']
+            template = strategy['url']
+            url = template.format(ticker=ticker)
             strategy_name = strategy['name']
             
+            # Skip endpoint families whose breaker is open instead of waiting out their timeouts
+            if not ortex_breakers.allow(template):
+                print(f"  ⏭️ {strategy_name} skipped - circuit open")
+                continue
+            timeout = ortex_breakers.timeout_for(template, 20)
+            
             try:
                 print(f"  🔍 Trying {strategy_name}...")
                 
@@ -547,9 +563,16 @@ class handler(BaseHTTPRequestHandler):
                             req = urllib.request.Request(url_with_key, headers={'User-Agent': headers['User-Agent']})
                         else:
                             req = urllib.request.Request(url, headers=headers)
-                        with urllib.request.urlopen(req, timeout=20) as response:
+                        started = time.monotonic()
+                        with http_client.urlopen(req, timeout=timeout) as response:
                             response_text = response.read().decode()
                             
+                            # An HTML page means the endpoint family is not an API - count it against the breaker
+                            if response_text.lstrip()[:15].lower().startswith(('<!doctype', '<html')):
+                                ortex_breakers.record_failure(template)
+                            else:
+                                ortex_breakers.record_success(template, time.monotonic() - started)
+                            
                             if response.status == 200:
                                 if response_text.strip():  # Check if response has content
                                     try:
@@ -592,6 +615,10 @@ class handler(BaseHTTPRequestHandler):
                                 
                     except urllib.error.HTTPError as http_e:
                         status_code = http_e.code
+                        if status_code >= 500:
+                            ortex_breakers.record_failure(template)
+                        else:
+                            ortex_breakers.record_success(template, time.monotonic() - started)
                         if status_code == 404:
                             print(f"  ❌ {strategy_name} - 404 Not Found (wrong endpoint)")
                         elif status_code == 401:
@@ -608,6 +635,9 @@ class handler(BaseHTTPRequestHandler):
                                 print(f"  ❌ {strategy_name} - Invalid domain/URL")
                             else:
                                 print(f"  ⚠️ {strategy_name} error: {error_msg}")
+                        ortex_breakers.record_failure(template)
+                        if not ortex_breakers.allow(template):
+                            break  # Breaker tripped - stop cycling auth methods against a dead endpoint
                         continue  # Try next auth method
                         
             except Exception as e:
@@ -835,15 +865,22 @@ class handler(BaseHTTPRequestHandler):
             ('Financial Modeling Prep (Free)', self.get_fmp_price)
         ]
         
-        for api_name, api_func in apis_to_try:
-            try:
-                result = api_func(ticker)
-                if result:
-                    print(f"✅ Price data from {api_name} for {ticker}")
-                    return result
-            except Exception as e:
-                print(f"⚠️  {api_name} failed for {ticker}: {e}")
-                continue
+        if PRICE_FETCH_MODE == 'hedged':
+            # Race providers: backups launch after an adaptive hedge delay or as soon as one fails
+            api_name, result = price_racer.race(apis_to_try, ticker)
+            if result:
+                print(f"✅ Price data from {api_name} for {ticker}")
+                return result
+        else:
+            for api_name, api_func in apis_to_try:
+                try:
+                    result = api_func(ticker)
+                    if result:
+                        print(f"✅ Price data from {api_name} for {ticker}")
+                        return result
+                except Exception as e:
+                    print(f"⚠️  {api_name} failed for {ticker}: {e}")
+                    continue
         
         print(f"⚠️  All price APIs failed for {ticker}, using mock data")
         return self.get_mock_price_data(ticker)
@@ -857,7 +894,7 @@ class handler(BaseHTTPRequestHandler):
         }
         
         req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with http_client.urlopen(req, timeout=10) as response:
             if response.status == 200:
                 data = json.loads(response.read().decode())
                 
@@ -890,7 +927,7 @@ class handler(BaseHTTPRequestHandler):
         headers = {'User-Agent': 'Ultimate-Squeeze-Scanner/2.0'}
         
         req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with http_client.urlopen(req, timeout=10) as response:
             if response.status == 200:
                 data = json.loads(response.read().decode())
                 
@@ -920,7 +957,7 @@ class handler(BaseHTTPRequestHandler):
         headers = {'User-Agent': 'Ultimate-Squeeze-Scanner/2.0'}
         
         req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with http_client.urlopen(req, timeout=10) as response:
             if response.status == 200:
                 data = json.loads(response.read().decode())
                 
@@ -982,146 +1019,14 @@ class handler(BaseHTTPRequestHandler):
         if not ortex_data:
             return 50  # Default score
         
-        score = 0
-        details = {'breakdown': {}, 'risk_factors': []}
-        
-        # 1. Short Interest Analysis (0-35 points) - Most Important
-        si = ortex_data.get('short_interest', 0)
-        si_score = 0
-        if si >= 40:
-            si_score = 35
-            details['risk_factors'].append('EXTREME_SHORT_INTEREST')
-        elif si >= 30:
-            si_score = 30
-            details['risk_factors'].append('VERY_HIGH_SHORT_INTEREST')
-        elif si >= 20:
-            si_score = 25
-            details['risk_factors'].append('HIGH_SHORT_INTEREST')
-        elif si >= 15:
-            si_score = 15
-        elif si >= 10:
-            si_score = 8
-        elif si >= 5:
-            si_score = 3
-        
-        score += si_score
-        details['breakdown']['short_interest'] = si_score
-        
-        # 2. Utilization Rate (0-25 points)
-        util = ortex_data.get('utilization', 0)
-        util_score = 0
-        if util >= 98:
-            util_score = 25
-            details['risk_factors'].append('MAXED_UTILIZATION')
-        elif util >= 95:
-            util_score = 22
-            details['risk_factors'].append('CRITICAL_UTILIZATION')
-        elif util >= 90:
-            util_score = 20
-        elif util >= 85:
-            util_score = 18
-        elif util >= 80:
-            util_score = 15
-        elif util >= 75:
-            util_score = 12
-        elif util >= 60:
-            util_score = 8
-        elif util >= 40:
-            util_score = 4
-        
-        score += util_score
-        details['breakdown']['utilization'] = util_score
-        
-        # 3. Cost to Borrow (0-25 points)
-        ctb = ortex_data.get('cost_to_borrow', 0)
-        ctb_score = 0
-        if ctb >= 50:
-            ctb_score = 25
-            details['risk_factors'].append('EXTREME_BORROW_COST')
-        elif ctb >= 30:
-            ctb_score = 22
-            details['risk_factors'].append('VERY_HIGH_BORROW_COST')
-        elif ctb >= 20:
-            ctb_score = 20
-        elif ctb >= 15:
-            ctb_score = 18
-        elif ctb >= 10:
-            ctb_score = 15
-        elif ctb >= 8:
-            ctb_score = 12
-        elif ctb >= 5:
-            ctb_score = 10
-        elif ctb >= 3:
-            ctb_score = 6
-        elif ctb >= 1:
-            ctb_score = 3
-        
-        score += ctb_score
-        details['breakdown']['cost_to_borrow'] = ctb_score
-        
-        # 4. Days to Cover (0-15 points)
-        dtc = ortex_data.get('days_to_cover', 0)
-        dtc_score = 0
-        if dtc >= 10:
-            dtc_score = 15
-            details['risk_factors'].append('EXTREME_DAYS_TO_COVER')
-        elif dtc >= 7:
-            dtc_score = 13
-        elif dtc >= 5:
-            dtc_score = 11
-        elif dtc >= 4:
-            dtc_score = 10
-        elif dtc >= 3:
-            dtc_score = 8
-        elif dtc >= 2:
-            dtc_score = 5
-        elif dtc >= 1:
-            dtc_score = 2
-        
-        score += dtc_score
-        details['breakdown']['days_to_cover'] = dtc_score
-        
-        # 5. Price Action Momentum Bonus (0-10 points)
-        if price_data:
-            price_change = price_data.get('price_change', 0)
-            volume = price_data.get('volume', 0)
-            
-            momentum_score = 0
-            if price_change > 10:  # Strong upward momentum
-                momentum_score = 10
-                details['risk_factors'].append('STRONG_UPWARD_MOMENTUM')
-            elif price_change > 5:
-                momentum_score = 7
-            elif price_change > 2:
-                momentum_score = 4
-            elif price_change > 0:
-                momentum_score = 2
-            elif price_change < -10:  # Strong downward pressure could indicate covering
-                momentum_score = -5
-                
-            # Volume amplification
-            if volume > 50000000:  # High volume
-                momentum_score += 2
-                details['risk_factors'].append('HIGH_VOLUME')
-            elif volume > 20000000:
-                momentum_score += 1
-                
-            score += max(-5, min(10, momentum_score))  # Cap between -5 and 10
-            details['breakdown']['momentum'] = momentum_score
-        
-        # 6. Composite Risk Multiplier
-        # If multiple extreme factors are present, apply multiplier
-        extreme_factors = sum(1 for factor in ['EXTREME_SHORT_INTEREST', 'MAXED_UTILIZATION', 'EXTREME_BORROW_COST', 'EXTREME_DAYS_TO_COVER'] if factor in details['risk_factors'])
-        
-        if extreme_factors >= 3:
-            score = min(100, score * 1.1)  # 10% bonus for triple threat
-            details['risk_factors'].append('TRIPLE_THREAT_MULTIPLIER')
-        elif extreme_factors >= 2:
-            score = min(100, score * 1.05)  # 5% bonus for double threat
-            details['risk_factors'].append('DOUBLE_THREAT_MULTIPLIER')
-        
-        final_score = min(100, max(0, score))  # Ensure score is between 0-100
-        details['final_score'] = final_score
+        # Ladders, momentum/volume bonus and threat multipliers run as precompiled bisect tables;
+        # risk factors stay a bit mask until the details are built
+        final_score, breakdown, risk_mask = professional_scorer.score(ortex_data, price_data)
+        details = {
+            'breakdown': breakdown,
+            'risk_factors': professional_scorer.flags.names(risk_mask),
+            'final_score': final_score
+        }
         
         return final_score, details
     
@@ -1711,10 +1616,7 @@ ${data.response_text}
 </body>
 </html>"""
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html.encode())
+        page_cache.send(self, 'professional_interface', html)
     
     def send_health(self):
         # Check if Ortex API key is available via environment variable
@@ -1725,7 +1627,10 @@ ${data.response_text}
             'message': 'Ultimate Squeeze Scanner API v6.0 with Live Ortex + Yahoo Finance Integration!',
             'timestamp': datetime.now().isoformat(),
             'version': '6.0.0-live-api',
-            'ortex_env_configured': has_ortex_env
+            'ortex_env_configured': has_ortex_env,
+            'http_pool': http_client.stats(),
+            'price_hedging': price_racer.stats(),
+            'circuit_breakers': ortex_breakers.stats()
         }
         
         self.send_response(200)
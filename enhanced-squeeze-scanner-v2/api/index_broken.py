@@ -10,44 +10,43 @@ import urllib.request
 import os
 from datetime import datetime
 import time
-import concurrent.futures
 from threading import Lock
 import random
 
+from scanner_core.http_client import http_client
+from scanner_core.ortex_client import ortex_client, ortex_headers
+from scanner_core.universe import load_universe
+from scanner_core.yahoo_quotes import yahoo_quotes
+
+# Production-ready ticker universe - built once at import, not per request (TICKER_UNIVERSE_PATH loads a file instead)
+TICKER_UNIVERSE = load_universe({
+    'top_meme_stocks': [
+        'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
+        'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
+    ],
+    'high_short_interest': [
+        'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
+        'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
+    ],
+    'biotech_squeeze': [
+        'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
+        'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
+    ],
+    'small_cap_movers': [
+        'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
+        'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
+    ],
+    'large_cap_samples': [
+        'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
+    ]
+})
+
 class handler(BaseHTTPRequestHandler):
+    # Shared, immutable - handler instances are per request
+    ticker_universe = TICKER_UNIVERSE
+    master_ticker_list = TICKER_UNIVERSE.tickers
     
     def __init__(self, *args, **kwargs):
-        # Production-ready ticker universe
-        self.ticker_universe = {
-            'top_meme_stocks': [
-                'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
-                'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
-            ],
-            'high_short_interest': [
-                'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
-                'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
-            ],
-            'biotech_squeeze': [
-                'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
-                'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
-            ],
-            'small_cap_movers': [
-                'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
-                'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
-            ],
-            'large_cap_samples': [
-                'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
-            ]
-        }
-        
-        # Flatten and deduplicate ticker list
-        self.master_ticker_list = []
-        for category, tickers in self.ticker_universe.items():
-            self.master_ticker_list.extend(tickers)
-        
-        seen = set()
-        self.master_ticker_list = [x for x in self.master_ticker_list if not (x in seen or seen.add(x))]
-        
         # Production performance settings
         self.performance_config = {
             'max_safe_batch_size': 15,  # Conservative for Vercel
@@ -69,34 +68,17 @@ class handler(BaseHTTPRequestHandler):
             return None
             
         # Use the correct Ortex endpoint format
+        # NASDAQ first, then NYSE - the endpoint memo remembers which one works per ticker
         working_endpoints = [
-            f'https://api.ortex.com/api/v1/stock/us/{ticker}/short_interest?format=json',
-            f'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
-            f'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
+            'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
+            'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
         ]
         
-        for url in working_endpoints:
-            try:
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/Production')
-                req.add_header('Accept', 'application/json')
-                req.add_header('Ortex-Api-Key', ortex_key)
-                
-                with urllib.request.urlopen(req, timeout=timeout) as response:
-                    if response.getcode() == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        if 'application/json' in content_type:
-                            data = response.read().decode('utf-8')
-                            try:
-                                json_data = json.loads(data)
-                                return self.process_ortex_json(json_data)
-                            except json.JSONDecodeError:
-                                continue
-                                
-            except Exception:
-                continue
-        
-        return None
+        url, json_data = ortex_client.fetch_json(
+            ticker, 'short_interest', working_endpoints,
+            ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/Production'), timeout
+        )
+        return self.process_ortex_json(json_data) if json_data is not None else None
     
     def process_ortex_json(self, json_data):
         """Process Ortex JSON response"""
@@ -134,54 +116,8 @@ class handler(BaseHTTPRequestHandler):
         return processed
     
     def get_yahoo_price_data(self, tickers):
-        """Get price data for multiple tickers"""
-        price_data = {}
-        
-        def get_single_price(ticker):
-            try:
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Mozilla/5.0 (compatible; SqueezeScanner/Production)')
-                
-                with urllib.request.urlopen(req, timeout=self.performance_config['price_timeout']) as response:
-                    data = json.loads(response.read())
-                    
-                    if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                        result = data['chart']['result'][0]
-                        meta = result.get('meta', {})
-                        
-                        current_price = meta.get('regularMarketPrice', 0)
-                        previous_close = meta.get('previousClose', 0)
-                        volume = meta.get('regularMarketVolume', 0)
-                        
-                        price_change = current_price - previous_close if previous_close else 0
-                        price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                        
-                        return {
-                            'ticker': ticker,
-                            'current_price': round(current_price, 2),
-                            'price_change': round(price_change, 2),
-                            'price_change_pct': round(price_change_pct, 2),
-                            'volume': volume,
-                            'success': True
-                        }
-                        
-            except Exception:
-                return {'ticker': ticker, 'success': False}
-        
-        # Use thread pool for concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.performance_config['max_workers']) as executor:
-            future_to_ticker = {executor.submit(get_single_price, ticker): ticker for ticker in tickers}
-            
-            for future in concurrent.futures.as_completed(future_to_ticker, timeout=20):
-                try:
-                    result = future.result(timeout=3)
-                    if result and result.get('success'):
-                        price_data[result['ticker']] = result
-                except:
-                    continue
-        
-        return price_data
+        """Get price data for multiple tickers via batched quote requests"""
+        return yahoo_quotes.get_prices(tickers, timeout=self.performance_config['price_timeout'])
     
     def generate_realistic_mock_data(self, tickers):
         """Generate high-quality mock data for production"""
@@ -205,15 +141,15 @@ class handler(BaseHTTPRequestHandler):
                 # Generate category-appropriate realistic data
                 random.seed(hash(ticker) % 10000)
                 
-                if ticker in self.ticker_universe.get('top_meme_stocks', []):
+                if TICKER_UNIVERSE.in_category(ticker, 'top_meme_stocks'):
                     si_base = random.uniform(15, 35)
                     util_base = random.uniform(75, 95)
                     ctb_base = random.uniform(10, 40)
-                elif ticker in self.ticker_universe.get('biotech_squeeze', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'biotech_squeeze'):
                     si_base = random.uniform(20, 40)
                     util_base = random.uniform(80, 98)
                     ctb_base = random.uniform(15, 60)
-                elif ticker in self.ticker_universe.get('large_cap_samples', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'large_cap_samples'):
                     si_base = random.uniform(1, 6)
                     util_base = random.uniform(20, 50)
                     ctb_base = random.uniform(0.5, 3)
@@ -296,18 +232,14 @@ class handler(BaseHTTPRequestHandler):
         start_time = time.time()
         
         # Apply filters and limit batch size
-        scan_tickers = self.master_ticker_list.copy()
+        scan_tickers = list(self.master_ticker_list)
         
         if filters:
             # If specific tickers provided, use those
             if filters.get('tickers'):
                 scan_tickers = filters['tickers']
             elif filters.get('categories'):
-                filtered_tickers = []
-                for category in filters['categories']:
-                    if category in self.ticker_universe:
-                        filtered_tickers.extend(self.ticker_universe[category])
-                scan_tickers = list(set(filtered_tickers))
+                scan_tickers = TICKER_UNIVERSE.select(filters['categories'])
             
             max_tickers = min(filters.get('max_tickers', 20), self.performance_config['max_safe_batch_size'])
             scan_tickers = scan_tickers[:max_tickers]
@@ -858,7 +790,10 @@ class handler(BaseHTTPRequestHandler):
                 'production_optimized': 'active'
             },
             'ticker_universe_size': len(self.master_ticker_list),
-            'performance_config': self.performance_config
+            'performance_config': self.performance_config,
+            'http_pool': http_client.stats(),
+            'ortex_client': ortex_client.stats(),
+            'yahoo_quotes': yahoo_quotes.stats()
         }
         
         self.send_json_response(health_data)
@@ -5,18 +5,37 @@ import urllib.request
 import os
 from datetime import datetime, timedelta
 import time
-import concurrent.futures
-import threading
+
+from scanner_core.cache import TTLCache
+from scanner_core.credit_budget import BUDGET_EXHAUSTED, credit_budget
+from scanner_core.http_client import http_client
+from scanner_core.incremental import incremental_scorer, is_quote_refresh
+from scanner_core.ortex_client import endpoint_memo, ortex_client, ortex_headers
+from scanner_core.pagination import CursorExpired, result_pager
+from scanner_core.scan_engine import scan_engine
+from scanner_core.scoring_profiles import profile_registry, score_profiles, summarize
+from scanner_core.single_flight import ortex_flight, price_flight
+from scanner_core.streaming import CONTENT_TYPES, scan_streamer, stream_format
+from scanner_core.yahoo_quotes import yahoo_quotes
 
 app = Flask(__name__)
 
 # Enhanced squeeze scanner integration
 class OptimizedSqueezeAPI:
     def __init__(self):
-        self.cache = {}
-        self.cache_timestamps = {}
         self.cache_duration = 1800  # 30 minutes
-        self.lock = threading.Lock()
+        self.cache = TTLCache(default_ttl=self.cache_duration)
+        # Last good piece per pair, kept long past its TTL - served when the credit budget refuses a fetch
+        self.fallback_cache = TTLCache(default_ttl=int(os.environ.get('ORTEX_FALLBACK_TTL', 7 * 24 * 3600)))
+        
+        # Per-data-type freshness: SI/DTC update daily, borrow data moves intraday
+        self.cache_ttls = {
+            'short_interest': int(os.environ.get('ORTEX_TTL_SHORT_INTEREST', 6 * 3600)),
+            'days_to_cover': int(os.environ.get('ORTEX_TTL_DAYS_TO_COVER', 6 * 3600)),
+            'cost_to_borrow': int(os.environ.get('ORTEX_TTL_COST_TO_BORROW', 900)),
+            'availability': int(os.environ.get('ORTEX_TTL_AVAILABILITY', 900)),
+            'stock_scores': int(os.environ.get('ORTEX_TTL_STOCK_SCORES', 3600))
+        }
         
         # Working Ortex endpoints discovered from analysis
         self.ortex_endpoints = {
@@ -42,82 +61,104 @@ class OptimizedSqueezeAPI:
 
     def is_cache_valid(self, cache_key):
         """Check if cached data is still valid"""
-        if cache_key not in self.cache_timestamps:
-            return False
-        
-        cache_time = self.cache_timestamps[cache_key]
-        return (datetime.now() - cache_time).total_seconds() < self.cache_duration
+        return self.cache.contains(cache_key)
 
     def get_cached_data(self, cache_key):
         """Retrieve cached data if valid"""
-        with self.lock:
-            if self.is_cache_valid(cache_key):
-                return self.cache.get(cache_key)
-        return None
+        return self.cache.get(cache_key)
 
-    def set_cached_data(self, cache_key, data):
+    def set_cached_data(self, cache_key, data, ttl=None):
         """Store data in cache"""
-        with self.lock:
-            self.cache[cache_key] = data
-            self.cache_timestamps[cache_key] = datetime.now()
+        self.cache.set(cache_key, data, ttl)
+
+    def ortex_cache_key(self, ticker, data_type):
+        """Cache key for one (ticker, data_type) piece"""
+        return f"ortex_{ticker}_{data_type}"
 
     def fetch_ortex_data_optimized(self, ticker, ortex_key, data_types=None):
-        """Optimized Ortex data fetching with parallel requests and caching"""
+        """Optimized Ortex data fetching for a single ticker (delegates to the batch engine)"""
         if not ortex_key:
             return None
+        
+        return self.fetch_ortex_batch([ticker], ortex_key, data_types).get(ticker, {})
+
+    def fetch_ortex_batch(self, tickers, ortex_key, data_types=None):
+        """Fetch Ortex data for many tickers in one async engine pass with caching"""
+        if not ortex_key:
+            return {}
             
         if data_types is None:
             data_types = ['short_interest', 'cost_to_borrow', 'days_to_cover']
         
-        # Check cache first
-        cache_key = f"ortex_{ticker}_{'_'.join(data_types)}"
-        cached_result = self.get_cached_data(cache_key)
-        if cached_result:
-            return cached_result
-        
-        results = {}
-        
-        def fetch_data_type(data_type):
-            """Fetch specific data type with fallback"""
-            endpoints = self.ortex_endpoints.get(data_type, [])
-            
-            for endpoint_url in endpoints:
-                try:
-                    url = endpoint_url.format(ticker=ticker)
-                    req = urllib.request.Request(url)
-                    req.add_header('Ortex-Api-Key', ortex_key)
-                    req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/Enhanced')
-                    req.add_header('Accept', 'application/json')
-                    
-                    with urllib.request.urlopen(req, timeout=8) as response:
-                        if response.getcode() == 200:
-                            content_type = response.headers.get('Content-Type', '')
-                            if 'application/json' in content_type:
-                                data = json.loads(response.read().decode('utf-8'))
-                                return {
-                                    'success': True,
-                                    'data_type': data_type,
-                                    'data': data,
-                                    'credits_used': data.get('creditsUsed', 0)
-                                }
-                except Exception:
+        batch_results = {}
+        pending_pairs = {}
+        waiting = {}
+        
+        # Assemble from cached pieces - only missing (ticker, data_type) pairs hit the network
+        for ticker in tickers:
+            results = batch_results.setdefault(ticker, {})
+            for data_type in data_types:
+                cached_piece = self.get_cached_data(self.ortex_cache_key(ticker, data_type))
+                if cached_piece:
+                    results[data_type] = dict(cached_piece, credits_used=0, cached=True)
                     continue
-            
-            return {'success': False, 'data_type': data_type}
+                
+                # Another request already fetching this pair? Wait on it instead of paying twice
+                future, is_leader = ortex_flight.claim((ticker, data_type))
+                if not is_leader:
+                    waiting[(ticker, data_type)] = future
+                    continue
+                
+                pending_pairs[(ticker, data_type)] = (ticker, data_type, self.ortex_endpoints.get(data_type, []))
         
-        # Parallel processing for multiple data types
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_type = {executor.submit(fetch_data_type, dt): dt for dt in data_types}
-            
-            for future in concurrent.futures.as_completed(future_to_type):
-                result = future.result()
-                results[result['data_type']] = result
+        if pending_pairs:
+            self._fetch_ortex_pairs(pending_pairs, ortex_key, batch_results)
+        
+        for (ticker, data_type), future in waiting.items():
+            try:
+                piece = dict(future.result(timeout=30), credits_used=0, coalesced=True)
+            except Exception:
+                piece = {'success': False, 'data_type': data_type}
+            batch_results[ticker][data_type] = piece
         
-        # Cache successful results
-        if any(r.get('success') for r in results.values()):
-            self.set_cached_data(cache_key, results)
+        return batch_results
+
+    def _fetch_ortex_pairs(self, pending_pairs, ortex_key, batch_results):
+        """Fetch the (ticker, data_type) pairs this request leads and publish them to waiters"""
+        headers = ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/Enhanced')
         
-        return results
+        # Every (ticker, data_type, endpoint) request shares one event loop; the endpoint
+        # memo tries the last working template first and skips ones known to 404
+        try:
+            fetched = ortex_client.fetch_batch(pending_pairs, headers, timeout=8)
+        except Exception as e:
+            for key in pending_pairs:
+                ortex_flight.fail(key, e)
+            raise
+        
+        for (ticker, data_type), (url, data) in fetched.items():
+            if data is not None:
+                piece = {
+                    'success': True,
+                    'data_type': data_type,
+                    'data': data,
+                    'credits_used': data.get('creditsUsed', 0) if isinstance(data, dict) else 0
+                }
+                # Cache successful pieces individually with their own TTL
+                self.set_cached_data(self.ortex_cache_key(ticker, data_type), piece,
+                                     self.cache_ttls.get(data_type, self.cache_duration))
+                self.fallback_cache.set(self.ortex_cache_key(ticker, data_type), piece)
+            elif url == BUDGET_EXHAUSTED:
+                # Out of Ortex credits: stale data if we have any, else the scorer models without it
+                stale_piece = self.fallback_cache.get(self.ortex_cache_key(ticker, data_type))
+                if stale_piece:
+                    piece = dict(stale_piece, credits_used=0, cached=True, stale=True)
+                else:
+                    piece = {'success': False, 'data_type': data_type, 'budget_exhausted': True}
+            else:
+                piece = {'success': False, 'data_type': data_type}
+            ortex_flight.resolve((ticker, data_type), piece)
+            batch_results[ticker][data_type] = piece
 
     def process_enhanced_squeeze_data(self, ortex_results, price_data=None):
         """Process multi-endpoint Ortex data into comprehensive squeeze metrics"""
@@ -195,49 +236,8 @@ class OptimizedSqueezeAPI:
 squeeze_api = OptimizedSqueezeAPI()
 
 def get_yahoo_price_data(tickers):
-    """Enhanced Yahoo Finance integration"""
-    price_data = {}
-    
-    def get_single_price(ticker):
-        try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'Mozilla/5.0 (compatible; SqueezeScanner/Enhanced)')
-            
-            with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read())
-                
-                if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                    result = data['chart']['result'][0]
-                    meta = result.get('meta', {})
-                    
-                    current_price = meta.get('regularMarketPrice', 0)
-                    previous_close = meta.get('previousClose', 0)
-                    volume = meta.get('regularMarketVolume', 0)
-                    
-                    price_change = current_price - previous_close if previous_close else 0
-                    price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                    
-                    return {
-                        'ticker': ticker,
-                        'current_price': round(current_price, 2),
-                        'price_change': round(price_change, 2),
-                        'price_change_pct': round(price_change_pct, 2),
-                        'volume': volume,
-                        'success': True
-                    }
-        except Exception:
-            pass
-        
-        return {'ticker': ticker, 'success': False}
-    
-    # Process multiple tickers
-    for ticker in tickers:
-        result = get_single_price(ticker)
-        if result.get('success'):
-            price_data[ticker] = result
-    
-    return price_data
+    """Enhanced Yahoo Finance integration (batched multi-symbol quotes with chart fallback)"""
+    return yahoo_quotes.get_prices(tickers, timeout=5)
 
 def handler(request, context):
     """Enhanced request handler with optimized squeeze scanning"""
@@ -268,6 +268,14 @@ def handler(request, context):
             return handle_quick_squeeze_scan(request, headers)
         elif '/api/health' in path:
             return handle_health_check(headers)
+        elif '/api/debug/endpoints' in path:
+            return handle_endpoint_memo(request, headers)
+        elif '/api/scoring-profiles' in path:
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({'success': True, 'profiles': profile_registry.describe()})
+            }
         elif path == '/' or path == '/api' or path.endswith('/'):
             return handle_main_interface(headers)
         else:
@@ -285,13 +293,47 @@ def handler(request, context):
         }
 
 def handle_enhanced_squeeze_scan(request, headers):
-    """Enhanced squeeze scanning with parallel processing"""
+    """Enhanced squeeze scanning over the shared async scan engine"""
     try:
         body = json.loads(request.body) if request.body else {}
+        
+        # limit / cursor / min_score / risk_factors / category / data_quality
+        try:
+            query = result_pager.query(body)
+            if query.category:
+                # No ticker universe in this app to resolve categories against - say so rather than return nothing
+                raise ValueError('category filter is not supported by this endpoint - use the integrated server or pass tickers')
+            # "stream": "ndjson" / "sse" (or the Accept header) returns the scan as result events plus a summary
+            stream_fmt = stream_format((getattr(request, 'headers', None) or {}).get('Accept'), body.get('stream'))
+            if stream_fmt and query.cursor:
+                raise ValueError('Cursor pages are not streamed - drop "stream" to resume a scan')
+            if query.cursor:
+                # Later pages come from the stored scan - no refetch, no rescoring
+                page, page_info, summary = result_pager.resume(query)
+                return {
+                    'statusCode': 200,
+                    'headers': headers,
+                    'body': json.dumps({
+                        'success': True,
+                        'message': summary['message'],
+                        'results': page,
+                        'summary': summary['summary'],
+                        'page': page_info
+                    })
+                }
+        except (CursorExpired, ValueError) as e:
+            return {
+                'statusCode': 410 if isinstance(e, CursorExpired) else 400,
+                'headers': headers,
+                'body': json.dumps({'error': str(e)})
+            }
+        
         tickers = body.get('tickers', ['GME', 'AMC', 'TSLA'])
         ortex_key = body.get('ortex_key', os.environ.get('ORTEX_API_KEY'))
+        # 'quote_refresh' rescores from the last full scan's Ortex snapshots - no Ortex calls
+        quote_refresh = is_quote_refresh(body.get('mode'))
         
-        if not ortex_key:
+        if not ortex_key and not quote_refresh:
             return {
                 'statusCode': 400,
                 'headers': headers,
@@ -301,29 +343,65 @@ def handle_enhanced_squeeze_scan(request, headers):
         if isinstance(tickers, str):
             tickers = [t.strip().upper() for t in tickers.replace(',', ' ').split() if t.strip()]
         
+        # Optional scoring profiles (scoring_profile / profiles), resolved before any fetch
+        try:
+            primary_profile, profiles = profile_registry.selection(body)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': str(e)})
+            }
+        
         # Get price data for all tickers
         price_data = get_yahoo_price_data(tickers)
         
+        # Fan out every ticker/data type/endpoint request in one engine pass
+        with credit_budget.caller('squeeze_scan'):
+            ortex_batch = {} if quote_refresh else squeeze_api.fetch_ortex_batch(
+                tickers,
+                ortex_key,
+                ['short_interest', 'cost_to_borrow', 'days_to_cover']
+            )
+        refresh_profile = primary_profile or profile_registry.get('enhanced')
+        needs_full_scan = []
+        
         results = []
         total_credits_used = 0
         
         def process_ticker(ticker):
             """Process individual ticker with enhanced data"""
-            # Get optimized Ortex data (parallel endpoints)
-            ortex_results = squeeze_api.fetch_ortex_data_optimized(
-                ticker, 
-                ortex_key,
-                ['short_interest', 'cost_to_borrow', 'days_to_cover']
-            )
-            
-            # Process into squeeze metrics
-            squeeze_data = squeeze_api.process_enhanced_squeeze_data(
-                ortex_results or {}, 
-                price_data.get(ticker)
-            )
+            if quote_refresh:
+                # Cached SI/CTB/DTC subtotals; only the momentum term sees the new quote
+                squeeze_data = incremental_scorer.snapshot(ticker)
+                refreshed = squeeze_data and incremental_scorer.rescore(
+                    ticker, [refresh_profile] + profiles, price_data.get(ticker)
+                )
+                if not refreshed:
+                    needs_full_scan.append(ticker)
+                    return None
+                scores = {profile.name: refreshed[profile.name] for profile in profiles}
+                base_score = refreshed[refresh_profile.name]['score']
+                budget_fallback = False
+            else:
+                ortex_results = ortex_batch.get(ticker)
+                # Stale or missing pieces because the credit budget refused the fetch
+                budget_fallback = any(piece.get('stale') or piece.get('budget_exhausted')
+                                      for piece in (ortex_results or {}).values())
+                
+                # Process into squeeze metrics
+                squeeze_data = squeeze_api.process_enhanced_squeeze_data(
+                    ortex_results or {}, 
+                    price_data.get(ticker)
+                )
+                incremental_scorer.remember(ticker, squeeze_data)
+                
+                # Every requested profile over the same inputs, in one pass
+                scores = score_profiles(profiles, squeeze_data, price_data.get(ticker)) if profiles else {}
+                base_score = squeeze_data['squeeze_score']
             
             # Determine risk level
-            score = squeeze_data['squeeze_score']
+            score = scores[primary_profile.name]['score'] if primary_profile else base_score
             if score >= 80:
                 risk_level = "EXTREME SQUEEZE RISK"
                 risk_color = "#ff4444"
@@ -355,37 +433,56 @@ def handle_enhanced_squeeze_scan(request, headers):
                     'data_sources': squeeze_data['data_sources'],
                     'confidence': squeeze_data['confidence']
                 },
-                'credits_used': squeeze_data['total_credits_used'],
-                'data_source': 'enhanced_ortex_live'
+                'credits_used': 0 if quote_refresh else squeeze_data['total_credits_used'],
+                'data_source': ('ortex_snapshot_quote_refresh' if quote_refresh
+                                else 'ortex_budget_fallback' if budget_fallback else 'enhanced_ortex_live'),
+                'profile_scores': summarize(scores)
             }
         
-        # Process up to 5 tickers in parallel
-        max_workers = min(3, len(tickers))
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            ticker_results = list(executor.map(process_ticker, tickers))
+        # Network work is already done - scoring is pure CPU
+        ticker_results = [result for result in map(process_ticker, tickers) if result is not None]
+        if profiles:
+            profile_registry.record_pass(len(ticker_results), len(profiles))
         
         for result in ticker_results:
             results.append(result)
             total_credits_used += result.get('credits_used', 0)
         
-        # Sort by squeeze score
-        results.sort(key=lambda x: x['squeeze_score'], reverse=True)
+        summary = {
+            'message': f'Enhanced squeeze scan complete - {len(results)} tickers analyzed',
+            'summary': {
+                'total_tickers': len(results),
+                'high_risk_count': len([r for r in results if r['squeeze_score'] >= 60]),
+                'total_credits_used': total_credits_used,
+                'scan_timestamp': datetime.now().isoformat(),
+                'scoring_profile': primary_profile.name if primary_profile else 'enhanced',
+                'mode': 'quote_refresh' if quote_refresh else 'full',
+                'needs_full_scan': needs_full_scan,
+                'credit_fallbacks': len([r for r in results if r['data_source'] == 'ortex_budget_fallback']),
+                'cache_hit_rate': f"{len([r for r in results if r['credits_used'] == 0]) / len(results) * 100:.1f}%" if results else "0%"
+            }
+        }
+        
+        if stream_fmt:
+            # A serverless response is returned whole, so this is the streaming wire format without early delivery
+            return {
+                'statusCode': 200,
+                'headers': dict(headers, **{'Content-Type': CONTENT_TYPES[stream_fmt], 'Cache-Control': 'no-cache'}),
+                'body': scan_streamer.buffered(stream_fmt, results, summary['summary'], query.matcher())
+            }
+        
+        # Best-first page via a bounded heap (same order as the original full sort)
+        page, page_info = result_pager.paginate(query, results, summary)
         
         return {
             'statusCode': 200,
             'headers': headers,
             'body': json.dumps({
                 'success': True,
-                'message': f'Enhanced squeeze scan complete - {len(results)} tickers analyzed',
-                'results': results,
-                'summary': {
-                    'total_tickers': len(results),
-                    'high_risk_count': len([r for r in results if r['squeeze_score'] >= 60]),
-                    'total_credits_used': total_credits_used,
-                    'scan_timestamp': datetime.now().isoformat(),
-                    'cache_hit_rate': f"{len([r for r in results if r['credits_used'] == 0]) / len(results) * 100:.1f}%"
-                }
+                'message': summary['message'],
+                'results': page,
+                'summary': summary['summary'],
+                'page': page_info
             })
         }
         
@@ -423,10 +520,9 @@ def handle_quick_squeeze_scan(request, headers):
 
 def handle_health_check(headers):
     """Enhanced health check with system status"""
-    cache_stats = {
-        'total_cached_items': len(squeeze_api.cache),
-        'cache_hit_rate': len([k for k in squeeze_api.cache_timestamps if squeeze_api.is_cache_valid(k)]) / max(len(squeeze_api.cache_timestamps), 1) * 100
-    }
+    cache_stats = squeeze_api.cache.stats()
+    cache_stats['total_cached_items'] = cache_stats['entries']
+    cache_stats['cache_hit_rate'] = cache_stats['hit_rate']
     
     return {
         'statusCode': 200,
@@ -445,13 +541,40 @@ def handle_health_check(headers):
             'endpoints': [
                 '/api/squeeze/scan - Enhanced multi-ticker squeeze analysis',
                 '/api/squeeze/quick - Quick scan of priority candidates',
-                '/api/health - System health and status'
+                '/api/health - System health and status',
+                '/api/debug/endpoints - Inspect (GET) or invalidate (DELETE) the Ortex endpoint memo'
             ],
             'cache_stats': cache_stats,
+            'http_pool': http_client.stats(),
+            'yahoo_quotes': yahoo_quotes.stats(),
+            'scan_engine': scan_engine.stats(),
+            'ortex_client': ortex_client.stats(),
+            'single_flight': {'ortex': ortex_flight.stats(), 'yahoo': price_flight.stats()},
+            'scoring_profiles': profile_registry.stats(),
+            'incremental_scoring': incremental_scorer.stats(),
+            'result_pager': result_pager.stats(),
+            'scan_streams': scan_streamer.stats(),
             'timestamp': datetime.now().isoformat()
         })
     }
 
+def handle_endpoint_memo(request, headers):
+    """Inspect (GET) or invalidate (DELETE) the Ortex endpoint-discovery memo"""
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(request.url).query)
+    ticker = query.get('ticker', [None])[0]
+    
+    if request.method == 'DELETE':
+        removed = endpoint_memo.invalidate(ticker, query.get('data_type', [None])[0])
+        body = {'success': True, 'invalidated': removed}
+    else:
+        body = {'success': True, 'stats': endpoint_memo.stats(), 'endpoints': endpoint_memo.snapshot(ticker)}
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps(body)
+    }
+
 def handle_main_interface(headers):
     """Main dashboard interface"""
     # [Keep existing interface HTML but add enhanced features notice]
@@ -10,48 +10,61 @@ import urllib.request
 import os
 from datetime import datetime
 import time
-import concurrent.futures
 from threading import Lock
 import random
 
+from scanner_core.batch_scoring import batch_scorer
+from scanner_core.credit_budget import credit_budget
+from scanner_core.deadline import Deadline
+from scanner_core.http_client import http_client
+from scanner_core.incremental import incremental_scorer, is_quote_refresh
+from scanner_core.json_response import json_responses, wants_columnar
+from scanner_core.ortex_client import endpoint_memo, ortex_client, ortex_headers
+from scanner_core.pagination import CursorExpired, result_pager
+from scanner_core.scoring_profiles import as_metrics, profile_registry, summarize
+from scanner_core.static_assets import page_cache
+from scanner_core.streaming import scan_streamer, stream_chunks, stream_format
+from scanner_core.universe import load_universe
+from scanner_core.yahoo_quotes import yahoo_quotes
+
+# NASDAQ first, then NYSE - the endpoint memo remembers which one works per ticker
+ORTEX_SHORT_INTEREST_ENDPOINTS = [
+    'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
+    'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
+]
+
+# Production-ready ticker universe - built once at import, not per request (TICKER_UNIVERSE_PATH loads a file instead)
+TICKER_UNIVERSE = load_universe({
+    'top_meme_stocks': [
+        'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
+        'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
+    ],
+    'high_short_interest': [
+        'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
+        'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
+    ],
+    'biotech_squeeze': [
+        'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
+        'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
+    ],
+    'small_cap_movers': [
+        'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
+        'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
+    ],
+    'large_cap_samples': [
+        'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
+    ]
+})
+
 class handler(BaseHTTPRequestHandler):
+    # Shared, immutable - handler instances are per request
+    ticker_universe = TICKER_UNIVERSE
+    master_ticker_list = TICKER_UNIVERSE.tickers
     
     def __init__(self, *args, **kwargs):
-        # Production-ready ticker universe
-        self.ticker_universe = {
-            'top_meme_stocks': [
-                'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
-                'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
-            ],
-            'high_short_interest': [
-                'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
-                'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
-            ],
-            'biotech_squeeze': [
-                'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
-                'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
-            ],
-            'small_cap_movers': [
-                'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
-                'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
-            ],
-            'large_cap_samples': [
-                'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
-            ]
-        }
-        
-        # Flatten and deduplicate ticker list
-        self.master_ticker_list = []
-        for category, tickers in self.ticker_universe.items():
-            self.master_ticker_list.extend(tickers)
-        
-        seen = set()
-        self.master_ticker_list = [x for x in self.master_ticker_list if not (x in seen or seen.add(x))]
-        
         # Production performance settings
         self.performance_config = {
-            'max_safe_batch_size': 15,  # Conservative for Vercel
-            'timeout_threshold': 25,    # Vercel function timeout
+            'timeout_threshold': 25,    # Vercel function timeout - per-scan deadline budget
             'max_workers': 8,          # Reduced for serverless
             'ortex_timeout': 3,        # Quick Ortex timeouts
             'price_timeout': 4         # Yahoo Finance timeout
@@ -63,38 +76,36 @@ class handler(BaseHTTPRequestHandler):
         """Get Ortex API key from environment or return None"""
         return os.environ.get('ORTEX_API_KEY', None)
     
-    def get_fast_ortex_data(self, ticker, ortex_key, timeout=3):
+    def get_fast_ortex_data(self, ticker, ortex_key, timeout=3, deadline=None):
         """Fast Ortex data retrieval for production"""
         if not ortex_key:
             return None
-            
-        working_endpoints = [
-            f'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
-            f'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
-        ]
         
-        for url in working_endpoints:
-            try:
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/Production')
-                req.add_header('Accept', 'application/json')
-                req.add_header('Ortex-Api-Key', ortex_key)
-                
-                with urllib.request.urlopen(req, timeout=timeout) as response:
-                    if response.getcode() == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        if 'application/json' in content_type:
-                            data = response.read().decode('utf-8')
-                            try:
-                                json_data = json.loads(data)
-                                return self.process_ortex_json(json_data)
-                            except json.JSONDecodeError:
-                                continue
-                                
-            except Exception:
-                continue
+        # A refused credit reservation comes back as a miss and the scan models the ticker
+        with credit_budget.caller('production_scan'):
+            url, json_data = ortex_client.fetch_json(
+                ticker, 'short_interest', ORTEX_SHORT_INTEREST_ENDPOINTS,
+                ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/Production'), timeout, deadline
+            )
+        return self.process_ortex_json(json_data) if json_data is not None else None
+    
+    def get_fast_ortex_batch(self, tickers, ortex_key, deadline=None):
+        """Ortex data for many tickers in one engine pass; returns (data, tickers cut off by the deadline)"""
+        if not ortex_key or not tickers:
+            return {}, set()
         
-        return None
+        with credit_budget.caller('production_scan'):
+            fetched = ortex_client.fetch_batch(
+                {ticker: (ticker, 'short_interest', ORTEX_SHORT_INTEREST_ENDPOINTS) for ticker in tickers},
+                ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/Production'),
+                timeout=self.performance_config['ortex_timeout'],
+                deadline=deadline
+            )
+        ortex_data = {
+            ticker: self.process_ortex_json(json_data)
+            for ticker, (url, json_data) in fetched.items() if json_data is not None
+        }
+        return ortex_data, set(tickers) - set(fetched)
     
     def process_ortex_json(self, json_data):
         """Process Ortex JSON response"""
@@ -131,55 +142,9 @@ class handler(BaseHTTPRequestHandler):
                 
         return processed
     
-    def get_yahoo_price_data(self, tickers):
-        """Get price data for multiple tickers"""
-        price_data = {}
-        
-        def get_single_price(ticker):
-            try:
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Mozilla/5.0 (compatible; SqueezeScanner/Production)')
-                
-                with urllib.request.urlopen(req, timeout=self.performance_config['price_timeout']) as response:
-                    data = json.loads(response.read())
-                    
-                    if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                        result = data['chart']['result'][0]
-                        meta = result.get('meta', {})
-                        
-                        current_price = meta.get('regularMarketPrice', 0)
-                        previous_close = meta.get('previousClose', 0)
-                        volume = meta.get('regularMarketVolume', 0)
-                        
-                        price_change = current_price - previous_close if previous_close else 0
-                        price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                        
-                        return {
-                            'ticker': ticker,
-                            'current_price': round(current_price, 2),
-                            'price_change': round(price_change, 2),
-                            'price_change_pct': round(price_change_pct, 2),
-                            'volume': volume,
-                            'success': True
-                        }
-                        
-            except Exception:
-                return {'ticker': ticker, 'success': False}
-        
-        # Use thread pool for concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.performance_config['max_workers']) as executor:
-            future_to_ticker = {executor.submit(get_single_price, ticker): ticker for ticker in tickers}
-            
-            for future in concurrent.futures.as_completed(future_to_ticker, timeout=20):
-                try:
-                    result = future.result(timeout=3)
-                    if result and result.get('success'):
-                        price_data[result['ticker']] = result
-                except:
-                    continue
-        
-        return price_data
+    def get_yahoo_price_data(self, tickers, deadline=None):
+        """Get price data for multiple tickers via batched quote requests"""
+        return yahoo_quotes.get_prices(tickers, timeout=self.performance_config['price_timeout'], deadline=deadline)
     
     def generate_realistic_mock_data(self, tickers):
         """Generate high-quality mock data for production"""
@@ -203,15 +168,15 @@ class handler(BaseHTTPRequestHandler):
                 # Generate category-appropriate realistic data
                 random.seed(hash(ticker) % 10000)
                 
-                if ticker in self.ticker_universe.get('top_meme_stocks', []):
+                if TICKER_UNIVERSE.in_category(ticker, 'top_meme_stocks'):
                     si_base = random.uniform(15, 35)
                     util_base = random.uniform(75, 95)
                     ctb_base = random.uniform(10, 40)
-                elif ticker in self.ticker_universe.get('biotech_squeeze', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'biotech_squeeze'):
                     si_base = random.uniform(20, 40)
                     util_base = random.uniform(80, 98)
                     ctb_base = random.uniform(15, 60)
-                elif ticker in self.ticker_universe.get('large_cap_samples', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'large_cap_samples'):
                     si_base = random.uniform(1, 6)
                     util_base = random.uniform(20, 50)
                     ctb_base = random.uniform(0.5, 3)
@@ -289,52 +254,76 @@ class handler(BaseHTTPRequestHandler):
         except Exception:
             return {'squeeze_score': 0, 'squeeze_type': 'Error', 'risk_factors': []}
     
-    def perform_production_scan(self, ortex_key=None, filters=None):
-        """Production-optimized scanning with Vercel limits"""
-        start_time = time.time()
-        
-        # Apply filters and limit batch size
-        scan_tickers = self.master_ticker_list.copy()
-        
-        if filters:
-            if filters.get('categories'):
-                filtered_tickers = []
-                for category in filters['categories']:
-                    if category in self.ticker_universe:
-                        filtered_tickers.extend(self.ticker_universe[category])
-                scan_tickers = list(set(filtered_tickers))
-            
-            max_tickers = min(filters.get('max_tickers', 10), self.performance_config['max_safe_batch_size'])
-            scan_tickers = scan_tickers[:max_tickers]
-        else:
-            scan_tickers = scan_tickers[:10]  # Default safe size
-        
+    def scan_chunk(self, tickers, ortex_key, deadline, quote_refresh, primary_profile, profiles,
+                   ortex_pending, needs_full_scan):
+        """Fetch and score one set of tickers: (results, live Ortex count, tickers the deadline left unpriced); fills ortex_pending / needs_full_scan"""
         # Get price data
-        price_data = self.get_yahoo_price_data(scan_tickers)
-        successful_tickers = [t for t in scan_tickers if t in price_data]
-        
-        # Get Ortex data (limited for production stability)
-        ortex_data = {}
-        live_count = 0
+        price_data = self.get_yahoo_price_data(tickers, deadline)
+        successful_tickers = [t for t in tickers if t in price_data]
+        price_cutoff = [t for t in tickers if t not in price_data] if deadline.expired() else []
         
-        if ortex_key and len(successful_tickers) <= 8:  # Only try live data for small batches
-            for ticker in successful_tickers[:5]:  # Limit to top 5
-                ortex_result = self.get_fast_ortex_data(ticker, ortex_key)
-                if ortex_result:
-                    ortex_data[ticker] = ortex_result
-                    live_count += 1
+        ortex_data, chunk_pending = {}, set()
+        if quote_refresh:
+            # No Ortex calls: reuse the last full scan's snapshots and cached partial scores;
+            # tickers never fully scanned (or whose snapshot expired) need a full scan first
+            for ticker in successful_tickers:
+                snapshot = incremental_scorer.snapshot(ticker)
+                if snapshot is None:
+                    needs_full_scan.append(ticker)
+                else:
+                    ortex_data[ticker] = snapshot
+            live_count = sum(1 for data in ortex_data.values() if data.get('data_quality') == 'live_ortex')
+        else:
+            # Get Ortex data for every priced ticker in one pass; tickers the deadline cut off are partial
+            if ortex_key:
+                ortex_data, chunk_pending = self.get_fast_ortex_batch(successful_tickers, ortex_key, deadline)
+                ortex_pending.update(chunk_pending)
+            live_count = len(ortex_data)
+            
+            # Fill remaining with realistic mock data
+            mock_data = self.generate_realistic_mock_data(successful_tickers)
+            for ticker in successful_tickers:
+                if ticker not in ortex_data:
+                    ortex_data[ticker] = mock_data[ticker]
+            incremental_scorer.remember_many(
+                {t: ortex_data[t] for t in successful_tickers if t not in chunk_pending}
+            )
         
-        # Fill remaining with realistic mock data
-        mock_data = self.generate_realistic_mock_data(successful_tickers)
-        for ticker in successful_tickers:
-            if ticker not in ortex_data:
-                ortex_data[ticker] = mock_data[ticker]
+        # Calculate squeeze scores (one vectorized pass for large batches, or the requested profiles)
+        scored_tickers = [t for t in successful_tickers if t in ortex_data]
+        ortex_rows = [ortex_data[t] for t in scored_tickers]
+        price_rows = [price_data[t] for t in scored_tickers]
+        profile_scores = {}
+        if quote_refresh:
+            # Only the momentum/volume terms are recomputed against the new quotes
+            scoring = primary_profile or profile_registry.get('production')
+            squeeze_scores = {}
+            for ticker in scored_tickers:
+                scores = incremental_scorer.rescore(ticker, [scoring] + profiles, price_data[ticker])
+                if scores is None:
+                    needs_full_scan.append(ticker)
+                    continue
+                squeeze_scores[ticker] = as_metrics(scoring.name, scores[scoring.name])
+                if profiles:
+                    profile_scores[ticker] = {p.name: scores[p.name] for p in profiles}
+            if profiles:
+                profile_registry.record_pass(len(squeeze_scores), len(profiles))
+        else:
+            if profiles:
+                profile_scores = dict(zip(scored_tickers, profile_registry.score_rows(profiles, ortex_rows, price_rows)))
+            if primary_profile:
+                squeeze_scores = {
+                    t: as_metrics(primary_profile.name, profile_scores[t][primary_profile.name]) for t in scored_tickers
+                }
+            else:
+                squeeze_scores = dict(zip(scored_tickers, batch_scorer.score_rows(
+                    'production', ortex_rows, price_rows, self.calculate_squeeze_score
+                )))
         
-        # Calculate squeeze scores
         results = []
         for ticker in successful_tickers:
-            if ticker in ortex_data:
-                squeeze_metrics = self.calculate_squeeze_score(ortex_data[ticker], price_data[ticker])
+            if ticker in squeeze_scores:
+                squeeze_metrics = squeeze_scores[ticker]
                 
                 result = {
                     'ticker': ticker,
@@ -347,13 +336,52 @@ class handler(BaseHTTPRequestHandler):
                     'ortex_data': ortex_data[ticker],
                     'risk_factors': squeeze_metrics.get('risk_factors', []),
                     'data_quality': ortex_data[ticker].get('data_quality', 'estimate'),
-                    'timestamp': datetime.now().isoformat()
+                    'completeness': 'partial' if ticker in ortex_pending else 'complete'
                 }
+                if ticker in profile_scores:
+                    result['profile_scores'] = summarize(profile_scores[ticker])
                 results.append(result)
+        return results, live_count, price_cutoff
+    
+    def perform_production_scan(self, ortex_key=None, filters=None, mode=None, on_result=None):
+        """Production scan bounded by a per-scan wall-clock deadline; mode='quote_refresh' skips Ortex, on_result streams each scored ticker"""
+        start_time = time.time()
+        quote_refresh = is_quote_refresh(mode)
+        deadline = Deadline.for_scan(self.performance_config['timeout_threshold'])
+        # Resolve scoring profiles before fetching so an unknown name fails fast
+        primary_profile, profiles = profile_registry.selection(filters)
         
-        # Sort by squeeze score
-        results.sort(key=lambda x: x['squeeze_score'], reverse=True)
+        # Apply filters - the deadline, not a fixed cap, keeps large scans inside Vercel limits;
+        # max_tickers is only an explicit request for a smaller scan
+        scan_tickers = list(self.master_ticker_list)
         
+        if filters:
+            if filters.get('categories'):
+                scan_tickers = TICKER_UNIVERSE.select(filters['categories'])
+            
+            if filters.get('max_tickers'):
+                scan_tickers = scan_tickers[:int(filters['max_tickers'])]
+        
+        results, live_count, price_cutoff = [], 0, []
+        ortex_pending, needs_full_scan = set(), []
+        # Streamed scans fetch and score chunk by chunk so the first results go out early
+        chunks = stream_chunks(scan_tickers) if on_result else [scan_tickers]
+        for index, chunk in enumerate(chunks):
+            if deadline.expired():
+                # Chunks the deadline never reached are cut off like tickers a fetch missed
+                price_cutoff += [t for later in chunks[index:] for t in later]
+                break
+            chunk_results, chunk_live, chunk_cutoff = self.scan_chunk(
+                chunk, ortex_key, deadline, quote_refresh, primary_profile, profiles, ortex_pending, needs_full_scan
+            )
+            results.extend(chunk_results)
+            live_count += chunk_live
+            price_cutoff += chunk_cutoff
+            if on_result:
+                for result in chunk_results:
+                    on_result(result)
+        
+        # Unsorted - the result pager picks the best-first page with a bounded heap
         total_time = time.time() - start_time
         
         return {
@@ -362,6 +390,15 @@ class handler(BaseHTTPRequestHandler):
                 'total_tickers_scanned': len(scan_tickers),
                 'successful_analysis': len(results),
                 'live_ortex_count': live_count,
+                'scoring_profile': primary_profile.name if primary_profile else 'production',
+                'mode': 'quote_refresh' if quote_refresh else 'full',
+                'needs_full_scan': needs_full_scan,
+                'scan_status': 'partial' if (price_cutoff or ortex_pending or needs_full_scan) else 'complete',
+                'partial_count': len(ortex_pending),
+                # Tickers with no row because the deadline ran out before their quote came back
+                'price_cutoff_count': len(price_cutoff),
+                'price_cutoff_tickers': price_cutoff,
+                'deadline': deadline.summary(),
                 'scan_time_seconds': round(total_time, 1),
                 'performance_rating': 'excellent' if total_time < 10 else 'good',
                 'timestamp': datetime.now().isoformat()
@@ -376,6 +413,12 @@ class handler(BaseHTTPRequestHandler):
             self.send_health()
         elif self.path == '/api/ticker-universe':
             self.send_ticker_universe()
+        elif self.path.startswith('/api/debug/endpoints'):
+            self.send_endpoint_memo()
+        elif self.path == '/api/scoring-profiles':
+            self.send_json_response({'success': True, 'profiles': profile_registry.describe()})
+        elif self.path == '/api/credits':
+            self.send_json_response({'success': True, 'credits': credit_budget.stats()})
         else:
             self.send_404()
     
@@ -387,6 +430,12 @@ class handler(BaseHTTPRequestHandler):
         else:
             self.send_404()
     
+    def do_DELETE(self):
+        if self.path.startswith('/api/debug/endpoints'):
+            self.invalidate_endpoint_memo()
+        else:
+            self.send_404()
+    
     def handle_scan_request(self):
         """Handle comprehensive scan requests"""
         try:
@@ -396,18 +445,45 @@ class handler(BaseHTTPRequestHandler):
             
             ortex_key = data.get('ortex_key') or self.get_ortex_key()
             filters = data.get('filters', {})
+            mode = data.get('mode') or filters.get('mode')
+            # limit / cursor / min_score / risk_factors / category / data_quality, top level or in filters
+            query = result_pager.query(dict(filters or {}, **data))
+            # "stream": "ndjson" / "sse" (or the Accept header) emits each ticker as soon as it is scored
+            stream_fmt = stream_format(self.headers.get('Accept'), data.get('stream'))
             
-            scan_results = self.perform_production_scan(ortex_key, filters)
+            if stream_fmt:
+                if query.cursor:
+                    raise ValueError('Cursor pages are not streamed - drop "stream" to resume a scan')
+                stream = scan_streamer.open(stream_fmt, query.matcher(self.ticker_universe))
+                scan_streamer.send(self, stream, lambda emit: self.perform_production_scan(
+                    ortex_key, filters, mode, on_result=emit
+                )['scan_stats'])
+                return
+            
+            if query.cursor:
+                # Later pages come from the stored scan - no refetch, no rescoring
+                page, page_info, scan_stats = result_pager.resume(query)
+            else:
+                scan_results = self.perform_production_scan(ortex_key, filters, mode)
+                scan_stats = scan_results['scan_stats']
+                page, page_info = result_pager.paginate(query, scan_results['results'], scan_stats, self.ticker_universe)
             
             response = {
                 'success': True,
-                'scan_results': scan_results['results'],
-                'scan_stats': scan_results['scan_stats'],
-                'message': f"Production scan completed - {len(scan_results['results'])} tickers analyzed"
+                'scan_results': page,
+                'scan_stats': scan_stats,
+                'page': page_info,
+                'message': f"Production scan completed - {page_info['total_results']} tickers analyzed"
             }
+            if wants_columnar(data):
+                response = json_responses.columnar(response, 'scan_results')
             
             self.send_json_response(response)
             
+        except CursorExpired as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=410)
+        except ValueError as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=400)
         except Exception as e:
             self.send_json_response({'success': False, 'error': str(e)}, status=500)
     
@@ -984,10 +1060,7 @@ class handler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        page_cache.send(self, 'production_interface', html_content)
     
     def send_health(self):
         """Send API health status"""
@@ -1004,7 +1077,17 @@ class handler(BaseHTTPRequestHandler):
                 'production_optimized': 'active'
             },
             'ticker_universe_size': len(self.master_ticker_list),
-            'performance_config': self.performance_config
+            'performance_config': self.performance_config,
+            'http_pool': http_client.stats(),
+            'ortex_client': ortex_client.stats(),
+            'batch_scoring': batch_scorer.stats(),
+            'scoring_profiles': profile_registry.stats(),
+            'incremental_scoring': incremental_scorer.stats(),
+            'result_pager': result_pager.stats(),
+            'scan_streams': scan_streamer.stats(),
+            'page_cache': page_cache.stats(),
+            'json_responses': json_responses.stats(),
+            'yahoo_quotes': yahoo_quotes.stats()
         }
         
         self.send_json_response(health_data)
@@ -1019,15 +1102,29 @@ class handler(BaseHTTPRequestHandler):
         
         self.send_json_response(universe_info)
     
+    def send_endpoint_memo(self):
+        """Inspect the Ortex endpoint-discovery memo (optionally ?ticker=)"""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        ticker = query.get('ticker', [None])[0]
+        self.send_json_response({
+            'success': True,
+            'stats': endpoint_memo.stats(),
+            'endpoints': endpoint_memo.snapshot(ticker)
+        })
+    
+    def invalidate_endpoint_memo(self):
+        """Invalidate memo entries by ?ticker= and/or ?data_type=, or everything"""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        removed = endpoint_memo.invalidate(query.get('ticker', [None])[0], query.get('data_type', [None])[0])
+        self.send_json_response({'success': True, 'invalidated': removed})
+    
     def send_json_response(self, data, status=200):
         """Send JSON response with proper headers"""
-        self.send_response(status)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        json_responses.send(self, data, status, headers=[
+            ('Access-Control-Allow-Origin', '*'),
+            ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+            ('Access-Control-Allow-Headers', 'Content-Type')
+        ])
     
     def send_404(self):
         """Send 404 error response"""
@@ -1036,11 +1133,9 @@ class handler(BaseHTTPRequestHandler):
 # For backwards compatibility with existing Vercel setup
 # This ensures the handler works as both index.py and production.py
 if __name__ == "__main__":
-    # This allows for local testing
-    from http.server import HTTPServer
+    # Local / self-hosted run on the pooled keep-alive server (see python -m scanner_core.http_server --help)
     import sys
+    from scanner_core.http_server import serve
     
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
-    server = HTTPServer(('localhost', port), handler)
-    print(f"🚀 Production Ultimate Squeeze Scanner running at http://localhost:{port}")
-    server.serve_forever()
\ No newline at end of file
+    sys.exit(serve(handler, 'localhost', port))
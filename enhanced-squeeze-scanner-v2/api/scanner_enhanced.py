@@ -5,129 +5,120 @@ import urllib.request
 import os
 from datetime import datetime
 import time
-import concurrent.futures
-from threading import Lock
 import random
 
+from scanner_core.batch_scoring import batch_scorer
+from scanner_core.credit_budget import BUDGET_EXHAUSTED, credit_budget
+from scanner_core.http_client import http_client
+from scanner_core.json_response import json_responses, wants_columnar
+from scanner_core.ortex_client import endpoint_memo, ortex_client, ortex_headers
+from scanner_core.pagination import PAGE_PARAMS, CursorExpired, result_pager
+from scanner_core.scan_jobs import JobQueueFull, scan_jobs
+from scanner_core.scan_state import ScannerState, scan_signature
+from scanner_core.scoring_profiles import as_metrics, profile_registry, summarize
+from scanner_core.static_assets import page_cache
+from scanner_core.streaming import scan_streamer, stream_chunks, stream_format
+from scanner_core.universe import load_universe
+from scanner_core.yahoo_quotes import yahoo_quotes
+
+# Comprehensive ticker universe for scanning - built once at import, not per request (TICKER_UNIVERSE_PATH loads a file instead)
+TICKER_UNIVERSE = load_universe({
+    'meme_stocks': [
+        'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
+        'DWAC', 'PHUN', 'BENE', 'PROG', 'ATER', 'BBIG', 'RDBX', 'NILE',
+        'MULN', 'HMHC', 'EXPR', 'KOSS', 'NAKD', 'SNDL', 'TLRY', 'CGC'
+    ],
+    'high_short_interest': [
+        'BYND', 'PELOTON', 'ROKU', 'ZOOM', 'DOCU', 'PTON', 'UPST', 'AFRM',
+        'HOOD', 'COIN', 'RIVN', 'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS',
+        'GOEV', 'RIDE', 'FISV', 'WKHS', 'SOLO', 'ARVL', 'CANOO'
+    ],
+    'biotech_squeeze': [
+        'BIIB', 'GILD', 'REGN', 'VRTX', 'BMRN', 'ALNY', 'SRPT', 'IONS',
+        'ARWR', 'EDIT', 'CRSP', 'NTLA', 'BEAM', 'PRIME', 'BLUE', 'FOLD',
+        'RARE', 'KRYS', 'CDNA', 'VCYT', 'PACB', 'ILMN', 'TWST', 'FATE'
+    ],
+    'small_cap_movers': [
+        'SPCE', 'OPEN', 'SKLZ', 'DKNG', 'PENN', 'MGNI', 'FUBO', 'APPS',
+        'WISH', 'COUR', 'MTTR', 'RBLX', 'U', 'PLTR', 'SNOW', 'CRWD',
+        'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'WORK', 'ZM', 'DOCN'
+    ],
+    'russell_3000_samples': [
+        # Major tech
+        'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'NVDA',
+        # Finance
+        'JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BLK',
+        # Healthcare
+        'JNJ', 'PFE', 'ABBV', 'MRK', 'TMO', 'ABT', 'DHR', 'CVS',
+        # Consumer
+        'WMT', 'HD', 'PG', 'KO', 'PEP', 'MCD', 'NKE', 'SBUX',
+        # Energy
+        'XOM', 'CVX', 'COP', 'EOG', 'SLB', 'PSX', 'VLO', 'MPC'
+    ]
+})
+
+# Reusable recent scans and learned scan latency, shared by every request in the process
+scan_state = ScannerState('comprehensive')
+
 class handler(BaseHTTPRequestHandler):
+    # Shared, immutable - handler instances are per request
+    ticker_universe = TICKER_UNIVERSE
+    master_ticker_list = TICKER_UNIVERSE.tickers
     
-    def __init__(self, *args, **kwargs):
-        # Comprehensive ticker universe for scanning
-        self.ticker_universe = {
-            'meme_stocks': [
-                'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
-                'DWAC', 'PHUN', 'BENE', 'PROG', 'ATER', 'BBIG', 'RDBX', 'NILE',
-                'MULN', 'HMHC', 'EXPR', 'KOSS', 'NAKD', 'SNDL', 'TLRY', 'CGC'
-            ],
-            'high_short_interest': [
-                'BYND', 'PELOTON', 'ROKU', 'ZOOM', 'DOCU', 'PTON', 'UPST', 'AFRM',
-                'HOOD', 'COIN', 'RIVN', 'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS',
-                'GOEV', 'RIDE', 'FISV', 'WKHS', 'SOLO', 'ARVL', 'CANOO'
-            ],
-            'biotech_squeeze': [
-                'BIIB', 'GILD', 'REGN', 'VRTX', 'BMRN', 'ALNY', 'SRPT', 'IONS',
-                'ARWR', 'EDIT', 'CRSP', 'NTLA', 'BEAM', 'PRIME', 'BLUE', 'FOLD',
-                'RARE', 'KRYS', 'CDNA', 'VCYT', 'PACB', 'ILMN', 'TWST', 'FATE'
-            ],
-            'small_cap_movers': [
-                'SPCE', 'OPEN', 'SKLZ', 'DKNG', 'PENN', 'MGNI', 'FUBO', 'APPS',
-                'WISH', 'COUR', 'MTTR', 'RBLX', 'U', 'PLTR', 'SNOW', 'CRWD',
-                'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'WORK', 'ZM', 'DOCN'
-            ],
-            'russell_3000_samples': [
-                # Major tech
-                'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'NVDA',
-                # Finance
-                'JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BLK',
-                # Healthcare
-                'JNJ', 'PFE', 'ABBV', 'MRK', 'TMO', 'ABT', 'DHR', 'CVS',
-                # Consumer
-                'WMT', 'HD', 'PG', 'KO', 'PEP', 'MCD', 'NKE', 'SBUX',
-                # Energy
-                'XOM', 'CVX', 'COP', 'EOG', 'SLB', 'PSX', 'VLO', 'MPC'
-            ]
-        }
-        
-        # Flatten all tickers into master list
-        self.master_ticker_list = []
-        for category, tickers in self.ticker_universe.items():
-            self.master_ticker_list.extend(tickers)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        self.master_ticker_list = [x for x in self.master_ticker_list if not (x in seen or seen.add(x))]
-        
-        self.scan_lock = Lock()
-        self.scan_results_cache = {}
-        self.last_scan_time = None
-        
-        super().__init__(*args, **kwargs)
+    @classmethod
+    def offline(cls):
+        """Scanner instance with no request attached, for background scan jobs"""
+        return cls.__new__(cls)
     
     def get_comprehensive_ortex_data(self, ticker, ortex_key):
         """Attempt to get ALL available Ortex data using multiple endpoints"""
         if not ortex_key:
             return None
             
-        # All known Ortex API endpoints to try
+        # Known Ortex endpoint templates per data type, most likely first - the endpoint memo learns
+        # which one answers for each ticker (NASDAQ vs NYSE vs general) and skips ones that 404 or return HTML
         ortex_endpoints = {
-            'short_interest_nasdaq': f'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
-            'short_interest_nyse': f'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
-            'short_interest_general': f'https://api.ortex.com/api/v1/stock/{ticker}/short_interest',
-            'utilization': f'https://api.ortex.com/api/v1/stock/{ticker}/utilization',
-            'cost_to_borrow': f'https://api.ortex.com/api/v1/stock/{ticker}/ctb',
-            'availability': f'https://api.ortex.com/api/v1/stock/{ticker}/availability',
-            'days_to_cover': f'https://api.ortex.com/api/v1/stock/{ticker}/dtc',
-            'shares_on_loan': f'https://api.ortex.com/api/v1/stock/{ticker}/shares_on_loan',
-            'short_volume': f'https://api.ortex.com/api/v1/stock/{ticker}/short_volume',
-            'short_exempt_volume': f'https://api.ortex.com/api/v1/stock/{ticker}/short_exempt',
-            'borrowed_shares': f'https://api.ortex.com/api/v1/stock/{ticker}/borrowed_shares',
-            'returned_shares': f'https://api.ortex.com/api/v1/stock/{ticker}/returned_shares',
-            # Alternative endpoint formats
-            'short_data_alt1': f'https://api.ortex.com/v1/stock/{ticker}/short-interest',
-            'short_data_alt2': f'https://api.ortex.com/rest/v1/stock/{ticker}/short_interest',
-            'utilization_alt': f'https://api.ortex.com/v1/stock/{ticker}/utilization',
-            'ctb_alt': f'https://api.ortex.com/v1/stock/{ticker}/cost-to-borrow',
-            # Public endpoints (may not require auth)
-            'public_short_interest': f'https://public.ortex.com/api/short-interest/{ticker}',
-            'public_data': f'https://public.ortex.com/api/stock/{ticker}',
+            'short_interest': [
+                'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
+                'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
+                'https://api.ortex.com/api/v1/stock/{ticker}/short_interest',
+                'https://api.ortex.com/v1/stock/{ticker}/short-interest',
+                'https://api.ortex.com/rest/v1/stock/{ticker}/short_interest',
+                # Public endpoint (may not require auth)
+                'https://public.ortex.com/api/short-interest/{ticker}',
+            ],
+            'utilization': [
+                'https://api.ortex.com/api/v1/stock/{ticker}/utilization',
+                'https://api.ortex.com/v1/stock/{ticker}/utilization',
+            ],
+            'cost_to_borrow': [
+                'https://api.ortex.com/api/v1/stock/{ticker}/ctb',
+                'https://api.ortex.com/v1/stock/{ticker}/cost-to-borrow',
+            ],
+            'availability': ['https://api.ortex.com/api/v1/stock/{ticker}/availability'],
+            'days_to_cover': ['https://api.ortex.com/api/v1/stock/{ticker}/dtc'],
+            'shares_on_loan': ['https://api.ortex.com/api/v1/stock/{ticker}/shares_on_loan'],
+            'short_volume': ['https://api.ortex.com/api/v1/stock/{ticker}/short_volume'],
+            'short_exempt_volume': ['https://api.ortex.com/api/v1/stock/{ticker}/short_exempt'],
+            'borrowed_shares': ['https://api.ortex.com/api/v1/stock/{ticker}/borrowed_shares'],
+            'returned_shares': ['https://api.ortex.com/api/v1/stock/{ticker}/returned_shares'],
+            'stock_data': ['https://public.ortex.com/api/stock/{ticker}'],
         }
         
         collected_data = {}
         successful_endpoints = []
+        headers = ortex_headers(ortex_key)
         
-        for endpoint_name, url in ortex_endpoints.items():
-            try:
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/2.0')
-                req.add_header('Accept', 'application/json')
-                req.add_header('Ortex-Api-Key', ortex_key)  # Correct auth method
-                
-                with urllib.request.urlopen(req, timeout=5) as response:
-                    if response.getcode() == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        data = response.read().decode('utf-8')
-                        
-                        # Only process JSON responses
-                        if 'application/json' in content_type:
-                            try:
-                                json_data = json.loads(data)
-                                collected_data[endpoint_name] = json_data
-                                successful_endpoints.append(endpoint_name)
-                                print(f"  ✅ {endpoint_name}: Got JSON data ({len(data)} bytes)")
-                            except json.JSONDecodeError:
-                                pass
-                        elif len(data) < 1000 and not data.startswith('<!DOCTYPE'):
-                            # Small non-HTML response might be valid data
-                            try:
-                                json_data = json.loads(data)
-                                collected_data[endpoint_name] = json_data
-                                successful_endpoints.append(endpoint_name)
-                            except:
-                                pass
-                                
-            except Exception as e:
-                # Silent fail for now - we're testing many endpoints
-                continue
+        for data_type, templates in ortex_endpoints.items():
+            with credit_budget.caller('comprehensive_scan'):
+                url, json_data = ortex_client.fetch_json(ticker, data_type, templates, headers, timeout=5)
+            if url == BUDGET_EXHAUSTED:
+                # Out of credits - stop probing; whatever was collected (or the estimate) is used
+                break
+            if json_data is not None:
+                collected_data[data_type] = json_data
+                successful_endpoints.append(data_type)
+                print(f"  ✅ {data_type}: Got JSON data from {url}")
         
         # Process collected data into standardized format
         if collected_data:
@@ -190,54 +181,8 @@ class handler(BaseHTTPRequestHandler):
         return processed
     
     def get_yahoo_price_data_batch(self, tickers):
-        """Get price data for multiple tickers efficiently"""
-        price_data = {}
-        
-        def get_single_price(ticker):
-            try:
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-                
-                with urllib.request.urlopen(req, timeout=5) as response:
-                    data = json.loads(response.read())
-                    
-                    if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                        result = data['chart']['result'][0]
-                        meta = result.get('meta', {})
-                        
-                        current_price = meta.get('regularMarketPrice', 0)
-                        previous_close = meta.get('previousClose', 0)
-                        volume = meta.get('regularMarketVolume', 0)
-                        market_cap = meta.get('marketCap', 0)
-                        
-                        price_change = current_price - previous_close if previous_close else 0
-                        price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                        
-                        return {
-                            'ticker': ticker,
-                            'current_price': round(current_price, 2),
-                            'previous_close': round(previous_close, 2),
-                            'price_change': round(price_change, 2),
-                            'price_change_pct': round(price_change_pct, 2),
-                            'volume': volume,
-                            'market_cap': market_cap,
-                            'success': True
-                        }
-                        
-            except Exception as e:
-                return {'ticker': ticker, 'success': False, 'error': str(e)}
-        
-        # Use threading for faster batch processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_ticker = {executor.submit(get_single_price, ticker): ticker for ticker in tickers}
-            
-            for future in concurrent.futures.as_completed(future_to_ticker):
-                result = future.result()
-                if result and result.get('success'):
-                    price_data[result['ticker']] = result
-        
-        return price_data
+        """Get price data for multiple tickers via batched quote requests"""
+        return yahoo_quotes.get_prices(tickers)
     
     def generate_enhanced_mock_data_batch(self, tickers):
         """Generate realistic mock data for multiple tickers"""
@@ -263,17 +208,17 @@ class handler(BaseHTTPRequestHandler):
                 random.seed(hash(ticker) % 10000)  # Consistent random for same ticker
                 
                 # Different profiles based on ticker patterns
-                if ticker in self.ticker_universe.get('meme_stocks', []):
+                if TICKER_UNIVERSE.in_category(ticker, 'meme_stocks'):
                     # Meme stocks tend to have higher short interest
                     si_base = random.uniform(15, 40)
                     util_base = random.uniform(70, 95)
                     ctb_base = random.uniform(8, 50)
-                elif ticker in self.ticker_universe.get('biotech_squeeze', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'biotech_squeeze'):
                     # Biotech can have extreme metrics
                     si_base = random.uniform(20, 45)
                     util_base = random.uniform(75, 98)
                     ctb_base = random.uniform(12, 80)
-                elif ticker in self.ticker_universe.get('russell_3000_samples', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'russell_3000_samples'):
                     # Large caps typically have lower short interest
                     si_base = random.uniform(1, 8)
                     util_base = random.uniform(20, 60)
@@ -422,41 +367,22 @@ class handler(BaseHTTPRequestHandler):
                 'error': str(e)
             }
     
-    def perform_comprehensive_scan(self, ortex_key=None, filters=None):
-        """Perform comprehensive multi-ticker squeeze scan"""
-        print(f"🚀 Starting comprehensive squeeze scan...")
-        
-        # Apply filters to ticker universe
-        scan_tickers = self.master_ticker_list.copy()
-        
-        if filters:
-            if filters.get('categories'):
-                # Filter by specific categories
-                filtered_tickers = []
-                for category in filters['categories']:
-                    if category in self.ticker_universe:
-                        filtered_tickers.extend(self.ticker_universe[category])
-                scan_tickers = list(set(filtered_tickers))
-            
-            if filters.get('max_tickers'):
-                # Limit number of tickers to scan
-                scan_tickers = scan_tickers[:filters['max_tickers']]
-        
-        print(f"📊 Scanning {len(scan_tickers)} tickers...")
-        
+    def scan_chunk(self, tickers, ortex_key, primary_profile, profiles, live_tests=5):
+        """Fetch and score one set of tickers: (results, priced ticker count, live Ortex tickers tried)"""
         # Get price data for all tickers (batch processing)
         print(f"💰 Fetching live price data...")
-        price_data = self.get_yahoo_price_data_batch(scan_tickers)
-        successful_price_tickers = [t for t in scan_tickers if t in price_data]
+        price_data = self.get_yahoo_price_data_batch(tickers)
+        successful_price_tickers = [t for t in tickers if t in price_data]
         
         print(f"✅ Got price data for {len(successful_price_tickers)} tickers")
         
         # Get Ortex data (use mock data for now, but structure for live integration)
         print(f"🔍 Processing short interest data...")
+        test_tickers = []
         if ortex_key:
             # Try live Ortex data for a few tickers as test
             live_ortex_results = {}
-            test_tickers = successful_price_tickers[:5]  # Test first 5
+            test_tickers = successful_price_tickers[:live_tests]  # Test first 5 of the scan
             
             for ticker in test_tickers:
                 ortex_data = self.get_comprehensive_ortex_data(ticker, ortex_key)
@@ -477,14 +403,25 @@ class handler(BaseHTTPRequestHandler):
         
         # Calculate squeeze scores for all tickers
         print(f"🎯 Calculating squeeze scores...")
+        scored_tickers = [t for t in successful_price_tickers if t in ortex_data]
+        ortex_rows = [ortex_data[t] for t in scored_tickers]
+        price_rows = [price_data[t] for t in scored_tickers]
+        profile_scores = {}
+        if profiles:
+            profile_scores = dict(zip(scored_tickers, profile_registry.score_rows(profiles, ortex_rows, price_rows)))
+        if primary_profile:
+            squeeze_scores = {
+                t: as_metrics(primary_profile.name, profile_scores[t][primary_profile.name]) for t in scored_tickers
+            }
+        else:
+            squeeze_scores = dict(zip(scored_tickers, batch_scorer.score_rows(
+                'advanced', ortex_rows, price_rows, self.calculate_squeeze_score_advanced
+            )))
         results = []
         
         for ticker in successful_price_tickers:
-            if ticker in ortex_data:
-                squeeze_metrics = self.calculate_squeeze_score_advanced(
-                    ortex_data[ticker], 
-                    price_data[ticker]
-                )
+            if ticker in squeeze_scores:
+                squeeze_metrics = squeeze_scores[ticker]
                 
                 result = {
                     'ticker': ticker,
@@ -498,27 +435,66 @@ class handler(BaseHTTPRequestHandler):
                     'ortex_data': ortex_data[ticker],
                     'score_breakdown': squeeze_metrics.get('score_breakdown', {}),
                     'risk_factors': squeeze_metrics.get('risk_factors', []),
-                    'data_quality': ortex_data[ticker].get('data_quality', 'mock'),
-                    'timestamp': datetime.now().isoformat()
+                    'data_quality': ortex_data[ticker].get('data_quality', 'mock')
                 }
                 
+                if ticker in profile_scores:
+                    result['profile_scores'] = summarize(profile_scores[ticker])
                 results.append(result)
+        return results, len(successful_price_tickers), len(test_tickers)
+    
+    def select_scan_tickers(self, filters=None):
+        """Apply category / max_tickers filters to the ticker universe"""
+        scan_tickers = list(self.master_ticker_list)
         
-        # Sort by squeeze score (highest first)
-        results.sort(key=lambda x: x['squeeze_score'], reverse=True)
+        if filters:
+            if filters.get('categories'):
+                # Filter by specific categories
+                scan_tickers = TICKER_UNIVERSE.select(filters['categories'])
+            
+            if filters.get('max_tickers'):
+                # Limit number of tickers to scan
+                scan_tickers = scan_tickers[:filters['max_tickers']]
+        
+        return scan_tickers
+    
+    def perform_comprehensive_scan(self, ortex_key=None, filters=None, on_result=None):
+        """Perform comprehensive multi-ticker squeeze scan; on_result streams each ticker as it is scored"""
+        print(f"🚀 Starting comprehensive squeeze scan...")
+        start_time = time.time()
+        # Resolve scoring profiles before fetching so an unknown name fails fast
+        primary_profile, profiles = profile_registry.selection(filters)
+        
+        scan_tickers = self.select_scan_tickers(filters)
+        
+        print(f"📊 Scanning {len(scan_tickers)} tickers...")
+        
+        results, successful_price_count, live_tests = [], 0, 5
+        # Streamed scans fetch and score chunk by chunk so the first results go out early
+        for chunk in (stream_chunks(scan_tickers) if on_result else [scan_tickers]):
+            chunk_results, chunk_priced, chunk_tests = self.scan_chunk(chunk, ortex_key, primary_profile, profiles, live_tests)
+            results.extend(chunk_results)
+            successful_price_count += chunk_priced
+            live_tests -= chunk_tests
+            if on_result:
+                for result in chunk_results:
+                    on_result(result)
         
+        # Left unsorted - the result pager selects the best-first page with a bounded heap
         print(f"✅ Scan complete! Found {len(results)} analyzed tickers")
+        scan_state.record_latency(len(scan_tickers), time.time() - start_time)
         
         return {
             'results': results,
             'scan_stats': {
                 'total_tickers_attempted': len(scan_tickers),
-                'successful_price_data': len(successful_price_tickers),
+                'successful_price_data': successful_price_count,
                 'successful_analysis': len(results),
                 'live_ortex_count': len([r for r in results if r['data_quality'] == 'live_ortex']),
+                'scoring_profile': primary_profile.name if primary_profile else 'advanced',
                 'mock_data_count': len([r for r in results if 'mock' in r['data_quality']]),
                 'scan_timestamp': datetime.now().isoformat(),
-                'top_score': results[0]['squeeze_score'] if results else 0,
+                'top_score': max((r['squeeze_score'] for r in results), default=0),
                 'categories_scanned': list(self.ticker_universe.keys()) if not filters else filters.get('categories', [])
             }
         }
@@ -532,12 +508,22 @@ class handler(BaseHTTPRequestHandler):
             self.send_scanner_status()
         elif self.path.startswith('/api/ticker-universe'):
             self.send_ticker_universe()
+        elif self.path.startswith('/api/debug/endpoints'):
+            self.send_endpoint_memo()
+        elif self.path == '/api/scoring-profiles':
+            self.send_scoring_profiles()
+        elif self.path.startswith('/api/scans/'):
+            self.send_scan_job()
+        elif self.path == '/api/credits':
+            self.send_json_response({'success': True, 'credits': credit_budget.stats()})
         else:
             self.send_404()
     
     def do_POST(self):
         if self.path == '/api/comprehensive-scan':
             self.handle_comprehensive_scan()
+        elif self.path == '/api/scans':
+            self.handle_scan_job_submit()
         elif self.path == '/api/squeeze/scan':
             self.handle_single_squeeze_scan()
         elif self.path == '/api/validate-ortex-key':
@@ -545,6 +531,14 @@ class handler(BaseHTTPRequestHandler):
         else:
             self.send_404()
     
+    def do_DELETE(self):
+        if self.path.startswith('/api/debug/endpoints'):
+            self.send_endpoint_memo(invalidate=True)
+        elif self.path.startswith('/api/scans/'):
+            self.send_scan_job(cancel=True)
+        else:
+            self.send_404()
+    
     def handle_comprehensive_scan(self):
         """Handle comprehensive multi-ticker scan requests"""
         try:
@@ -554,33 +548,92 @@ class handler(BaseHTTPRequestHandler):
             
             ortex_key = data.get('ortex_key', '')
             filters = data.get('filters', {})
+            # limit / cursor / min_score / risk_factors / category / data_quality, top level or in filters
+            query = result_pager.query(dict(filters or {}, **data))
+            # "stream": "ndjson" / "sse" (or the Accept header) emits each ticker as soon as it is scored
+            stream_fmt = stream_format(self.headers.get('Accept'), data.get('stream'))
+            
+            if stream_fmt:
+                if query.cursor:
+                    raise ValueError('Cursor pages are not streamed - drop "stream" to resume a scan')
+                stream = scan_streamer.open(stream_fmt, query.matcher(self.ticker_universe))
+                scan_streamer.send(self, stream, lambda emit: self.perform_comprehensive_scan(
+                    ortex_key, filters, on_result=emit
+                )['scan_stats'])
+                return
             
-            # Perform the scan
-            scan_results = self.perform_comprehensive_scan(ortex_key, filters)
+            if query.cursor:
+                # Later pages come from the stored scan - no refetch, no rescoring
+                page, page_info, scan_stats = result_pager.resume(query)
+            else:
+                # Perform the scan - an identical recent or in-flight scan is reused unless "fresh": true
+                scan_results, reused_age = scan_state.run(
+                    scan_signature(filters, ortex_key, ignore=PAGE_PARAMS),
+                    lambda: self.perform_comprehensive_scan(ortex_key, filters),
+                    fresh=bool(data.get('fresh'))
+                )
+                scan_stats = scan_results['scan_stats']
+                if reused_age is not None:
+                    scan_stats = dict(scan_stats, reused_scan_age_seconds=reused_age)
+                page, page_info = result_pager.paginate(query, scan_results['results'], scan_stats, self.ticker_universe)
             
             response = {
                 'success': True,
-                'scan_results': scan_results['results'],
-                'scan_stats': scan_results['scan_stats'],
-                'message': f"Comprehensive scan completed - analyzed {len(scan_results['results'])} tickers"
+                'scan_results': page,
+                'scan_stats': scan_stats,
+                'page': page_info,
+                'message': f"Comprehensive scan completed - analyzed {page_info['total_results']} tickers"
             }
+            if wants_columnar(data):
+                response = json_responses.columnar(response, 'scan_results')
+            
+            self.send_json_response(response)
             
-            # Cache results
-            with self.scan_lock:
-                self.scan_results_cache = scan_results
-                self.last_scan_time = datetime.now()
+        except (CursorExpired, ValueError) as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=410 if isinstance(e, CursorExpired) else 400)
+        except Exception as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=500)
+    
+    def handle_scan_job_submit(self):
+        """Queue a comprehensive scan as a background job and return its ID right away (202)"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data.decode()) if post_data else {}
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            filters = data.get('filters', {})
+            # Unknown scoring profiles fail here, not minutes later in the worker
+            profile_registry.selection(filters)
+            # The key rides along in memory only - it is never written to the job store
+            job = scan_jobs.submit(COMPREHENSIVE_SCAN_JOB, {'filters': filters},
+                                   secrets={'ortex_key': data.get('ortex_key', '')})
+            job['poll_url'] = f"/api/scans/{job['job_id']}"
+            self.send_json_response(dict(job, success=True), status=202)
             
+        except JobQueueFull as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=503)
+        except ValueError as e:
+            self.send_json_response({'success': False, 'error': str(e)}, status=400)
         except Exception as e:
-            error_response = {'success': False, 'error': str(e)}
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+            self.send_json_response({'success': False, 'error': str(e)}, status=500)
+    
+    def send_scan_job(self, cancel=False):
+        """Poll (GET, ?since=N for new partial results only) or cancel (DELETE) a background scan job"""
+        url = urllib.parse.urlsplit(self.path)
+        job_id = url.path[len('/api/scans/'):].strip('/')
+        if cancel:
+            job = scan_jobs.cancel(job_id)
+        else:
+            since = urllib.parse.parse_qs(url.query).get('since', ['0'])[0]
+            job = scan_jobs.get(job_id, int(since) if since.isdigit() else 0)
+        
+        if job is None:
+            self.send_json_response({'success': False, 'error': 'Unknown or expired scan job'}, status=404)
+        else:
+            self.send_json_response(dict(job, success=True))
+    
+    def send_json_response(self, data, status=200):
+        json_responses.send(self, data, status)
     
     def send_ticker_universe(self):
         """Send ticker universe information"""
@@ -986,10 +1039,7 @@ class handler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        page_cache.send(self, 'comprehensive_interface', html_content)
     
     def send_health(self):
         """Send API health check"""
@@ -1006,7 +1056,18 @@ class handler(BaseHTTPRequestHandler):
                 'ticker_universe': len(self.master_ticker_list)
             },
             'ticker_categories': {name: len(tickers) for name, tickers in self.ticker_universe.items()},
-            'total_universe_size': len(self.master_ticker_list)
+            'total_universe_size': len(self.master_ticker_list),
+            'http_pool': http_client.stats(),
+            'ortex_client': ortex_client.stats(),
+            'batch_scoring': batch_scorer.stats(),
+            'scoring_profiles': profile_registry.stats(),
+            'result_pager': result_pager.stats(),
+            'scan_streams': scan_streamer.stats(),
+            'scan_jobs': scan_jobs.stats(),
+            'scan_state': scan_state.stats(),
+            'page_cache': page_cache.stats(),
+            'json_responses': json_responses.stats(),
+            'yahoo_quotes': yahoo_quotes.stats()
         }
         
         self.send_response(200)
@@ -1024,10 +1085,49 @@ class handler(BaseHTTPRequestHandler):
         # Implementation from simplified.py
         pass
     
+    def send_endpoint_memo(self, invalidate=False):
+        """Inspect (GET) or invalidate (DELETE) the Ortex endpoint memo, filtered by ?ticker=/&data_type="""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        ticker = query.get('ticker', [None])[0]
+        if invalidate:
+            response = {'success': True, 'invalidated': endpoint_memo.invalidate(ticker, query.get('data_type', [None])[0])}
+        else:
+            response = {'success': True, 'stats': endpoint_memo.stats(), 'endpoints': endpoint_memo.snapshot(ticker)}
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
+    
+    def send_scoring_profiles(self):
+        """List the scoring profiles a scan can select with filters.scoring_profile / filters.profiles"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps({'success': True, 'profiles': profile_registry.describe()}).encode())
+    
     def send_404(self):
         """Send 404 error"""
         self.send_response(404)
         self.send_header('Content-type', 'application/json')
         self.end_headers()
         response = {'error': 'Not Found'}
-        self.wfile.write(json.dumps(response).encode())
\ No newline at end of file
+        self.wfile.write(json.dumps(response).encode())
+
+
+COMPREHENSIVE_SCAN_JOB = 'comprehensive_scan'
+
+
+def run_comprehensive_scan_job(params, job):
+    """Background runner: the comprehensive scan, recording each scored ticker as it lands"""
+    scanner = handler.offline()
+    filters = params.get('filters') or {}
+    job.set_total(len(scanner.select_scan_tickers(filters)))
+    # Jobs recovered after a restart have lost their request key; fall back to the environment
+    ortex_key = job.secrets.get('ortex_key') or os.environ.get('ORTEX_API_KEY')
+    scan_results = scanner.perform_comprehensive_scan(ortex_key, filters, on_result=job.add_result)
+    scan_results['results'].sort(key=lambda result: result['squeeze_score'], reverse=True)
+    return scan_results
+
+
+scan_jobs.register(COMPREHENSIVE_SCAN_JOB, run_comprehensive_scan_job)
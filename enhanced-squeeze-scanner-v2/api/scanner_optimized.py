@@ -5,64 +5,72 @@ import urllib.request
 import os
 from datetime import datetime
 import time
-import concurrent.futures
-from threading import Lock
 import random
 
+from scanner_core.batch_scoring import batch_scorer
+from scanner_core.credit_budget import credit_budget
+from scanner_core.deadline import Deadline
+from scanner_core.http_client import http_client
+from scanner_core.json_response import json_responses, wants_columnar
+from scanner_core.ortex_client import endpoint_memo, ortex_client, ortex_headers
+from scanner_core.scan_state import ScannerState, scan_signature
+from scanner_core.scoring_profiles import as_metrics, profile_registry, summarize
+from scanner_core.static_assets import page_cache
+from scanner_core.universe import load_universe
+from scanner_core.yahoo_quotes import yahoo_quotes
+
+# NASDAQ first, then NYSE - the endpoint memo remembers which one works per ticker
+ORTEX_SHORT_INTEREST_ENDPOINTS = [
+    'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
+    'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
+]
+
+# Optimized ticker universe (high-potential candidates) - built once at import, not per request (TICKER_UNIVERSE_PATH loads a file instead)
+TICKER_UNIVERSE = load_universe({
+    'top_meme_stocks': [
+        'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
+        'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
+    ],
+    'high_short_interest': [
+        'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
+        'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
+    ],
+    'biotech_squeeze': [
+        'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
+        'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
+    ],
+    'small_cap_movers': [
+        'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
+        'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
+    ],
+    'large_cap_samples': [
+        'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
+    ]
+})
+
+# Learned per-ticker latency and reusable recent scans, shared by every request in the process
+scan_state = ScannerState('optimized', default_ticker_time=2.5)
+
 class handler(BaseHTTPRequestHandler):
+    # Shared, immutable - handler instances are per request
+    ticker_universe = TICKER_UNIVERSE
+    master_ticker_list = TICKER_UNIVERSE.tickers
     
     def __init__(self, *args, **kwargs):
-        # Optimized ticker universe - focused on high-potential candidates
-        self.ticker_universe = {
-            'top_meme_stocks': [
-                'GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT', 
-                'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'
-            ],
-            'high_short_interest': [
-                'BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
-                'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'
-            ],
-            'biotech_squeeze': [
-                'BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
-                'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'
-            ],
-            'small_cap_movers': [
-                'SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
-                'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'
-            ],
-            'large_cap_samples': [
-                'AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT'
-            ]
-        }
-        
-        # Flatten all tickers into master list
-        self.master_ticker_list = []
-        for category, tickers in self.ticker_universe.items():
-            self.master_ticker_list.extend(tickers)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        self.master_ticker_list = [x for x in self.master_ticker_list if not (x in seen or seen.add(x))]
-        
-        self.scan_lock = Lock()
-        self.scan_results_cache = {}
-        self.last_scan_time = None
-        
-        # Performance tracking
+        # Scan limits; seconds per ticker is learned process-wide by scan_state
         self.performance_stats = {
-            'avg_ticker_time': 2.5,  # Average seconds per ticker
-            'max_safe_batch_size': 20,  # Maximum safe batch size
-            'timeout_threshold': 45  # Maximum scan time in seconds
+            'ortex_timeout': 3,  # Per-request Ortex timeout, capped by the scan deadline
+            'timeout_threshold': 45  # Maximum scan time in seconds - per-scan deadline budget
         }
         
         super().__init__(*args, **kwargs)
     
     def calculate_optimal_scan_size(self, requested_size, timeout_limit=45):
-        """Calculate optimal scan size based on performance metrics"""
-        avg_time_per_ticker = self.performance_stats['avg_ticker_time']
+        """Advisory scan size from performance metrics (scans are bounded by their deadline, not this)"""
+        avg_time_per_ticker = scan_state.avg_ticker_time()
         max_safe_size = int(timeout_limit / avg_time_per_ticker * 0.8)  # 80% safety margin
         
-        optimal_size = min(requested_size, max_safe_size, self.performance_stats['max_safe_batch_size'])
+        optimal_size = min(requested_size, max_safe_size)
         
         return {
             'optimal_size': optimal_size,
@@ -71,39 +79,36 @@ class handler(BaseHTTPRequestHandler):
             'recommended_min_score': 50 if optimal_size > 20 else 30 if optimal_size > 10 else 0
         }
     
-    def get_fast_ortex_data(self, ticker, ortex_key, timeout=3):
+    def get_fast_ortex_data(self, ticker, ortex_key, timeout=3, deadline=None):
         """Fast Ortex data retrieval with short timeout"""
         if not ortex_key:
             return None
-            
-        # Only try the known working endpoints for speed
-        working_endpoints = [
-            f'https://api.ortex.com/api/v1/stock/nasdaq/{ticker}/short_interest',
-            f'https://api.ortex.com/api/v1/stock/nyse/{ticker}/short_interest',
-        ]
         
-        for url in working_endpoints:
-            try:
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/2.0')
-                req.add_header('Accept', 'application/json')
-                req.add_header('Ortex-Api-Key', ortex_key)
-                
-                with urllib.request.urlopen(req, timeout=timeout) as response:
-                    if response.getcode() == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        if 'application/json' in content_type:
-                            data = response.read().decode('utf-8')
-                            try:
-                                json_data = json.loads(data)
-                                return self.process_ortex_json_fast(json_data)
-                            except json.JSONDecodeError:
-                                continue
-                                
-            except Exception:
-                continue
-        
-        return None
+        # A refused credit reservation comes back as a miss and the scan models the ticker
+        with credit_budget.caller('optimized_scan'):
+            url, json_data = ortex_client.fetch_json(
+                ticker, 'short_interest', ORTEX_SHORT_INTEREST_ENDPOINTS,
+                ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/2.0'), timeout, deadline
+            )
+        return self.process_ortex_json_fast(json_data) if json_data is not None else None
+    
+    def get_fast_ortex_batch(self, tickers, ortex_key, deadline=None):
+        """Ortex data for many tickers in one engine pass; returns (data, tickers cut off by the deadline)"""
+        if not ortex_key or not tickers:
+            return {}, set()
+        
+        with credit_budget.caller('optimized_scan'):
+            fetched = ortex_client.fetch_batch(
+                {ticker: (ticker, 'short_interest', ORTEX_SHORT_INTEREST_ENDPOINTS) for ticker in tickers},
+                ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/2.0'),
+                timeout=self.performance_stats['ortex_timeout'],
+                deadline=deadline
+            )
+        ortex_data = {
+            ticker: self.process_ortex_json_fast(json_data)
+            for ticker, (url, json_data) in fetched.items() if json_data is not None
+        }
+        return ortex_data, set(tickers) - set(fetched)
     
     def process_ortex_json_fast(self, json_data):
         """Fast processing of Ortex JSON data"""
@@ -140,56 +145,9 @@ class handler(BaseHTTPRequestHandler):
             
         return processed
     
-    def get_yahoo_price_data_fast(self, tickers, max_workers=15):
-        """Optimized Yahoo Finance data with reduced workers to prevent timeouts"""
-        price_data = {}
-        
-        def get_single_price_fast(ticker):
-            try:
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'Mozilla/5.0 (compatible; SqueezeScanner/1.0)')
-                
-                with urllib.request.urlopen(req, timeout=4) as response:
-                    data = json.loads(response.read())
-                    
-                    if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                        result = data['chart']['result'][0]
-                        meta = result.get('meta', {})
-                        
-                        current_price = meta.get('regularMarketPrice', 0)
-                        previous_close = meta.get('previousClose', 0)
-                        volume = meta.get('regularMarketVolume', 0)
-                        
-                        price_change = current_price - previous_close if previous_close else 0
-                        price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                        
-                        return {
-                            'ticker': ticker,
-                            'current_price': round(current_price, 2),
-                            'price_change': round(price_change, 2),
-                            'price_change_pct': round(price_change_pct, 2),
-                            'volume': volume,
-                            'success': True
-                        }
-                        
-            except Exception as e:
-                return {'ticker': ticker, 'success': False, 'error': str(e)}
-        
-        # Reduced thread pool size for stability
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_ticker = {executor.submit(get_single_price_fast, ticker): ticker for ticker in tickers}
-            
-            for future in concurrent.futures.as_completed(future_to_ticker, timeout=30):
-                try:
-                    result = future.result(timeout=5)
-                    if result and result.get('success'):
-                        price_data[result['ticker']] = result
-                except (concurrent.futures.TimeoutError, Exception):
-                    # Skip failed tickers to prevent timeout
-                    continue
-        
-        return price_data
+    def get_yahoo_price_data_fast(self, tickers, max_workers=15, deadline=None):
+        """Optimized Yahoo Finance data via batched quote requests (max_workers kept for compatibility)"""
+        return yahoo_quotes.get_prices(tickers, timeout=4, deadline=deadline)
     
     def generate_smart_mock_data(self, tickers):
         """Smart mock data generation with realistic profiles"""
@@ -213,15 +171,15 @@ class handler(BaseHTTPRequestHandler):
                 # Generate category-appropriate data
                 random.seed(hash(ticker) % 10000)
                 
-                if ticker in self.ticker_universe.get('top_meme_stocks', []):
+                if TICKER_UNIVERSE.in_category(ticker, 'top_meme_stocks'):
                     si_base = random.uniform(15, 35)
                     util_base = random.uniform(75, 95)
                     ctb_base = random.uniform(10, 40)
-                elif ticker in self.ticker_universe.get('biotech_squeeze', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'biotech_squeeze'):
                     si_base = random.uniform(20, 40)
                     util_base = random.uniform(80, 98)
                     ctb_base = random.uniform(15, 60)
-                elif ticker in self.ticker_universe.get('large_cap_samples', []):
+                elif TICKER_UNIVERSE.in_category(ticker, 'large_cap_samples'):
                     si_base = random.uniform(1, 6)
                     util_base = random.uniform(20, 50)
                     ctb_base = random.uniform(0.5, 3)
@@ -298,24 +256,21 @@ class handler(BaseHTTPRequestHandler):
             return {'squeeze_score': 0, 'squeeze_type': 'Error', 'risk_factors': []}
     
     def perform_optimized_scan(self, ortex_key=None, filters=None):
-        """Optimized scan with timeout prevention"""
+        """Optimized scan bounded by a per-scan wall-clock deadline"""
         start_time = time.time()
-        print(f"🚀 Starting optimized squeeze scan...")
+        deadline = Deadline.for_scan(self.performance_stats['timeout_threshold'])
+        # Resolve scoring profiles before fetching so an unknown name fails fast
+        primary_profile, profiles = profile_registry.selection(filters)
+        print(f"🚀 Starting optimized squeeze scan ({deadline.budget:.0f}s budget)...")
         
-        # Apply filters and optimize scan size
-        scan_tickers = self.master_ticker_list.copy()
+        # Apply filters - the deadline, not a fixed cap, keeps large scans inside the timeout
+        scan_tickers = list(self.master_ticker_list)
         
         if filters:
             if filters.get('categories'):
-                filtered_tickers = []
-                for category in filters['categories']:
-                    if category in self.ticker_universe:
-                        filtered_tickers.extend(self.ticker_universe[category])
-                scan_tickers = list(set(filtered_tickers))
+                scan_tickers = TICKER_UNIVERSE.select(filters['categories'])
             
-            requested_size = filters.get('max_tickers', 20)
-            scan_optimization = self.calculate_optimal_scan_size(requested_size)
-            scan_tickers = scan_tickers[:scan_optimization['optimal_size']]
+            scan_tickers = scan_tickers[:filters.get('max_tickers', 20)]
         else:
             scan_tickers = scan_tickers[:15]  # Default safe size
         
@@ -323,20 +278,18 @@ class handler(BaseHTTPRequestHandler):
         
         # Fast price data retrieval
         print(f"💰 Fetching live price data...")
-        price_data = self.get_yahoo_price_data_fast(scan_tickers, max_workers=12)
+        price_data = self.get_yahoo_price_data_fast(scan_tickers, max_workers=12, deadline=deadline)
         successful_tickers = [t for t in scan_tickers if t in price_data]
+        price_cutoff = [t for t in scan_tickers if t not in price_data] if deadline.expired() else []
         
         print(f"✅ Got price data for {len(successful_tickers)} tickers")
         
-        # Fast Ortex data attempt (limited to prevent timeout)
-        ortex_data = {}
-        if ortex_key and len(successful_tickers) <= 10:  # Only try Ortex for small batches
-            print(f"🔍 Attempting live Ortex data for top candidates...")
-            for ticker in successful_tickers[:5]:  # Limit to top 5 for speed
-                ortex_result = self.get_fast_ortex_data(ticker, ortex_key)
-                if ortex_result:
-                    ortex_data[ticker] = ortex_result
-                    print(f"  ✅ Live Ortex data for {ticker}")
+        # Live Ortex data for every priced ticker until the deadline; the rest are marked partial
+        ortex_data, ortex_pending = {}, set()
+        if ortex_key:
+            print(f"🔍 Fetching live Ortex data ({deadline.remaining():.1f}s left)...")
+            ortex_data, ortex_pending = self.get_fast_ortex_batch(successful_tickers, ortex_key, deadline)
+            print(f"  ✅ Live Ortex data for {len(ortex_data)} tickers, {len(ortex_pending)} cut off by deadline")
         
         # Fill remaining with smart mock data (preserve live data)
         mock_data = self.generate_smart_mock_data(successful_tickers)
@@ -350,13 +303,25 @@ class handler(BaseHTTPRequestHandler):
         
         # Fast analysis
         print(f"🎯 Calculating squeeze scores...")
+        scored_tickers = [t for t in successful_tickers if t in ortex_data]
+        ortex_rows = [ortex_data[t] for t in scored_tickers]
+        price_rows = [price_data[t] for t in scored_tickers]
+        profile_scores = {}
+        if profiles:
+            profile_scores = dict(zip(scored_tickers, profile_registry.score_rows(profiles, ortex_rows, price_rows)))
+        if primary_profile:
+            squeeze_scores = {
+                t: as_metrics(primary_profile.name, profile_scores[t][primary_profile.name]) for t in scored_tickers
+            }
+        else:
+            squeeze_scores = dict(zip(scored_tickers, batch_scorer.score_rows(
+                'optimized', ortex_rows, price_rows, self.calculate_squeeze_score_optimized
+            )))
         results = []
         
         for ticker in successful_tickers:
-            if ticker in ortex_data:
-                squeeze_metrics = self.calculate_squeeze_score_optimized(
-                    ortex_data[ticker], price_data[ticker]
-                )
+            if ticker in squeeze_scores:
+                squeeze_metrics = squeeze_scores[ticker]
                 
                 result = {
                     'ticker': ticker,
@@ -369,8 +334,10 @@ class handler(BaseHTTPRequestHandler):
                     'ortex_data': ortex_data[ticker],
                     'risk_factors': squeeze_metrics.get('risk_factors', []),
                     'data_quality': ortex_data[ticker].get('data_quality', 'mock'),
-                    'timestamp': datetime.now().isoformat()
+                    'completeness': 'partial' if ticker in ortex_pending else 'complete'
                 }
+                if ticker in profile_scores:
+                    result['profile_scores'] = summarize(profile_scores[ticker])
                 results.append(result)
         
         # Sort by squeeze score
@@ -379,9 +346,8 @@ class handler(BaseHTTPRequestHandler):
         total_time = time.time() - start_time
         print(f"✅ Optimized scan complete! {len(results)} tickers in {total_time:.1f}s")
         
-        # Update performance stats
-        if len(results) > 0:
-            self.performance_stats['avg_ticker_time'] = total_time / len(results)
+        # Feed the latency model that sizes the next scans
+        scan_state.record_latency(len(results), total_time)
         
         return {
             'results': results,
@@ -389,6 +355,13 @@ class handler(BaseHTTPRequestHandler):
                 'total_tickers_scanned': len(scan_tickers),
                 'successful_analysis': len(results),
                 'live_ortex_count': len([r for r in results if r['data_quality'] == 'live_ortex']),
+                'scoring_profile': primary_profile.name if primary_profile else 'optimized',
+                'scan_status': 'partial' if (price_cutoff or ortex_pending) else 'complete',
+                'partial_count': len(ortex_pending),
+                # Tickers with no row because the deadline ran out before their quote came back
+                'price_cutoff_count': len(price_cutoff),
+                'price_cutoff_tickers': price_cutoff,
+                'deadline': deadline.summary(),
                 'scan_time_seconds': round(total_time, 1),
                 'performance_rating': 'excellent' if total_time < 15 else 'good' if total_time < 30 else 'acceptable',
                 'top_score': results[0]['squeeze_score'] if results else 0,
@@ -403,6 +376,10 @@ class handler(BaseHTTPRequestHandler):
             self.send_health()
         elif self.path == '/api/performance-stats':
             self.send_performance_stats()
+        elif self.path.startswith('/api/debug/endpoints'):
+            self.send_endpoint_memo()
+        elif self.path == '/api/scoring-profiles':
+            self.send_scoring_profiles()
         else:
             self.send_404()
     
@@ -412,6 +389,12 @@ class handler(BaseHTTPRequestHandler):
         else:
             self.send_404()
     
+    def do_DELETE(self):
+        if self.path.startswith('/api/debug/endpoints'):
+            self.send_endpoint_memo(invalidate=True)
+        else:
+            self.send_404()
+    
     def handle_optimized_scan(self):
         """Handle optimized scan requests"""
         try:
@@ -426,33 +409,38 @@ class handler(BaseHTTPRequestHandler):
             requested_size = filters.get('max_tickers', 20)
             optimization = self.calculate_optimal_scan_size(requested_size)
             
-            # Perform optimized scan
-            scan_results = self.perform_optimized_scan(ortex_key, filters)
+            # Perform optimized scan - an identical recent or in-flight scan is reused unless "fresh": true
+            scan_results, reused_age = scan_state.run(
+                scan_signature(filters, ortex_key),
+                lambda: self.perform_optimized_scan(ortex_key, filters),
+                fresh=bool(data.get('fresh'))
+            )
+            scan_stats = scan_results['scan_stats']
+            if reused_age is not None:
+                scan_stats = dict(scan_stats, reused_scan_age_seconds=reused_age)
             
             response = {
                 'success': True,
                 'scan_results': scan_results['results'],
-                'scan_stats': scan_results['scan_stats'],
+                'scan_stats': scan_stats,
                 'optimization_info': optimization,
-                'message': f"Optimized scan completed - {len(scan_results['results'])} tickers analyzed in {scan_results['scan_stats']['scan_time_seconds']}s"
+                'message': f"Optimized scan completed - {len(scan_results['results'])} tickers analyzed in {scan_stats['scan_time_seconds']}s"
             }
+            if wants_columnar(data):
+                response = json_responses.columnar(response, 'scan_results')
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            json_responses.send(self, response)
             
         except Exception as e:
-            error_response = {'success': False, 'error': str(e)}
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+            json_responses.send(self, {'success': False, 'error': str(e)}, status=500)
+    
+    def performance_metrics(self):
+        return dict(self.performance_stats, avg_ticker_time=scan_state.avg_ticker_time())
     
     def send_performance_stats(self):
         """Send performance statistics"""
         stats = {
-            'performance_metrics': self.performance_stats,
+            'performance_metrics': self.performance_metrics(),
             'ticker_universe': {name: len(tickers) for name, tickers in self.ticker_universe.items()},
             'total_tickers': len(self.master_ticker_list),
             'optimization_recommendations': {
@@ -462,8 +450,10 @@ class handler(BaseHTTPRequestHandler):
                     'large': '20+ tickers (use high min score)'
                 },
                 'timeout_prevention': {
-                    'recommended_max': self.performance_stats['max_safe_batch_size'],
-                    'estimated_time_per_ticker': self.performance_stats['avg_ticker_time']
+                    'recommended_max': self.calculate_optimal_scan_size(
+                        len(self.master_ticker_list), self.performance_stats['timeout_threshold']
+                    )['optimal_size'],
+                    'estimated_time_per_ticker': scan_state.avg_ticker_time()
                 }
             }
         }
@@ -884,10 +874,7 @@ class handler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        page_cache.send(self, 'optimized_interface', html_content)
     
     def send_health(self):
         """Send API health check"""
@@ -903,8 +890,16 @@ class handler(BaseHTTPRequestHandler):
                 'fast_ortex_discovery': 'active',
                 'performance_monitoring': 'active'
             },
-            'performance_stats': self.performance_stats,
-            'ticker_universe_size': len(self.master_ticker_list)
+            'performance_stats': self.performance_metrics(),
+            'scan_state': scan_state.stats(),
+            'page_cache': page_cache.stats(),
+            'json_responses': json_responses.stats(),
+            'ticker_universe_size': len(self.master_ticker_list),
+            'http_pool': http_client.stats(),
+            'ortex_client': ortex_client.stats(),
+            'batch_scoring': batch_scorer.stats(),
+            'scoring_profiles': profile_registry.stats(),
+            'yahoo_quotes': yahoo_quotes.stats()
         }
         
         self.send_response(200)
@@ -912,6 +907,27 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(health_data).encode())
     
+    def send_endpoint_memo(self, invalidate=False):
+        """Inspect (GET) or invalidate (DELETE) the Ortex endpoint memo, filtered by ?ticker=/&data_type="""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        ticker = query.get('ticker', [None])[0]
+        if invalidate:
+            response = {'success': True, 'invalidated': endpoint_memo.invalidate(ticker, query.get('data_type', [None])[0])}
+        else:
+            response = {'success': True, 'stats': endpoint_memo.stats(), 'endpoints': endpoint_memo.snapshot(ticker)}
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
+    
+    def send_scoring_profiles(self):
+        """List the scoring profiles a scan can select with filters.scoring_profile / filters.profiles"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps({'success': True, 'profiles': profile_registry.describe()}).encode())
+    
     def send_404(self):
         """Send 404 error"""
         self.send_response(404)
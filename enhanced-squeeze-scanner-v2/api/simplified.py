@@ -6,6 +6,9 @@ import os
 from datetime import datetime
 import time
 
+from scanner_core.http_client import http_client
+from scanner_core.static_assets import page_cache
+
 class handler(BaseHTTPRequestHandler):
     
     def validate_ortex_api_key(self, ortex_key):
@@ -24,7 +27,7 @@ class handler(BaseHTTPRequestHandler):
             req.add_header('Accept', 'application/json')
             req.add_header('Ortex-Api-Key', ortex_key)  # CORRECT method
             
-            with urllib.request.urlopen(req, timeout=10) as response:
+            with http_client.urlopen(req, timeout=10) as response:
                 status = response.getcode()
                 content_type = response.headers.get('Content-Type', 'unknown')
                 data = response.read()[:1000].decode('utf-8', errors='ignore')
@@ -72,7 +75,7 @@ class handler(BaseHTTPRequestHandler):
             req = urllib.request.Request(url)
             req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
             
-            with urllib.request.urlopen(req, timeout=10) as response:
+            with http_client.urlopen(req, timeout=10) as response:
                 data = json.loads(response.read())
                 
                 if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
@@ -300,10 +303,7 @@ class handler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        page_cache.send(self, 'ortex_status', html_content)
     
     def handle_ortex_validation(self):
         """Handle Ortex API key validation"""
@@ -729,10 +729,7 @@ class handler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        page_cache.send(self, 'simplified_interface', html_content)
     
     def send_health(self):
         """Send API health check"""
@@ -747,7 +744,8 @@ class handler(BaseHTTPRequestHandler):
                 'ortex_data': 'pending_support',
                 'squeeze_algorithm': 'active',
                 'enhanced_mock_data': 'active'
-            }
+            },
+            'http_pool': http_client.stats()
         }
         
         self.send_response(200)
@@ -4,7 +4,7 @@ Enhanced Ultimate Squeeze Scanner - Integrated with Original Styling
 Preserves all original interface styling and features while adding 5x enhanced squeeze data
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, abort
 from flask_cors import CORS
 import json
 import urllib.parse
@@ -12,21 +12,46 @@ import urllib.request
 import os
 from datetime import datetime, timedelta
 import time
-import concurrent.futures
-import threading
+
+from scanner_core.cache import TTLCache
+from scanner_core.credit_budget import BUDGET_EXHAUSTED, DEBUG, PREWARM, credit_budget
+from scanner_core.http_client import http_client
+from scanner_core.incremental import incremental_scorer, is_quote_refresh
+from scanner_core.ortex_client import endpoint_memo, ortex_client, ortex_headers
+from scanner_core.pagination import CursorExpired, result_pager
+from scanner_core.prewarm import prewarm_scheduler
+from scanner_core.scan_engine import scan_engine
+from scanner_core.scoring_profiles import profile_registry, score_profiles, summarize
+from scanner_core.single_flight import ortex_flight, price_flight
+from scanner_core.static_assets import StaticFiles, page_cache
+from scanner_core.streaming import CONTENT_TYPES, SSE, scan_streamer, stream_chunks, stream_format
+from scanner_core.universe import load_universe
+from scanner_core.watchlist import WatchlistFull, watchlist_monitor
+from scanner_core.yahoo_quotes import yahoo_quotes
 
 app = Flask(__name__, 
             template_folder='templates',
             static_folder='static')
 CORS(app)
+# static/ loaded and compressed once; url_for('static') URLs carry the content hash as ?v=
+static_files = StaticFiles(app.static_folder)
 
 # Enhanced squeeze scanner integration
 class OptimizedSqueezeAPI:
     def __init__(self):
-        self.cache = {}
-        self.cache_timestamps = {}
         self.cache_duration = 1800  # 30 minutes
-        self.lock = threading.Lock()
+        self.cache = TTLCache(default_ttl=self.cache_duration)
+        # Last good piece per pair, kept long past its TTL - served when the credit budget refuses a fetch
+        self.fallback_cache = TTLCache(default_ttl=int(os.environ.get('ORTEX_FALLBACK_TTL', 7 * 24 * 3600)))
+        
+        # Per-data-type freshness: SI/DTC update daily, borrow data moves intraday
+        self.cache_ttls = {
+            'short_interest': int(os.environ.get('ORTEX_TTL_SHORT_INTEREST', 6 * 3600)),
+            'days_to_cover': int(os.environ.get('ORTEX_TTL_DAYS_TO_COVER', 6 * 3600)),
+            'cost_to_borrow': int(os.environ.get('ORTEX_TTL_COST_TO_BORROW', 900)),
+            'availability': int(os.environ.get('ORTEX_TTL_AVAILABILITY', 900)),
+            'stock_scores': int(os.environ.get('ORTEX_TTL_STOCK_SCORES', 3600))
+        }
         
         # Working Ortex endpoints discovered from analysis
         self.ortex_endpoints = {
@@ -52,82 +77,104 @@ class OptimizedSqueezeAPI:
 
     def is_cache_valid(self, cache_key):
         """Check if cached data is still valid"""
-        if cache_key not in self.cache_timestamps:
-            return False
-        
-        cache_time = self.cache_timestamps[cache_key]
-        return (datetime.now() - cache_time).total_seconds() < self.cache_duration
+        return self.cache.contains(cache_key)
 
     def get_cached_data(self, cache_key):
         """Retrieve cached data if valid"""
-        with self.lock:
-            if self.is_cache_valid(cache_key):
-                return self.cache.get(cache_key)
-        return None
+        return self.cache.get(cache_key)
 
-    def set_cached_data(self, cache_key, data):
+    def set_cached_data(self, cache_key, data, ttl=None):
         """Store data in cache"""
-        with self.lock:
-            self.cache[cache_key] = data
-            self.cache_timestamps[cache_key] = datetime.now()
+        self.cache.set(cache_key, data, ttl)
+
+    def ortex_cache_key(self, ticker, data_type):
+        """Cache key for one (ticker, data_type) piece"""
+        return f"ortex_{ticker}_{data_type}"
 
     def fetch_ortex_data_optimized(self, ticker, ortex_key, data_types=None):
-        """Optimized Ortex data fetching with parallel requests and caching"""
+        """Optimized Ortex data fetching for a single ticker (delegates to the batch engine)"""
         if not ortex_key:
             return None
+        
+        return self.fetch_ortex_batch([ticker], ortex_key, data_types).get(ticker, {})
+
+    def fetch_ortex_batch(self, tickers, ortex_key, data_types=None):
+        """Fetch Ortex data for many tickers in one async engine pass with caching"""
+        if not ortex_key:
+            return {}
             
         if data_types is None:
             data_types = ['short_interest', 'cost_to_borrow', 'days_to_cover']
         
-        # Check cache first
-        cache_key = f"ortex_{ticker}_{'_'.join(data_types)}"
-        cached_result = self.get_cached_data(cache_key)
-        if cached_result:
-            return cached_result
-        
-        results = {}
-        
-        def fetch_data_type(data_type):
-            """Fetch specific data type with fallback"""
-            endpoints = self.ortex_endpoints.get(data_type, [])
-            
-            for endpoint_url in endpoints:
-                try:
-                    url = endpoint_url.format(ticker=ticker)
-                    req = urllib.request.Request(url)
-                    req.add_header('Ortex-Api-Key', ortex_key)
-                    req.add_header('User-Agent', 'Ultimate-Squeeze-Scanner/Enhanced')
-                    req.add_header('Accept', 'application/json')
-                    
-                    with urllib.request.urlopen(req, timeout=8) as response:
-                        if response.getcode() == 200:
-                            content_type = response.headers.get('Content-Type', '')
-                            if 'application/json' in content_type:
-                                data = json.loads(response.read().decode('utf-8'))
-                                return {
-                                    'success': True,
-                                    'data_type': data_type,
-                                    'data': data,
-                                    'credits_used': data.get('creditsUsed', 0)
-                                }
-                except Exception:
+        batch_results = {}
+        pending_pairs = {}
+        waiting = {}
+        
+        # Assemble from cached pieces - only missing (ticker, data_type) pairs hit the network
+        for ticker in tickers:
+            results = batch_results.setdefault(ticker, {})
+            for data_type in data_types:
+                cached_piece = self.get_cached_data(self.ortex_cache_key(ticker, data_type))
+                if cached_piece:
+                    results[data_type] = dict(cached_piece, credits_used=0, cached=True)
                     continue
-            
-            return {'success': False, 'data_type': data_type}
+                
+                # Another request already fetching this pair? Wait on it instead of paying twice
+                future, is_leader = ortex_flight.claim((ticker, data_type))
+                if not is_leader:
+                    waiting[(ticker, data_type)] = future
+                    continue
+                
+                pending_pairs[(ticker, data_type)] = (ticker, data_type, self.ortex_endpoints.get(data_type, []))
         
-        # Parallel processing for multiple data types
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_type = {executor.submit(fetch_data_type, dt): dt for dt in data_types}
-            
-            for future in concurrent.futures.as_completed(future_to_type):
-                result = future.result()
-                results[result['data_type']] = result
+        if pending_pairs:
+            self._fetch_ortex_pairs(pending_pairs, ortex_key, batch_results)
         
-        # Cache successful results
-        if any(r.get('success') for r in results.values()):
-            self.set_cached_data(cache_key, results)
+        for (ticker, data_type), future in waiting.items():
+            try:
+                piece = dict(future.result(timeout=30), credits_used=0, coalesced=True)
+            except Exception:
+                piece = {'success': False, 'data_type': data_type}
+            batch_results[ticker][data_type] = piece
         
-        return results
+        return batch_results
+
+    def _fetch_ortex_pairs(self, pending_pairs, ortex_key, batch_results):
+        """Fetch the (ticker, data_type) pairs this request leads and publish them to waiters"""
+        headers = ortex_headers(ortex_key, 'Ultimate-Squeeze-Scanner/Enhanced')
+        
+        # Every (ticker, data_type, endpoint) request shares one event loop; the endpoint
+        # memo tries the last working template first and skips ones known to 404
+        try:
+            fetched = ortex_client.fetch_batch(pending_pairs, headers, timeout=8)
+        except Exception as e:
+            for key in pending_pairs:
+                ortex_flight.fail(key, e)
+            raise
+        
+        for (ticker, data_type), (url, data) in fetched.items():
+            if data is not None:
+                piece = {
+                    'success': True,
+                    'data_type': data_type,
+                    'data': data,
+                    'credits_used': data.get('creditsUsed', 0) if isinstance(data, dict) else 0
+                }
+                # Cache successful pieces individually with their own TTL
+                self.set_cached_data(self.ortex_cache_key(ticker, data_type), piece,
+                                     self.cache_ttls.get(data_type, self.cache_duration))
+                self.fallback_cache.set(self.ortex_cache_key(ticker, data_type), piece)
+            elif url == BUDGET_EXHAUSTED:
+                # Out of Ortex credits: stale data if we have any, else the scorer models without it
+                stale_piece = self.fallback_cache.get(self.ortex_cache_key(ticker, data_type))
+                if stale_piece:
+                    piece = dict(stale_piece, credits_used=0, cached=True, stale=True)
+                else:
+                    piece = {'success': False, 'data_type': data_type, 'budget_exhausted': True}
+            else:
+                piece = {'success': False, 'data_type': data_type}
+            ortex_flight.resolve((ticker, data_type), piece)
+            batch_results[ticker][data_type] = piece
 
     def process_enhanced_squeeze_data(self, ortex_results, price_data=None):
         """Process multi-endpoint Ortex data into comprehensive squeeze metrics"""
@@ -204,71 +251,223 @@ class OptimizedSqueezeAPI:
 # Initialize optimized API
 squeeze_api = OptimizedSqueezeAPI()
 
+# Upper bound per scan - the async engine keeps 100+ tickers inside the old 20-ticker budget
+MAX_SCAN_TICKERS = 150
+
+# Scanner categories kept warm ahead of the open (the production scanner's universe; TICKER_UNIVERSE_PATH loads a file)
+TICKER_UNIVERSE = load_universe({
+    'top_meme_stocks': ['GME', 'AMC', 'BBBY', 'SAVA', 'VXRT', 'CLOV', 'SPRT', 'IRNT',
+                        'DWAC', 'PHUN', 'PROG', 'ATER', 'BBIG', 'MULN', 'EXPR', 'KOSS'],
+    'high_short_interest': ['BYND', 'PTON', 'ROKU', 'UPST', 'AFRM', 'HOOD', 'COIN', 'RIVN',
+                            'LCID', 'NKLA', 'PLUG', 'BLNK', 'QS', 'GOEV', 'RIDE', 'WKHS'],
+    'biotech_squeeze': ['BIIB', 'GILD', 'REGN', 'BMRN', 'ALNY', 'SRPT', 'IONS', 'ARWR',
+                        'EDIT', 'CRSP', 'NTLA', 'BEAM', 'BLUE', 'FOLD', 'RARE', 'KRYS'],
+    'small_cap_movers': ['SPCE', 'DKNG', 'PENN', 'FUBO', 'WISH', 'RBLX', 'PLTR', 'SNOW',
+                         'CRWD', 'OKTA', 'DDOG', 'NET', 'FSLY', 'ESTC', 'ZM', 'DOCN'],
+    'large_cap_samples': ['AAPL', 'TSLA', 'META', 'NFLX', 'NVDA', 'GOOGL', 'AMZN', 'MSFT']
+})
+# Comma-separated subset of TICKER_UNIVERSE to pre-warm; unset warms every category
+PREWARM_CATEGORIES = [c.strip() for c in os.environ.get('PREWARM_CATEGORIES', '').split(',') if c.strip()]
+
 def get_yahoo_price_data(tickers):
-    """Enhanced Yahoo Finance integration - matches original function signature"""
-    price_data = {}
+    """Enhanced Yahoo Finance integration (batched multi-symbol quotes with chart fallback)"""
+    return yahoo_quotes.get_prices(tickers, timeout=5)
+
+def run_squeeze_scan(tickers, ortex_key, quote_refresh, primary_profile, profiles, on_result=None):
+    """Fetch and score one scan: (results, summary); on_result streams each ticker as soon as it is scored"""
+    refresh_profile = primary_profile or profile_registry.get('enhanced')
+    needs_full_scan = []
+    
+    results = []
+    total_credits_used = 0
     
-    def get_single_price(ticker):
+    def process_ticker(ticker):
+        """Process individual ticker with enhanced data"""
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'Mozilla/5.0 (compatible; SqueezeScanner/Enhanced)')
-            
-            with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read())
+            if quote_refresh:
+                # Cached SI/CTB/DTC subtotals; only the momentum term sees the new quote
+                squeeze_data = incremental_scorer.snapshot(ticker)
+                refreshed = squeeze_data and incremental_scorer.rescore(
+                    ticker, [refresh_profile] + profiles, price_data.get(ticker)
+                )
+                if not refreshed:
+                    needs_full_scan.append(ticker)
+                    return None
+                scores = {profile.name: refreshed[profile.name] for profile in profiles}
+                base_score = refreshed[refresh_profile.name]['score']
+                budget_fallback = False
+            else:
+                ortex_results = ortex_batch.get(ticker)
+                # Stale or missing pieces because the credit budget refused the fetch
+                budget_fallback = any(piece.get('stale') or piece.get('budget_exhausted')
+                                      for piece in (ortex_results or {}).values())
                 
-                if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                    result = data['chart']['result'][0]
-                    meta = result.get('meta', {})
-                    
-                    current_price = meta.get('regularMarketPrice', 0)
-                    previous_close = meta.get('previousClose', 0)
-                    volume = meta.get('regularMarketVolume', 0)
-                    
-                    price_change = current_price - previous_close if previous_close else 0
-                    price_change_pct = (price_change / previous_close * 100) if previous_close else 0
-                    
-                    return {
-                        'ticker': ticker,
-                        'current_price': round(current_price, 2),
-                        'price_change': round(price_change, 2),
-                        'price_change_pct': round(price_change_pct, 2),
-                        'volume': volume,
-                        'success': True
-                    }
-        except Exception:
-            pass
-        
-        return {'ticker': ticker, 'success': False}
+                # Process into squeeze metrics
+                squeeze_data = squeeze_api.process_enhanced_squeeze_data(
+                    ortex_results or {},
+                    price_data.get(ticker)
+                )
+                incremental_scorer.remember(ticker, squeeze_data)
+                
+                # Every requested profile over the same inputs, in one pass
+                scores = score_profiles(profiles, squeeze_data, price_data.get(ticker)) if profiles else {}
+                base_score = squeeze_data['squeeze_score']
+            
+            # Determine risk level (matches original classifications)
+            score = scores[primary_profile.name]['score'] if primary_profile else base_score
+            if score >= 80:
+                squeeze_type = "EXTREME SQUEEZE RISK"
+                risk_class = "squeeze-extreme"
+            elif score >= 60:
+                squeeze_type = "HIGH SQUEEZE RISK"  
+                risk_class = "squeeze-high"
+            elif score >= 40:
+                squeeze_type = "MODERATE SQUEEZE RISK"
+                risk_class = "squeeze-moderate"
+            else:
+                squeeze_type = "Low Risk"
+                risk_class = ""
+            
+            ticker_price = price_data.get(ticker, {})
+            
+            return {
+                'ticker': ticker,
+                'squeeze_score': score,
+                'squeeze_type': squeeze_type,
+                'risk_class': risk_class,
+                'current_price': ticker_price.get('current_price', 0),
+                'price_change': ticker_price.get('price_change', 0),
+                'price_change_pct': ticker_price.get('price_change_pct', 0),
+                'volume': ticker_price.get('volume', 0),
+                'ortex_data': {
+                    'short_interest': round(squeeze_data['short_interest'], 2),
+                    'utilization': round(squeeze_data.get('utilization', 0), 2),
+                    'cost_to_borrow': round(squeeze_data['cost_to_borrow'], 2),
+                    'days_to_cover': round(squeeze_data['days_to_cover'], 2),
+                    'data_sources': squeeze_data['data_sources'],
+                    'confidence': squeeze_data['confidence']
+                },
+                'credits_used': 0 if quote_refresh else squeeze_data['total_credits_used'],
+                'data_source': ('ortex_snapshot_quote_refresh' if quote_refresh
+                                else 'ortex_budget_fallback' if budget_fallback else 'enhanced_ortex_live'),
+                'profile_scores': summarize(scores),
+                'success': True
+            }
+        except Exception as e:
+            return {
+                'ticker': ticker,
+                'error': str(e),
+                'success': False,
+                'squeeze_score': 0,
+                'squeeze_type': 'Error',
+                'current_price': 0
+            }
     
-    # Process multiple tickers
-    for ticker in tickers:
-        result = get_single_price(ticker)
-        if result.get('success'):
-            price_data[ticker] = result
+    # Streamed scans fetch and score chunk by chunk so the first results go out early
+    for chunk in (stream_chunks(tickers) if on_result else [tickers]):
+        # Get price data for the chunk (compatible with original)
+        price_data = get_yahoo_price_data(chunk)
+        
+        # Fan out every ticker/data type/endpoint request in one engine pass
+        ortex_batch = {} if quote_refresh else squeeze_api.fetch_ortex_batch(
+            chunk,
+            ortex_key,
+            ['short_interest', 'cost_to_borrow', 'days_to_cover', 'availability']
+        )
+        
+        # Network work is already done - scoring is pure CPU
+        ticker_results = [result for result in map(process_ticker, chunk) if result is not None]
+        if profiles:
+            profile_registry.record_pass(len(ticker_results), len(profiles))
+        
+        for result in ticker_results:
+            if result.get('success', True):
+                results.append(result)
+                total_credits_used += result.get('credits_used', 0)
+                if on_result:
+                    on_result(result)
     
-    return price_data
+    summary = {
+        'message': f'Enhanced squeeze scan complete - {len(results)} tickers analyzed',
+        'total_tickers': len(results),
+        'high_risk_count': len([r for r in results if r.get('squeeze_score', 0) >= 60]),
+        'total_credits_used': total_credits_used,
+        'scan_timestamp': datetime.now().isoformat(),
+        'scoring_profile': primary_profile.name if primary_profile else 'enhanced',
+        'mode': 'quote_refresh' if quote_refresh else 'full',
+        'needs_full_scan': needs_full_scan,
+        'credit_fallbacks': len([r for r in results if r.get('data_source') == 'ortex_budget_fallback']),
+        'enhancement_info': {
+            'cache_hit_rate': f"{len([r for r in results if r.get('credits_used', 1) == 0]) / len(results) * 100:.1f}%" if results else "0%",
+            'data_sources_per_ticker': len(squeeze_api.ortex_endpoints),
+            'parallel_processing': True,
+            'enhanced_scoring': True
+        }
+    }
+    return results, summary
+
+def asset_response(response):
+    """Flask response for a precompressed (status, headers, body)"""
+    status, headers, body = response
+    return Response(body, status=status, headers=headers)
+
+@app.url_defaults
+def version_static_urls(endpoint, values):
+    if endpoint == 'static' and 'v' not in values:
+        version = static_files.version(values.get('filename', ''))
+        if version:
+            values['v'] = version
 
 # Route handlers
 @app.route('/')
 def index():
-    """Serve the original beautiful interface"""
-    return render_template('index.html')
+    """Serve the original beautiful interface (rendered once, precompressed)"""
+    page = page_cache.render('index', lambda: render_template('index.html'))
+    return asset_response(page_cache.respond(page, request.headers.get('Accept-Encoding'),
+                                             request.headers.get('If-None-Match')))
+
+def send_static(filename):
+    """Serve static files (CSS, JS, etc.) from memory; versioned URLs are cached for a year"""
+    response = static_files.respond(filename, request.args.get('v'), request.headers.get('Accept-Encoding'),
+                                    request.headers.get('If-None-Match'))
+    if response is None:
+        abort(404)
+    return asset_response(response)
 
-@app.route('/static/<path:path>')
-def send_static(path):
-    """Serve static files (CSS, JS, etc.)"""
-    return send_from_directory('static', path)
+# Replaces Flask's built-in /static/<filename> view
+app.view_functions['static'] = send_static
 
 @app.route('/api/squeeze/scan', methods=['POST'])
 def enhanced_squeeze_scan():
     """Enhanced squeeze scanning - compatible with original interface"""
     try:
         data = request.get_json() or {}
+        
+        # limit / cursor / min_score / risk_factors / category / data_quality
+        try:
+            query = result_pager.query(data)
+            unknown = [name for name in query.category or () if name not in TICKER_UNIVERSE]
+            if unknown:
+                raise ValueError(f"Unknown category: {', '.join(unknown)} (known: {', '.join(TICKER_UNIVERSE)})")
+            # "stream": "ndjson" / "sse" (or the Accept header) emits each ticker as soon as it is scored
+            stream_fmt = stream_format(request.headers.get('Accept'), data.get('stream'))
+            if stream_fmt and query.cursor:
+                raise ValueError('Cursor pages are not streamed - drop "stream" to resume a scan')
+            if query.cursor:
+                # Later pages come from the stored scan - no refetch, no rescoring
+                page, page_info, summary = result_pager.resume(query)
+                return jsonify(dict(summary, success=True, results=page, page=page_info))
+        except CursorExpired as e:
+            return jsonify({'success': False, 'error': str(e)}), 410
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         tickers_input = data.get('tickers', data.get('tickerList', 'GME,AMC,TSLA'))
         ortex_key = data.get('ortex_key', data.get('ortexKey', os.environ.get('ORTEX_API_KEY')))
+        # 'quote_refresh' rescores from the last full scan's Ortex snapshots - no Ortex calls
+        quote_refresh = is_quote_refresh(data.get('mode'))
         
-        if not ortex_key:
+        if not ortex_key and not quote_refresh:
             return jsonify({
                 'success': False,
                 'error': 'Ortex API key required',
@@ -284,112 +483,33 @@ def enhanced_squeeze_scan():
             tickers = ['GME', 'AMC', 'TSLA']
         
         # Limit to reasonable number for performance
-        tickers = tickers[:20]
-        
-        # Get price data for all tickers (compatible with original)
-        price_data = get_yahoo_price_data(tickers)
-        
-        results = []
-        total_credits_used = 0
-        
-        def process_ticker(ticker):
-            """Process individual ticker with enhanced data"""
-            try:
-                # Get optimized Ortex data (parallel endpoints)
-                ortex_results = squeeze_api.fetch_ortex_data_optimized(
-                    ticker, 
-                    ortex_key,
-                    ['short_interest', 'cost_to_borrow', 'days_to_cover', 'availability']
-                )
-                
-                # Process into squeeze metrics
-                squeeze_data = squeeze_api.process_enhanced_squeeze_data(
-                    ortex_results or {}, 
-                    price_data.get(ticker)
-                )
-                
-                # Determine risk level (matches original classifications)
-                score = squeeze_data['squeeze_score']
-                if score >= 80:
-                    squeeze_type = "EXTREME SQUEEZE RISK"
-                    risk_class = "squeeze-extreme"
-                elif score >= 60:
-                    squeeze_type = "HIGH SQUEEZE RISK"  
-                    risk_class = "squeeze-high"
-                elif score >= 40:
-                    squeeze_type = "MODERATE SQUEEZE RISK"
-                    risk_class = "squeeze-moderate"
-                else:
-                    squeeze_type = "Low Risk"
-                    risk_class = ""
-                
-                ticker_price = price_data.get(ticker, {})
-                
-                return {
-                    'ticker': ticker,
-                    'squeeze_score': score,
-                    'squeeze_type': squeeze_type,
-                    'risk_class': risk_class,
-                    'current_price': ticker_price.get('current_price', 0),
-                    'price_change': ticker_price.get('price_change', 0),
-                    'price_change_pct': ticker_price.get('price_change_pct', 0),
-                    'volume': ticker_price.get('volume', 0),
-                    'ortex_data': {
-                        'short_interest': round(squeeze_data['short_interest'], 2),
-                        'utilization': round(squeeze_data.get('utilization', 0), 2),
-                        'cost_to_borrow': round(squeeze_data['cost_to_borrow'], 2),
-                        'days_to_cover': round(squeeze_data['days_to_cover'], 2),
-                        'data_sources': squeeze_data['data_sources'],
-                        'confidence': squeeze_data['confidence']
-                    },
-                    'credits_used': squeeze_data['total_credits_used'],
-                    'data_source': 'enhanced_ortex_live',
-                    'success': True
-                }
-            except Exception as e:
-                return {
-                    'ticker': ticker,
-                    'error': str(e),
-                    'success': False,
-                    'squeeze_score': 0,
-                    'squeeze_type': 'Error',
-                    'current_price': 0
-                }
-        
-        # Process up to 5 tickers in parallel for speed
-        max_workers = min(3, len(tickers))
-        
-        if len(tickers) <= 3:
-            # Sequential for small batches
-            ticker_results = [process_ticker(ticker) for ticker in tickers]
-        else:
-            # Parallel for larger batches
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                ticker_results = list(executor.map(process_ticker, tickers))
-        
-        for result in ticker_results:
-            if result.get('success', True):
-                results.append(result)
-                total_credits_used += result.get('credits_used', 0)
+        tickers = tickers[:MAX_SCAN_TICKERS]
         
-        # Sort by squeeze score (matches original behavior)
-        results.sort(key=lambda x: x.get('squeeze_score', 0), reverse=True)
-        
-        return jsonify({
-            'success': True,
-            'message': f'Enhanced squeeze scan complete - {len(results)} tickers analyzed',
-            'results': results,
-            'total_tickers': len(results),
-            'high_risk_count': len([r for r in results if r.get('squeeze_score', 0) >= 60]),
-            'total_credits_used': total_credits_used,
-            'scan_timestamp': datetime.now().isoformat(),
-            'enhancement_info': {
-                'cache_hit_rate': f"{len([r for r in results if r.get('credits_used', 1) == 0]) / len(results) * 100:.1f}%" if results else "0%",
-                'data_sources_per_ticker': len(squeeze_api.ortex_endpoints),
-                'parallel_processing': True,
-                'enhanced_scoring': True
-            }
-        })
+        # Optional scoring profiles (scoring_profile / profiles), resolved before any fetch
+        try:
+            primary_profile, profiles = profile_registry.selection(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        if stream_fmt:
+            # Scan runs on a worker thread; the response body is the event generator
+            stream = scan_streamer.open(stream_fmt, query.matcher(TICKER_UNIVERSE))
+            # The scan thread starts without this request's credit caller - bind it
+            scan = credit_budget.bind(run_squeeze_scan, 'squeeze_scan')
+            events = stream.events(lambda emit: scan(
+                tickers, ortex_key, quote_refresh, primary_profile, profiles, on_result=emit
+            )[1])
+            return Response(events, mimetype=stream.content_type,
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+        with credit_budget.caller('squeeze_scan'):
+            results, summary = run_squeeze_scan(tickers, ortex_key, quote_refresh, primary_profile, profiles)
+        # Tickers users actually scan and score highly are warmed first next time
+        prewarm_scheduler.record_scores(results)
+        
+        # Best-first page via a bounded heap (same order as the original full sort)
+        page, page_info = result_pager.paginate(query, results, summary, TICKER_UNIVERSE)
+        return jsonify(dict(summary, success=True, results=page, page=page_info))
         
     except Exception as e:
         return jsonify({
@@ -417,10 +537,9 @@ def options_scan():
 @app.route('/api/health')
 def health_check():
     """Enhanced health check with system status"""
-    cache_stats = {
-        'total_cached_items': len(squeeze_api.cache),
-        'cache_hit_rate': len([k for k in squeeze_api.cache_timestamps if squeeze_api.is_cache_valid(k)]) / max(len(squeeze_api.cache_timestamps), 1) * 100
-    }
+    cache_stats = squeeze_api.cache.stats()
+    cache_stats['total_cached_items'] = cache_stats['entries']
+    cache_stats['cache_hit_rate'] = cache_stats['hit_rate']
     
     return jsonify({
         'status': 'healthy',
@@ -440,6 +559,19 @@ def health_check():
             'total_available': len(squeeze_api.ortex_endpoints)
         },
         'cache_stats': cache_stats,
+        'http_pool': http_client.stats(),
+        'yahoo_quotes': yahoo_quotes.stats(),
+        'scan_engine': scan_engine.stats(),
+        'ortex_client': ortex_client.stats(),
+        'single_flight': {'ortex': ortex_flight.stats(), 'yahoo': price_flight.stats()},
+        'scoring_profiles': profile_registry.stats(),
+        'incremental_scoring': incremental_scorer.stats(),
+        'result_pager': result_pager.stats(),
+        'scan_streams': scan_streamer.stats(),
+        'watchlist_monitor': watchlist_monitor.stats(),
+        'prewarm': prewarm_scheduler.stats(),
+        'credit_budget': credit_budget.stats(),
+        'page_cache': page_cache.stats(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -454,8 +586,9 @@ def debug_ortex():
         if not ortex_key:
             return jsonify({'error': 'Ortex API key required'}), 400
         
-        # Test all endpoints for the ticker
-        results = squeeze_api.fetch_ortex_data_optimized(ticker, ortex_key, list(squeeze_api.ortex_endpoints.keys()))
+        # Test all endpoints for the ticker (debug calls get the smallest share of the credit budget)
+        with credit_budget.caller('debug_ortex', DEBUG):
+            results = squeeze_api.fetch_ortex_data_optimized(ticker, ortex_key, list(squeeze_api.ortex_endpoints.keys()))
         
         summary = {
             'ticker': ticker,
@@ -479,6 +612,99 @@ def debug_ortex():
             'error': f'Debug error: {str(e)}'
         }), 500
 
+@app.route('/api/credits')
+def credits():
+    """Ortex credit budgets, what is left, and spend per data type and per caller"""
+    return jsonify({'success': True, 'credits': credit_budget.stats()})
+
+@app.route('/api/scoring-profiles')
+def scoring_profiles():
+    """List the scoring profiles a scan can select with scoring_profile / profiles"""
+    return jsonify({'success': True, 'profiles': profile_registry.describe()})
+
+@app.route('/api/debug/endpoints', methods=['GET', 'DELETE'])
+def debug_endpoints():
+    """Inspect or invalidate the Ortex endpoint-discovery memo"""
+    ticker = request.args.get('ticker')
+    if request.method == 'DELETE':
+        removed = endpoint_memo.invalidate(ticker, request.args.get('data_type'))
+        return jsonify({'success': True, 'invalidated': removed})
+    
+    return jsonify({
+        'success': True,
+        'stats': endpoint_memo.stats(),
+        'endpoints': endpoint_memo.snapshot(ticker)
+    })
+
+@app.route('/api/watchlist', methods=['GET', 'POST'])
+def watchlist():
+    """List (GET ?client_id=) or add to (POST {client_id, ticker, target_score, price_target}) a server-side watchlist"""
+    try:
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            item = watchlist_monitor.add(data.get('client_id'), data.get('ticker'),
+                                         data.get('target_score'), data.get('price_target'))
+            return jsonify({'success': True, 'item': item})
+        return jsonify({'success': True, 'items': watchlist_monitor.items(request.args.get('client_id'))})
+    except WatchlistFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/watchlist/<ticker>', methods=['DELETE'])
+def watchlist_remove(ticker):
+    """Stop watching one ticker for ?client_id="""
+    try:
+        return jsonify({'success': True, 'removed': watchlist_monitor.remove(request.args.get('client_id'), ticker)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/watchlist/stream')
+def watchlist_stream():
+    """SSE feed for ?client_id=: the watchlist, then 'scores' after every poll and 'alert' on threshold crossings"""
+    try:
+        events = watchlist_monitor.events(request.args.get('client_id'))
+        # Validate the client ID now rather than after the headers are sent
+        first = next(events)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def stream():
+        yield first
+        yield from events
+    return Response(stream(), mimetype=CONTENT_TYPES[SSE],
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/prewarm', methods=['GET', 'POST'])
+def prewarm():
+    """Pre-warm scheduler status and recent runs (GET) or start a pass now (POST)"""
+    if request.method == 'POST':
+        prewarm_scheduler.trigger()
+        return jsonify({'success': True, 'triggered': True}), 202
+    return jsonify({'success': True, 'prewarm': prewarm_scheduler.stats()})
+
+def score_watchlist(tickers, ortex_key):
+    """Watchlist scorer: shared scans over every watched ticker, MAX_SCAN_TICKERS at a time (Ortex pieces come from the cache)"""
+    scores = {}
+    for index in range(0, len(tickers), MAX_SCAN_TICKERS):
+        results, _ = run_squeeze_scan(tickers[index:index + MAX_SCAN_TICKERS], ortex_key, False, None, [])
+        scores.update((result['ticker'], result['squeeze_score']) for result in results)
+    return scores
+
+def universe_tickers():
+    """Pre-warm source: the configured TICKER_UNIVERSE categories"""
+    return TICKER_UNIVERSE.select(PREWARM_CATEGORIES) if PREWARM_CATEGORIES else TICKER_UNIVERSE.tickers
+
+# Background scoring spends from the prewarm share of the credit budget, never the interactive reserve,
+# and only ever the server's key: polls serve every client, so none of them may be billed for it
+watchlist_monitor.set_scorer(credit_budget.bind(score_watchlist, 'watchlist', PREWARM), os.environ.get('ORTEX_API_KEY'))
+
+# Warm passes run the normal scan, filling the Ortex cache and quote-refresh snapshots
+prewarm_scheduler.add_source('watchlists', watchlist_monitor.tickers)
+prewarm_scheduler.add_source('ticker_universe', universe_tickers)
+# Same key as the watchlist poller: the server's own, so no client is billed for shared passes
+prewarm_scheduler.set_warmer(credit_budget.bind(score_watchlist, 'prewarm', PREWARM), watchlist_monitor.ortex_key)
+
 if __name__ == '__main__':
     print("🚀 Starting Enhanced Ultimate Squeeze Scanner (Integrated Version)")
     print("=" * 65)
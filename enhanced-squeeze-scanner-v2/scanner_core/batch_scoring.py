@@ -0,0 +1,352 @@
+"""
+Vectorized batch squeeze scoring
+Scores whole-universe batches from columnar SI/utilization/CTB/DTC/price-change/volume
+arrays in one NumPy pass, reproducing each per-ticker scorer exactly. NumPy is optional:
+without it (or for small batches) score_rows falls back to the per-ticker scorer
+"""
+
+import os
+import threading
+
+from scanner_core.step_tables import professional_scorer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COLUMNS = ('short_interest', 'utilization', 'cost_to_borrow', 'days_to_cover', 'price_change_pct', 'volume',
+           'price_change')
+
+# Risk-factor bit flags, in the order the per-ticker scorers append them
+RISK_FLAGS = {
+    'EXTREME_SHORT_INTEREST': 1,
+    'HIGH_SHORT_INTEREST': 2,
+    'HIGH_UTILIZATION': 4,
+    'HIGH_BORROWING_COSTS': 8,
+    'LONG_COVER_TIME': 16,
+    'STRONG_MOMENTUM': 32,
+    'STRONG_UPWARD_MOMENTUM': 64
+}
+
+# Level labels indexed by the level codes score_batch returns (last entry = below every threshold)
+LINEAR_LEVELS = ('Extreme Squeeze Risk', 'High Squeeze Risk', 'Moderate Squeeze Risk', 'Low Risk')
+ADVANCED_LEVELS = ('Extreme Squeeze Risk', 'High Squeeze Risk', 'Moderate Squeeze Risk', 'Low Squeeze Risk', 'Minimal Risk')
+
+# Below this many rows the per-ticker scorer is faster than building arrays
+MIN_BATCH_ROWS = int(os.environ.get('BATCH_SCORING_MIN_ROWS', 64))
+
+
+def available():
+    return np is not None
+
+
+def decode_risk_mask(mask):
+    """Risk-factor names for one bitmask, in scorer order"""
+    return [name for name, bit in RISK_FLAGS.items() if mask & bit]
+
+
+# Every possible mask decoded once, so building results is a table lookup per row
+RISK_NAMES = tuple(tuple(decode_risk_mask(mask)) for mask in range(2 ** len(RISK_FLAGS)))
+
+
+def _number(value):
+    """Float for plain numbers, NaN for anything the scalar scorers would choke on"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float('nan')
+
+
+def _column(values):
+    """float64 array for one field; mixed or non-numeric input is converted value by value"""
+    array = np.array(values)
+    if array.dtype.kind in 'biuf':
+        return array.astype(np.float64)
+    return np.array([_number(value) for value in values], dtype=np.float64)
+
+
+def build_columns(ortex_rows, price_rows):
+    """Columnar float64 arrays from per-ticker ortex/price dicts (missing keys -> 0, bad values -> NaN)"""
+    ortex_rows = list(ortex_rows)
+    price_rows = list(price_rows)
+    ortex_present = [isinstance(row, dict) for row in ortex_rows]
+    price_present = [isinstance(row, dict) for row in price_rows]
+    ortex_dicts = ortex_rows if all(ortex_present) else [row if isinstance(row, dict) else {} for row in ortex_rows]
+    price_dicts = price_rows if all(price_present) else [row if isinstance(row, dict) else {} for row in price_rows]
+
+    columns = {name: _column([row.get(name, 0) for row in ortex_dicts]) for name in COLUMNS[:4]}
+    columns.update({name: _column([row.get(name, 0) for row in price_dicts]) for name in COLUMNS[4:]})
+    columns['ortex_present'] = np.array(ortex_present, dtype=bool)
+    columns['price_present'] = np.array(price_present, dtype=bool)
+    columns['ortex_nonempty'] = np.array([bool(row) for row in ortex_rows], dtype=bool)
+    columns['price_nonempty'] = np.array([bool(row) for row in price_rows], dtype=bool)
+    return columns
+
+
+def _levels(total, thresholds):
+    """Index into the model's level labels; len(thresholds) means the lowest level"""
+    return np.select([total >= threshold for threshold in thresholds],
+                     list(range(len(thresholds))), default=len(thresholds))
+
+
+def _truncate(values):
+    """int() semantics (toward zero) for float arrays"""
+    return np.trunc(values).astype(np.int64)
+
+
+def _valid(columns, fields, needs_price=True):
+    valid = columns['ortex_present'].copy()
+    if needs_price:
+        valid &= columns['price_present']
+    for name in fields:
+        valid &= np.isfinite(columns[name])
+    return valid
+
+
+def score_linear(columns, extended_risks=True):
+    """calculate_squeeze_score (production) / calculate_squeeze_score_optimized"""
+    si = columns['short_interest']
+    util = columns['utilization']
+    ctb = columns['cost_to_borrow']
+    dtc = columns['days_to_cover']
+    change = columns['price_change_pct']
+
+    si_score = np.minimum(si * 1.2, 35)
+    util_score = np.minimum(util * 0.25, 25)
+    ctb_score = np.minimum(ctb * 0.8, 20)
+    dtc_score = np.minimum(dtc * 1.5, 15)
+    momentum_score = np.where(change > 0, change * 0.3, 0.0)
+    total = _truncate(si_score + util_score + ctb_score + dtc_score + momentum_score)
+
+    risk_mask = (
+        np.where(si > 25, RISK_FLAGS['EXTREME_SHORT_INTEREST'], 0)
+        | np.where(util > 90, RISK_FLAGS['HIGH_UTILIZATION'], 0)
+        | np.where(ctb > 20, RISK_FLAGS['HIGH_BORROWING_COSTS'], 0)
+    )
+    if extended_risks:
+        risk_mask |= np.where(dtc > 7, RISK_FLAGS['LONG_COVER_TIME'], 0)
+        risk_mask |= np.where(change > 15, RISK_FLAGS['STRONG_MOMENTUM'], 0)
+
+    valid = _valid(columns, COLUMNS[:5])
+    return {
+        'scores': np.where(valid, total, 0),
+        'levels': _levels(total, (80, 65, 45)),
+        'breakdown': {
+            'short_interest': _truncate(si_score),
+            'utilization': _truncate(util_score),
+            'cost_to_borrow': _truncate(ctb_score),
+            'days_to_cover': _truncate(dtc_score),
+            'momentum': _truncate(momentum_score)
+        },
+        'risk_mask': np.where(valid, risk_mask, 0),
+        'valid': valid
+    }
+
+
+def score_advanced(columns):
+    """calculate_squeeze_score_advanced (scanner_enhanced)"""
+    si = columns['short_interest']
+    util = columns['utilization']
+    ctb = columns['cost_to_borrow']
+    dtc = columns['days_to_cover']
+    change = columns['price_change_pct']
+
+    si_score = np.select([si >= 30, si >= 20, si >= 10],
+                         [35.0, 25 + (si - 20) * 1.0, 15 + (si - 10) * 1.0], si * 1.5)
+    util_score = np.select([util >= 95, util >= 80, util >= 60],
+                           [25.0, 18 + (util - 80) * 0.47, 10 + (util - 60) * 0.4], util * 0.17)
+    ctb_score = np.select([ctb >= 50, ctb >= 20, ctb >= 5],
+                          [20.0, 15 + (ctb - 20) * 0.17, 8 + (ctb - 5) * 0.47], ctb * 1.6)
+    dtc_score = np.select([dtc >= 10, dtc >= 5, dtc >= 2],
+                          [15.0, 10 + (dtc - 5) * 1.0, 5 + (dtc - 2) * 1.67], dtc * 2.5)
+    momentum_score = np.select([change > 10, change > 5, change > 0],
+                               [5.0, 3 + (change - 5) * 0.4, change * 0.6], 0.0)
+    total = np.minimum(_truncate(si_score + util_score + ctb_score + dtc_score + momentum_score), 100)
+
+    risk_mask = (
+        np.where(si > 30, RISK_FLAGS['EXTREME_SHORT_INTEREST'],
+                 np.where(si > 20, RISK_FLAGS['HIGH_SHORT_INTEREST'], 0))
+        | np.where(util > 90, RISK_FLAGS['HIGH_UTILIZATION'], 0)
+        | np.where(ctb > 20, RISK_FLAGS['HIGH_BORROWING_COSTS'], 0)
+        | np.where(dtc > 7, RISK_FLAGS['LONG_COVER_TIME'], 0)
+        | np.where(change > 15, RISK_FLAGS['STRONG_UPWARD_MOMENTUM'], 0)
+    )
+
+    valid = _valid(columns, COLUMNS[:5])
+    return {
+        'scores': np.where(valid, total, 0),
+        'levels': _levels(total, (80, 65, 45, 25)),
+        'breakdown': {
+            'short_interest': _truncate(si_score),
+            'utilization': _truncate(util_score),
+            'cost_to_borrow': _truncate(ctb_score),
+            'days_to_cover': _truncate(dtc_score),
+            'momentum': _truncate(momentum_score)
+        },
+        'risk_mask': np.where(valid, risk_mask, 0),
+        'valid': valid
+    }
+
+
+def score_enhanced(columns):
+    """OptimizedSqueezeAPI.calculate_enhanced_score (integrated server / index_enhanced)"""
+    si = columns['short_interest']
+    ctb = columns['cost_to_borrow']
+    dtc = columns['days_to_cover']
+    change = columns['price_change_pct']
+
+    si_score = np.minimum(si * 1.3, 40)
+    ctb_score = np.minimum(ctb * 1.2, 25)
+    dtc_score = np.minimum(dtc * 2.5, 20)
+    momentum_score = np.minimum(np.maximum(change, 0) * 0.8, 15)
+    total = np.minimum(_truncate(si_score + ctb_score + dtc_score + momentum_score), 100)
+
+    # The enhanced scorer accepts a missing price dict and does not read utilization
+    valid = _valid(columns, ('short_interest', 'cost_to_borrow', 'days_to_cover', 'price_change_pct'),
+                   needs_price=False)
+    return {
+        'scores': np.where(valid, total, 0),
+        'levels': None,
+        'breakdown': {
+            'short_interest': _truncate(si_score),
+            'cost_to_borrow': _truncate(ctb_score),
+            'days_to_cover': _truncate(dtc_score),
+            'momentum': _truncate(momentum_score)
+        },
+        'risk_mask': np.zeros(len(si), dtype=np.int64),
+        'valid': valid
+    }
+
+
+def score_professional(columns):
+    """calculate_squeeze_score (index_backup) via searchsorted over the precompiled step tables"""
+    batch = professional_scorer.score_columns(columns)
+    batch['levels'] = None
+    batch['price_nonempty'] = columns['price_nonempty']
+    # Empty ortex dicts get the scalar scorer's bare default score
+    batch['valid'] = columns['ortex_nonempty'] & _valid(columns, COLUMNS[:4] + COLUMNS[5:], needs_price=False)
+    return batch
+
+
+def _breakdowns(batch):
+    breakdown = batch['breakdown']
+    names = list(breakdown)
+    return [dict(zip(names, values)) for values in zip(*(breakdown[name].tolist() for name in names))]
+
+
+def _linear_results(batch):
+    return [
+        {
+            'squeeze_score': score,
+            'squeeze_type': LINEAR_LEVELS[level],
+            'risk_factors': list(RISK_NAMES[mask]),
+            'score_breakdown': parts
+        }
+        for score, level, mask, parts in zip(
+            batch['scores'].tolist(), batch['levels'].tolist(), batch['risk_mask'].tolist(), _breakdowns(batch)
+        )
+    ]
+
+
+def _advanced_results(batch):
+    return [
+        {
+            'squeeze_score': score,
+            'squeeze_type': ADVANCED_LEVELS[level],
+            'score_breakdown': parts,
+            'risk_factors': list(RISK_NAMES[mask])
+        }
+        for score, level, mask, parts in zip(
+            batch['scores'].tolist(), batch['levels'].tolist(), batch['risk_mask'].tolist(), _breakdowns(batch)
+        )
+    ]
+
+
+def _professional_results(batch):
+    """(final_score, details) tuples; risk masks become names only here"""
+    names = professional_scorer.flags.names
+    results = []
+    for score, multiplied, mask, has_price, parts in zip(
+            batch['scores'].tolist(), batch['multiplied'].tolist(), batch['risk_mask'].tolist(),
+            batch['price_nonempty'].tolist(), _breakdowns(batch)):
+        # Unmultiplied and capped scores are ints in the per-ticker scorer (min(100, x) keeps the int 100)
+        score = score if multiplied and score < 100 else int(score)
+        if not has_price:
+            del parts['momentum']
+        results.append((score, {'breakdown': parts, 'risk_factors': names(mask), 'final_score': score}))
+    return results
+
+
+def _enhanced_results(batch):
+    return batch['scores'].tolist()
+
+
+# name -> (vectorized scorer, builder for the scalar scorer's return shape)
+MODELS = {
+    'production': (score_linear, _linear_results),
+    'optimized': (lambda columns: score_linear(columns, extended_risks=False), _linear_results),
+    'advanced': (score_advanced, _advanced_results),
+    'enhanced': (score_enhanced, _enhanced_results),
+    'professional': (score_professional, _professional_results)
+}
+
+
+def score_batch(model, columns):
+    """Scores, level codes, integer breakdowns, risk bitmasks and a validity mask as arrays"""
+    if np is None:
+        raise RuntimeError('NumPy is required for batch scoring')
+    # Invalid rows (NaN/inf) are masked out afterwards; silence their cast warnings
+    with np.errstate(invalid='ignore', over='ignore'):
+        return MODELS[model][0](columns)
+
+
+def to_results(model, batch):
+    """Per-ticker result objects shaped exactly like the scalar scorer's return value"""
+    return MODELS[model][1](batch)
+
+
+class BatchScorer:
+    """Chooses vectorized or per-ticker scoring and keeps counters for health checks"""
+
+    def __init__(self, min_rows=None):
+        self.min_rows = MIN_BATCH_ROWS if min_rows is None else min_rows
+        self.lock = threading.Lock()
+        self.counters = {
+            'batches': 0,
+            'vectorized_rows': 0,
+            'scalar_rows': 0,
+            'fallback_rows': 0
+        }
+
+    def score_rows(self, model, ortex_rows, price_rows, scalar_scorer):
+        """Score paired ortex/price rows; rows the vectorized path cannot represent use scalar_scorer"""
+        ortex_rows = list(ortex_rows)
+        price_rows = list(price_rows)
+        if np is None or len(ortex_rows) < self.min_rows:
+            with self.lock:
+                self.counters['scalar_rows'] += len(ortex_rows)
+            return [scalar_scorer(ortex_row, price_row) for ortex_row, price_row in zip(ortex_rows, price_rows)]
+
+        batch = score_batch(model, build_columns(ortex_rows, price_rows))
+        results = to_results(model, batch)
+        # None/NaN/strings make the scalar scorers raise or return their error shape - defer to them
+        invalid = np.flatnonzero(~batch['valid']).tolist()
+        for index in invalid:
+            results[index] = scalar_scorer(ortex_rows[index], price_rows[index])
+
+        with self.lock:
+            self.counters['batches'] += 1
+            self.counters['vectorized_rows'] += len(results) - len(invalid)
+            self.counters['fallback_rows'] += len(invalid)
+        return results
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+        snapshot['numpy_available'] = available()
+        snapshot['min_rows'] = self.min_rows
+        return snapshot
+
+
+# Process-wide scorer shared by the scan paths
+batch_scorer = BatchScorer()
@@ -0,0 +1,133 @@
+"""
+Bounded LRU + TTL cache for Ortex and price data
+Evicts by entry count and approximate bytes, with monotonic-clock expiry
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """Approximate in-memory size of JSON-like data in bytes"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTLs and lazy expiry sweeps"""
+
+    def __init__(self, max_entries=None, max_bytes=None, default_ttl=1800, sweep_interval=256):
+        self.max_entries = max_entries or int(os.environ.get('CACHE_MAX_ENTRIES', 5000))
+        self.max_bytes = max_bytes or int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        # key -> (value, expires_at, size); order is least -> most recently used
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.operations = 0
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def _remove(self, key):
+        _, _, size = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def _sweep_expired(self, now):
+        expired = [key for key, (_, expires_at, _) in self.entries.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.counters['expirations'] += len(expired)
+
+    def _maybe_sweep(self, now):
+        self.operations += 1
+        if self.operations % self.sweep_interval == 0:
+            self._sweep_expired(now)
+
+    def get(self, key, default=None):
+        """Return a live entry and mark it most recently used"""
+        now = time.monotonic()
+        with self.lock:
+            self._maybe_sweep(now)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return default
+            if entry[1] <= now:
+                self._remove(key)
+                self.counters['expirations'] += 1
+                self.counters['misses'] += 1
+                return default
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None, size=None):
+        """Store a value, evicting least recently used entries past the bounds (size: skip estimate_size)"""
+        size = estimate_size(value) if size is None else size
+        now = time.monotonic()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self.lock:
+            self._maybe_sweep(now)
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, expires_at, size)
+            self.total_bytes += size
+            self.counters['sets'] += 1
+
+            while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key)
+                self.counters['evictions'] += 1
+
+    def delete(self, key):
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+                return True
+        return False
+
+    def contains(self, key):
+        """Check for a live entry without touching LRU order or hit counters"""
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def items(self):
+        """Live (key, value) pairs, least recently used first, without touching LRU order or counters"""
+        now = time.monotonic()
+        with self.lock:
+            return [(key, value) for key, (value, expires_at, _) in self.entries.items() if expires_at > now]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def stats(self):
+        """Hit/miss/eviction counters plus current occupancy"""
+        with self.lock:
+            self._sweep_expired(time.monotonic())
+            counters = dict(self.counters)
+            counters['entries'] = len(self.entries)
+            counters['approx_bytes'] = self.total_bytes
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups * 100, 1) if lookups else 0.0
+        counters['max_entries'] = self.max_entries
+        counters['max_bytes'] = self.max_bytes
+        return counters
@@ -0,0 +1,174 @@
+"""
+Per-endpoint circuit breakers with adaptive timeouts
+Each Ortex URL template gets a closed/open/half-open breaker, and its timeout is
+derived from observed p95 latency instead of a fixed 3-20 second wait
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one endpoint template"""
+
+    def __init__(self, failure_threshold=5, open_seconds=30, max_open_seconds=300,
+                 min_timeout=1.0, timeout_multiplier=2.0, min_samples=10, probe_lease_seconds=60):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.min_timeout = min_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.probe_lease_seconds = probe_lease_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.current_open_seconds = open_seconds
+        self.open_until = 0
+        self.probe_in_flight = False
+        self.probe_expires = 0
+        self.latencies = deque(maxlen=100)
+        self.lock = threading.Lock()
+        self.counters = {
+            'successes': 0,
+            'failures': 0,
+            'trips': 0,
+            'rejected': 0,
+            'probes_expired': 0
+        }
+
+    def allow(self):
+        """Return True if a request may go out now (half-open lets a single probe through)"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now >= self.open_until:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and self.probe_in_flight and now >= self.probe_expires:
+                # The probe never reported back - don't let a lost one keep the breaker half-open forever
+                self.probe_in_flight = False
+                self.counters['probes_expired'] += 1
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                self.probe_expires = now + self.probe_lease_seconds
+                return True
+            self.counters['rejected'] += 1
+            return False
+
+    def _trip(self):
+        self.state = OPEN
+        self.open_until = time.monotonic() + self.current_open_seconds
+        self.probe_in_flight = False
+        self.counters['trips'] += 1
+
+    def release(self):
+        """The allowed request was never sent: free the half-open probe slot without a verdict"""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+
+    def record_success(self, latency):
+        with self.lock:
+            self.latencies.append(latency)
+            self.counters['successes'] += 1
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self.probe_in_flight = False
+                self.current_open_seconds = self.open_seconds
+
+    def record_failure(self):
+        with self.lock:
+            self.counters['failures'] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                # Failed probe: reopen with exponential backoff
+                self.current_open_seconds = min(self.current_open_seconds * 2, self.max_open_seconds)
+                self._trip()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._trip()
+
+    def p95(self):
+        with self.lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def timeout(self, default):
+        """p95 latency x multiplier, clamped to [min_timeout, default]; default until enough samples"""
+        with self.lock:
+            samples = len(self.latencies)
+        if samples < self.min_samples:
+            return default
+        return max(self.min_timeout, min(default, self.p95() * self.timeout_multiplier))
+
+    def snapshot(self):
+        p95 = self.p95()
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['state'] = self.state
+            snapshot['consecutive_failures'] = self.consecutive_failures
+            if self.state == OPEN:
+                snapshot['reopens_in_seconds'] = round(max(0, self.open_until - time.monotonic()), 1)
+        snapshot['latency_p95_ms'] = round(p95 * 1000) if p95 is not None else None
+        return snapshot
+
+
+class BreakerRegistry:
+    """Lazily created breakers keyed by endpoint template"""
+
+    def __init__(self, failure_threshold=None, open_seconds=None, probe_lease_seconds=None):
+        self.failure_threshold = failure_threshold or int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 5))
+        self.open_seconds = open_seconds or float(os.environ.get('BREAKER_OPEN_SECONDS', 30))
+        self.probe_lease_seconds = probe_lease_seconds or float(os.environ.get('BREAKER_PROBE_LEASE_SECONDS', 60))
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            breaker = self.breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.open_seconds,
+                                         probe_lease_seconds=self.probe_lease_seconds)
+                self.breakers[key] = breaker
+            return breaker
+
+    def allow(self, key):
+        return self.get(key).allow()
+
+    def timeout_for(self, key, default):
+        return self.get(key).timeout(default)
+
+    def release(self, key):
+        self.get(key).release()
+
+    def record_success(self, key, latency):
+        self.get(key).record_success(latency)
+
+    def record_failure(self, key):
+        self.get(key).record_failure()
+
+    def stats(self):
+        with self.lock:
+            breakers = list(self.breakers.items())
+        endpoints = {key: breaker.snapshot() for key, breaker in breakers}
+        return {
+            'total_trips': sum(snapshot['trips'] for snapshot in endpoints.values()),
+            'open_breakers': sum(1 for snapshot in endpoints.values() if snapshot['state'] != CLOSED),
+            'failure_threshold': self.failure_threshold,
+            'open_seconds': self.open_seconds,
+            'probe_lease_seconds': self.probe_lease_seconds,
+            'endpoints': endpoints
+        }
+
+
+# Process-wide breakers for Ortex endpoint templates
+ortex_breakers = BreakerRegistry()
@@ -0,0 +1,217 @@
+"""
+Ortex credit budget
+Every Ortex fetch first takes a credit from a per-minute token bucket and from the daily
+and monthly allowances, then settles the charge against the response's creditsUsed.
+Lower priority classes may only spend part of each budget (prewarm 80%, debug 50% by
+default), so background work runs dry before an interactive scan does. A refused fetch
+returns BUDGET_EXHAUSTED instead of calling Ortex, and the caller falls back to cached
+or modeled data
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+INTERACTIVE = 'interactive'
+PREWARM = 'prewarm'
+DEBUG = 'debug'
+
+# Share of each budget a priority class may spend; the rest is reserved for higher classes
+PRIORITY_SHARES = {
+    INTERACTIVE: 1.0,
+    PREWARM: float(os.environ.get('ORTEX_CREDITS_PREWARM_SHARE', 0.8)),
+    DEBUG: float(os.environ.get('ORTEX_CREDITS_DEBUG_SHARE', 0.5))
+}
+
+# 0 disables a budget; all three are off unless configured for the account's plan
+CREDITS_PER_MINUTE = float(os.environ.get('ORTEX_CREDITS_PER_MINUTE', 0))
+CREDITS_PER_DAY = float(os.environ.get('ORTEX_CREDITS_PER_DAY', 0))
+CREDITS_PER_MONTH = float(os.environ.get('ORTEX_CREDITS_PER_MONTH', 0))
+# JSON file the daily/monthly spend is saved to; unset keeps it per process
+CREDITS_FILE = os.environ.get('ORTEX_CREDITS_FILE') or None
+# Settles within this many seconds share one write of the file
+SAVE_INTERVAL = 5.0
+
+# url returned by the Ortex client in place of a fetch the budget refused
+BUDGET_EXHAUSTED = 'budget_exhausted'
+
+_current = contextvars.ContextVar('ortex_credit_caller', default=('unattributed', INTERACTIVE))
+
+
+def _usage():
+    return {'requests': 0, 'denied': 0, 'credits': 0}
+
+
+class CreditBudget:
+    """Token bucket plus daily/monthly allowances, with spend broken down by data type and caller"""
+
+    def __init__(self, per_minute=None, per_day=None, per_month=None, path=None):
+        self.per_minute = CREDITS_PER_MINUTE if per_minute is None else per_minute
+        self.per_day = CREDITS_PER_DAY if per_day is None else per_day
+        self.per_month = CREDITS_PER_MONTH if per_month is None else per_month
+        self.path = path
+        self.lock = threading.Lock()
+        self.tokens = self.per_minute
+        self.refilled_at = time.monotonic()
+        # Serializes file writes so an older snapshot never lands after a newer one
+        self.save_lock = threading.Lock()
+        self.save_pending = False
+        self.day = self._today()
+        self.month = self.day[:7]
+        self.spent_today = 0.0
+        self.spent_this_month = 0.0
+        self.by_data_type = {}
+        self.by_caller = {}
+        self.denials = {'per_minute': 0, 'daily': 0, 'monthly': 0}
+        if path and os.path.exists(path):
+            self._load(path)
+        if path:
+            # Spend settled since the last debounced write is not lost on a clean exit
+            atexit.register(self.flush)
+
+    def _load(self, path):
+        # A corrupt or unreadable file must not stop the server importing; count from zero instead
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get('month') == self.month:
+                self.spent_this_month = float(saved.get('spent_this_month', 0.0))
+                if saved.get('day') == self.day:
+                    self.spent_today = float(saved.get('spent_today', 0.0))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Could not load Ortex credit spend from {path}, starting from zero: {e}")
+
+    @staticmethod
+    def _today():
+        return datetime.now().date().isoformat()
+
+    @contextmanager
+    def caller(self, name, priority=INTERACTIVE):
+        """Attribute the Ortex fetches made inside the block to name, at the given priority"""
+        if priority not in PRIORITY_SHARES:
+            raise ValueError(f"Unknown credit priority '{priority}'")
+        token = _current.set((name, priority))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def current(self):
+        """(caller, priority) for the running context"""
+        return _current.get()
+
+    def bind(self, func, name, priority=INTERACTIVE):
+        """func wrapped to run as name - for work handed to other threads, which start without the context"""
+        def bound(*args, **kwargs):
+            with self.caller(name, priority):
+                return func(*args, **kwargs)
+        return bound
+
+    def _roll(self, now):
+        # Caller holds self.lock
+        if self.per_minute:
+            elapsed = now - self.refilled_at
+            self.tokens = min(self.per_minute, self.tokens + elapsed * self.per_minute / 60)
+        self.refilled_at = now
+        today = self._today()
+        if today != self.day:
+            self.day, self.spent_today = today, 0.0
+            if today[:7] != self.month:
+                self.month, self.spent_this_month = today[:7], 0.0
+
+    def _refusal(self, credits, share):
+        # Caller holds self.lock; the reserve (1 - share) of each budget is off limits to this class
+        if self.per_minute and self.tokens - self.per_minute * (1 - share) < credits:
+            return 'per_minute'
+        if self.per_day and self.spent_today + credits > self.per_day * share:
+            return 'daily'
+        if self.per_month and self.spent_this_month + credits > self.per_month * share:
+            return 'monthly'
+        return None
+
+    def acquire(self, data_type, credits=1, context=None):
+        """Reserve credits for one fetch; False means skip the call and fall back"""
+        name, priority = context or self.current()
+        share = PRIORITY_SHARES.get(priority, PRIORITY_SHARES[DEBUG])
+        with self.lock:
+            self._roll(time.monotonic())
+            type_usage = self.by_data_type.setdefault(data_type, _usage())
+            caller_usage = self.by_caller.setdefault(name, dict(_usage(), priority=priority))
+            refusal = self._refusal(credits, share)
+            if refusal:
+                self.denials[refusal] += 1
+                type_usage['denied'] += 1
+                caller_usage['denied'] += 1
+                return False
+            if self.per_minute:
+                self.tokens -= credits
+            self.spent_today += credits
+            self.spent_this_month += credits
+            type_usage['requests'] += 1
+            caller_usage['requests'] += 1
+        return True
+
+    def settle(self, data_type, credits_used, reserved=1, context=None):
+        """Replace a reservation with what the response says it cost (0 for failed fetches)"""
+        name, _ = context or self.current()
+        credits_used = credits_used if isinstance(credits_used, (int, float)) else 0
+        schedule_save = False
+        with self.lock:
+            if self.per_minute:
+                # An expensive response can leave the bucket in debt; it refills before the next call goes out
+                self._roll(time.monotonic())
+                self.tokens = min(self.per_minute, self.tokens + reserved - credits_used)
+            self.spent_today = max(0.0, self.spent_today + credits_used - reserved)
+            self.spent_this_month = max(0.0, self.spent_this_month + credits_used - reserved)
+            self.by_data_type.setdefault(data_type, _usage())['credits'] += credits_used
+            self.by_caller.setdefault(name, _usage())['credits'] += credits_used
+            if self.path and not self.save_pending:
+                self.save_pending = schedule_save = True
+        # The file is written off the fetch path: one timer per SAVE_INTERVAL picks up every settle since
+        if schedule_save:
+            timer = threading.Timer(SAVE_INTERVAL, self.flush)
+            timer.daemon = True
+            timer.start()
+
+    def flush(self):
+        """Write the daily/monthly spend to the file now; the budget lock is held only for the snapshot"""
+        if not self.path:
+            return
+        with self.save_lock:
+            with self.lock:
+                self.save_pending = False
+                snapshot = {'day': self.day, 'month': self.month, 'spent_today': self.spent_today,
+                            'spent_this_month': self.spent_this_month}
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(snapshot, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not save Ortex credit spend to {self.path}: {e}")
+
+    def stats(self):
+        with self.lock:
+            self._roll(time.monotonic())
+            return {
+                'budgets': {'per_minute': self.per_minute, 'per_day': self.per_day, 'per_month': self.per_month},
+                'priority_shares': dict(PRIORITY_SHARES),
+                'tokens_available': round(self.tokens, 2) if self.per_minute else None,
+                'spent_today': self.spent_today,
+                'spent_this_month': self.spent_this_month,
+                'remaining_today': max(0.0, self.per_day - self.spent_today) if self.per_day else None,
+                'remaining_this_month': max(0.0, self.per_month - self.spent_this_month) if self.per_month else None,
+                'denials': dict(self.denials),
+                'by_data_type': {key: dict(value) for key, value in self.by_data_type.items()},
+                'by_caller': {key: dict(value) for key, value in self.by_caller.items()},
+                'persistence': 'file' if self.path else 'memory'
+            }
+
+
+# Process-wide budget in front of every Ortex call
+credit_budget = CreditBudget(path=CREDITS_FILE)
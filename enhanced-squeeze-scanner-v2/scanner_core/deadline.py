@@ -0,0 +1,46 @@
+"""
+Per-scan wall-clock deadline
+Created once per scan and passed to every fetch so each request uses the remaining budget
+as its timeout, and the scan returns whatever is complete when the budget runs out
+"""
+
+import os
+import time
+
+
+class Deadline:
+    """Monotonic scan budget with a reserve held back for scoring and serialization"""
+
+    def __init__(self, budget_seconds, reserve_seconds=1.0, min_timeout=0.25):
+        self.budget = float(budget_seconds)
+        self.reserve = reserve_seconds
+        self.min_timeout = min_timeout
+        self.started = time.monotonic()
+        self.expires_at = self.started + self.budget
+
+    @classmethod
+    def for_scan(cls, default_budget):
+        """Deadline from SCAN_DEADLINE_SECONDS, falling back to the variant's own budget"""
+        return cls(float(os.environ.get('SCAN_DEADLINE_SECONDS', default_budget)))
+
+    def remaining(self):
+        """Seconds left for fetches (excludes the reserve)"""
+        return max(0.0, self.expires_at - self.reserve - time.monotonic())
+
+    def expired(self):
+        return self.remaining() < self.min_timeout
+
+    def timeout(self, default):
+        """Per-request timeout: the caller's default capped by what is left of the budget"""
+        return max(self.min_timeout, min(default, self.remaining()))
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def summary(self):
+        return {
+            'budget_seconds': self.budget,
+            'elapsed_seconds': round(self.elapsed(), 2),
+            'remaining_seconds': round(self.remaining(), 2),
+            'expired': self.expired()
+        }
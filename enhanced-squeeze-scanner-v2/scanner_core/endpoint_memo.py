@@ -0,0 +1,145 @@
+"""
+Endpoint-discovery memo for Ortex URL templates
+Remembers, per (ticker, data_type), which URL template last returned JSON and which
+returned 404/HTML, so later calls go straight to the working endpoint
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+
+class EndpointMemo:
+    """Persistent (ticker, data_type) -> working/dead URL template index"""
+
+    def __init__(self, path=None, dead_ttl=None, save_interval=30):
+        self.path = path if path is not None else os.environ.get('ENDPOINT_MEMO_PATH', '/tmp/ortex_endpoint_memo.json')
+        # Dead templates are retried after this long in case Ortex adds coverage
+        self.dead_ttl = dead_ttl or int(os.environ.get('ENDPOINT_MEMO_DEAD_TTL', 6 * 3600))
+        self.save_interval = save_interval
+        self.entries = {}
+        self.dirty = False
+        self.last_saved = 0
+        self.lock = threading.Lock()
+        self.counters = {
+            'resolved_hits': 0,
+            'dead_skipped': 0,
+            'successes_recorded': 0,
+            'failures_recorded': 0,
+            'invalidations': 0
+        }
+        self.load()
+
+    def _key(self, ticker, data_type):
+        return f"{ticker.upper()}|{data_type}"
+
+    def order(self, ticker, data_type, templates):
+        """Return templates to try: last working one first, known-dead ones dropped"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(self._key(ticker, data_type))
+            if not entry:
+                return list(templates)
+
+            dead = {template for template, info in entry.get('dead', {}).items() if now - info['at'] < self.dead_ttl}
+            resolved = entry.get('resolved')
+            ordered = [t for t in templates if t not in dead]
+            self.counters['dead_skipped'] += len(templates) - len(ordered)
+            if resolved in ordered:
+                ordered.remove(resolved)
+                ordered.insert(0, resolved)
+                self.counters['resolved_hits'] += 1
+            return ordered
+
+    def record_success(self, ticker, data_type, template):
+        with self.lock:
+            entry = self.entries.setdefault(self._key(ticker, data_type), {})
+            changed = entry.get('resolved') != template or template in entry.get('dead', {})
+            entry['resolved'] = template
+            entry['resolved_at'] = time.time()
+            entry.get('dead', {}).pop(template, None)
+            self.counters['successes_recorded'] += 1
+            self.dirty = self.dirty or changed
+        self._maybe_save()
+
+    def record_failure(self, ticker, data_type, template, reason):
+        """Mark a template dead for this ticker (404 or HTML, not transient errors)"""
+        with self.lock:
+            entry = self.entries.setdefault(self._key(ticker, data_type), {})
+            entry.setdefault('dead', {})[template] = {'reason': str(reason), 'at': time.time()}
+            if entry.get('resolved') == template:
+                entry.pop('resolved', None)
+                entry.pop('resolved_at', None)
+            self.counters['failures_recorded'] += 1
+            self.dirty = True
+        self._maybe_save()
+
+    def invalidate(self, ticker=None, data_type=None):
+        """Forget entries for a ticker, a data type, both, or everything; returns the count removed"""
+        with self.lock:
+            keys = [
+                key for key in self.entries
+                if (ticker is None or key.split('|', 1)[0] == ticker.upper())
+                and (data_type is None or key.split('|', 1)[1] == data_type)
+            ]
+            for key in keys:
+                del self.entries[key]
+            self.counters['invalidations'] += len(keys)
+            self.dirty = self.dirty or bool(keys)
+        self.save()
+        return len(keys)
+
+    def snapshot(self, ticker=None):
+        """Inspectable copy of the memo, optionally for one ticker"""
+        with self.lock:
+            return {
+                key: json.loads(json.dumps(entry)) for key, entry in self.entries.items()
+                if ticker is None or key.split('|', 1)[0] == ticker.upper()
+            }
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            with self.lock:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            print(f"⚠️  Could not load endpoint memo from {self.path}, starting empty")
+
+    def save(self):
+        """Atomically write the memo to disk if it changed"""
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            payload = json.dumps({'entries': self.entries})
+            self.dirty = False
+            self.last_saved = time.monotonic()
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            with self.lock:
+                self.dirty = True
+
+    def _maybe_save(self):
+        if time.monotonic() - self.last_saved >= self.save_interval:
+            self.save()
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+            counters['entries'] = len(self.entries)
+            counters['resolved_entries'] = sum(1 for entry in self.entries.values() if entry.get('resolved'))
+        counters['path'] = self.path
+        return counters
+
+
+# Process-wide memo shared by every Ortex fetch path
+endpoint_memo = EndpointMemo()
+atexit.register(endpoint_memo.save)
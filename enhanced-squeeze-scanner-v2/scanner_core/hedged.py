@@ -0,0 +1,164 @@
+"""
+Hedged provider racing
+Fires the primary provider, launches the next one after an adaptive hedge delay (or
+immediately on failure), and takes the first valid answer
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from collections import deque
+
+
+class ProviderStats:
+    """Launch/win/error counters and a rolling latency window for one provider"""
+
+    def __init__(self, window=100):
+        self.launched = 0
+        self.wins = 0
+        self.errors = 0
+        self.empty = 0
+        self.abandoned = 0
+        self.latencies = deque(maxlen=window)
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self):
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            'launched': self.launched,
+            'wins': self.wins,
+            'win_rate': round(self.wins / self.launched * 100, 1) if self.launched else 0.0,
+            'errors': self.errors,
+            'empty_results': self.empty,
+            'abandoned': self.abandoned,
+            'latency_p50_ms': round(p50 * 1000) if p50 is not None else None,
+            'latency_p95_ms': round(p95 * 1000) if p95 is not None else None
+        }
+
+
+class HedgedRacer:
+    """Races an ordered list of providers with hedged launches and adaptive hedge delay"""
+
+    def __init__(self, name, hedge_delay=None, min_delay=0.05, max_delay=3.0, min_samples=10, max_workers=16):
+        self.name = name
+        self.default_delay = hedge_delay or float(os.environ.get('PRICE_HEDGE_DELAY', 0.5))
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'hedge-{name}')
+        self.providers = {}
+        self.lock = threading.Lock()
+        self.counters = {
+            'races': 0,
+            'hedges_launched': 0,
+            'all_failed': 0
+        }
+
+    def _stats_for(self, provider_name):
+        stats = self.providers.get(provider_name)
+        if stats is None:
+            stats = ProviderStats()
+            self.providers[provider_name] = stats
+        return stats
+
+    def hedge_delay(self, provider_name):
+        """Wait roughly the provider's p95 latency before hedging; default until enough samples exist"""
+        with self.lock:
+            stats = self._stats_for(provider_name)
+            if len(stats.latencies) < self.min_samples:
+                return self.default_delay
+            p95 = stats.percentile(95)
+        return max(self.min_delay, min(self.max_delay, p95))
+
+    def _record(self, provider_name, started, future, settled):
+        """Done-callback: record latency/outcome, including losers that finish after the race"""
+        elapsed = time.monotonic() - started
+        with self.lock:
+            stats = self._stats_for(provider_name)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                stats.errors += 1
+            elif not future.result():
+                stats.empty += 1
+                stats.latencies.append(elapsed)
+            else:
+                stats.latencies.append(elapsed)
+            if settled.is_set():
+                stats.abandoned += 1
+
+    def race(self, providers, *args, timeout=30):
+        """Return (provider_name, result) for the first truthy result, or (None, None) if all fail"""
+        with self.lock:
+            self.counters['races'] += 1
+
+        pending = {}
+        settled = threading.Event()
+        remaining = list(providers)
+        deadline = time.monotonic() + timeout
+
+        def launch():
+            provider_name, func = remaining.pop(0)
+            with self.lock:
+                self._stats_for(provider_name).launched += 1
+            future = self.executor.submit(func, *args)
+            future.add_done_callback(lambda f, n=provider_name, s=time.monotonic(): self._record(n, s, f, settled))
+            pending[future] = provider_name
+            return provider_name
+
+        current = launch()
+        try:
+            while pending:
+                wait_for = deadline - time.monotonic()
+                if wait_for <= 0:
+                    break
+                if remaining:
+                    wait_for = min(wait_for, self.hedge_delay(current))
+                done, _ = concurrent.futures.wait(pending, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                if not done:
+                    # Primary is slow - hedge with the next provider
+                    if remaining:
+                        with self.lock:
+                            self.counters['hedges_launched'] += 1
+                        current = launch()
+                    continue
+
+                for future in done:
+                    provider_name = pending.pop(future)
+                    if future.exception() is None and future.result():
+                        with self.lock:
+                            self._stats_for(provider_name).wins += 1
+                        return provider_name, future.result()
+
+                # Failure or empty answer: launch the next provider immediately
+                if remaining:
+                    current = launch()
+        finally:
+            settled.set()
+            for future in pending:
+                future.cancel()
+
+        with self.lock:
+            self.counters['all_failed'] += 1
+        return None, None
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+            providers = {name: stats.snapshot() for name, stats in self.providers.items()}
+        counters['default_hedge_delay_ms'] = round(self.default_delay * 1000)
+        counters['hedge_delay_ms'] = {name: round(self.hedge_delay(name) * 1000) for name in providers}
+        counters['providers'] = providers
+        return counters
+
+
+# Process-wide racer for stock price providers
+price_racer = HedgedRacer('price')
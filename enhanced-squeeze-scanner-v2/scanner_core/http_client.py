@@ -0,0 +1,307 @@
+"""
+Pooled keep-alive HTTP client shared by every scanner variant
+Keeps persistent connections per host so Ortex and Yahoo calls skip the TLS handshake
+"""
+
+import gzip
+import http.client
+import io
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections import deque
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Errors raised when a pooled connection was closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class PooledResponse:
+    """Fully-read HTTP response with the urlopen surface the scanners rely on"""
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    @property
+    def code(self):
+        return self.status
+
+    def getcode(self):
+        return self.status
+
+    def read(self):
+        return self.body
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class ConnectionPool:
+    """Idle keep-alive connections for a single scheme/host/port"""
+
+    def __init__(self, scheme, host, port, max_size, idle_timeout, ssl_context):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        self.idle = deque()
+        self.lock = threading.Lock()
+
+    def new_connection(self, timeout):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def acquire(self):
+        """Return (connection, evicted_count) for the freshest idle connection, or (None, evicted_count)"""
+        evicted = 0
+        now = time.monotonic()
+        with self.lock:
+            while self.idle:
+                conn, last_used = self.idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    return conn, evicted
+                conn.close()
+                evicted += 1
+        return None, evicted
+
+    def release(self, conn):
+        """Park a connection for reuse; returns False when the pool is full"""
+        with self.lock:
+            if len(self.idle) < self.max_size:
+                self.idle.append((conn, time.monotonic()))
+                return True
+        conn.close()
+        return False
+
+    def evict_idle(self):
+        """Close connections idle for longer than the idle timeout"""
+        evicted = 0
+        now = time.monotonic()
+        with self.lock:
+            fresh = deque()
+            for conn, last_used in self.idle:
+                if now - last_used <= self.idle_timeout:
+                    fresh.append((conn, last_used))
+                else:
+                    conn.close()
+                    evicted += 1
+            self.idle = fresh
+        return evicted
+
+    def close_all(self):
+        with self.lock:
+            while self.idle:
+                conn, _ = self.idle.pop()
+                conn.close()
+
+    def size(self):
+        with self.lock:
+            return len(self.idle)
+
+
+class PooledHTTPClient:
+    """Thread-safe HTTP client with per-host persistent connection pools"""
+
+    def __init__(self, max_per_host=None, idle_timeout=None):
+        self.max_per_host = max_per_host or int(os.environ.get('HTTP_POOL_MAX_PER_HOST', 10))
+        self.idle_timeout = idle_timeout or float(os.environ.get('HTTP_POOL_IDLE_TIMEOUT', 30))
+        self.ssl_context = ssl.create_default_context()
+        self.pools = {}
+        self.lock = threading.Lock()
+        self.counters = {
+            'requests': 0,
+            'pool_hits': 0,
+            'pool_misses': 0,
+            'stale_retries': 0,
+            'idle_evictions': 0,
+            'gzip_responses': 0,
+            'errors': 0
+        }
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def _get_pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, self.max_per_host, self.idle_timeout, self.ssl_context)
+                self.pools[key] = pool
+            return pool
+
+    def _decode_body(self, body, headers):
+        encoding = (headers.get('Content-Encoding') or '').lower()
+        if encoding == 'gzip':
+            self._count('gzip_responses')
+            return gzip.decompress(body)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
+
+    def _send(self, pool, method, target, headers, body, timeout):
+        """Send one request over a pooled connection, retrying once if the idle socket went stale"""
+        conn, evicted = pool.acquire()
+        if evicted:
+            self._count('idle_evictions', evicted)
+
+        reused = conn is not None
+        if reused:
+            self._count('pool_hits')
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        else:
+            self._count('pool_misses')
+            conn = pool.new_connection(timeout)
+
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            self._count('stale_retries')
+            self._count('pool_misses')
+            conn = pool.new_connection(timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            pool.release(conn)
+
+        return response, data
+
+    def request(self, method, url, headers=None, body=None, timeout=10):
+        """Perform a request and return a fully-read PooledResponse (no status checks)"""
+        self._count('requests')
+
+        request_headers = {'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'}
+        for name, value in (headers or {}).items():
+            request_headers[name.title()] = value
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            scheme = parts.scheme or 'http'
+            port = parts.port or (443 if scheme == 'https' else 80)
+            target = parts.path or '/'
+            if parts.query:
+                target = f"{target}?{parts.query}"
+
+            pool = self._get_pool(scheme, parts.hostname, port)
+            try:
+                response, data = self._send(pool, method, target, request_headers, body, timeout)
+            except Exception:
+                self._count('errors')
+                raise
+
+            if response.status in REDIRECT_CODES and response.headers.get('Location'):
+                url = urllib.parse.urljoin(url, response.headers['Location'])
+                if response.status == 303:
+                    method, body = 'GET', None
+                continue
+
+            return PooledResponse(url, response.status, response.reason, response.headers,
+                                  self._decode_body(data, response.headers))
+
+        raise urllib.error.URLError(f'Too many redirects for {url}')
+
+    def get(self, url, headers=None, timeout=10):
+        """GET a URL and return the PooledResponse"""
+        return self.request('GET', url, headers=headers, timeout=timeout)
+
+    def urlopen(self, req, timeout=10):
+        """Drop-in replacement for urllib.request.urlopen over pooled connections"""
+        if isinstance(req, urllib.request.Request):
+            url = req.full_url
+            headers = dict(req.header_items())
+            method = req.get_method()
+            body = req.data
+        else:
+            url, headers, method, body = req, {}, 'GET', None
+
+        response = self.request(method, url, headers=headers, body=body, timeout=timeout)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason,
+                                         response.headers, io.BytesIO(response.body))
+        return response
+
+    def evict_idle(self):
+        """Sweep every host pool for idle connections past the idle timeout"""
+        with self.lock:
+            pools = list(self.pools.values())
+        evicted = sum(pool.evict_idle() for pool in pools)
+        if evicted:
+            self._count('idle_evictions', evicted)
+        return evicted
+
+    def close_all(self):
+        with self.lock:
+            pools = list(self.pools.values())
+        for pool in pools:
+            pool.close_all()
+
+    def stats(self):
+        """Pool counters; every pool hit is a TLS handshake saved"""
+        with self.lock:
+            counters = dict(self.counters)
+            pools = list(self.pools.items())
+        total = counters['pool_hits'] + counters['pool_misses']
+        counters['pool_hit_rate'] = round(counters['pool_hits'] / total * 100, 1) if total else 0.0
+        counters['handshakes_saved'] = counters['pool_hits']
+        counters['max_per_host'] = self.max_per_host
+        counters['idle_timeout_seconds'] = self.idle_timeout
+        counters['idle_connections'] = {f"{scheme}://{host}:{port}": pool.size() for (scheme, host, port), pool in pools}
+        return counters
+
+
+# Process-wide client shared by all handlers
+http_client = PooledHTTPClient()
+
+
+def urlopen(req, timeout=10):
+    """Module-level urlopen over the shared pooled client"""
+    return http_client.urlopen(req, timeout=timeout)
@@ -0,0 +1,314 @@
+"""
+Production HTTP server for the BaseHTTPRequestHandler scanners
+Serves a scanner's `handler` class from a bounded thread pool instead of one request at a
+time: at most SERVER_THREADS requests run at once, up to SERVER_MAX_QUEUE more connections
+wait for a thread and anything past that gets an immediate 503. Responses are HTTP/1.1
+keep-alive (bodies the handlers write without a Content-Length are buffered and framed).
+--workers N pre-forks N processes sharing one listening socket; SIGTERM/SIGINT stop
+accepting, close idle keep-alive connections and let in-flight scans finish
+
+    python -m scanner_core.http_server production --port 8000 --threads 16
+    python -m scanner_core.http_server scanner_enhanced --workers 4
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+
+SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 16))
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 1))
+# Accepted connections allowed to wait for a free thread before new ones get a 503
+SERVER_MAX_QUEUE = int(os.environ.get('SERVER_MAX_QUEUE', 64))
+# Idle seconds before a keep-alive connection is closed
+KEEPALIVE_SECONDS = float(os.environ.get('SERVER_KEEPALIVE_SECONDS', 5))
+# How long shutdown waits for in-flight requests
+DRAIN_SECONDS = float(os.environ.get('SERVER_DRAIN_SECONDS', 30))
+LISTEN_BACKLOG = 256
+
+_BUSY_BODY = json.dumps({'success': False, 'error': 'Server busy - retry shortly'}).encode()
+BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode() + b"\r\n\r\n" + _BUSY_BODY
+)
+
+
+def keep_alive(handler_class):
+    """HTTP/1.1 subclass of a scanner handler: unframed bodies are buffered so Content-Length can be sent"""
+
+    class KeepAliveHandler(handler_class):
+        protocol_version = 'HTTP/1.1'
+        timeout = KEEPALIVE_SECONDS
+
+        def send_header(self, keyword, value):
+            if keyword.lower() == 'content-length':
+                self._framed = True
+            super().send_header(keyword, value)
+
+        def end_headers(self):
+            if not self.close_connection and self.server.should_close():
+                # Announce the close so the client doesn't send its next request into a dead socket
+                self.send_header('Connection', 'close')
+            # Streams send Connection: close and HTTP/1.0 clients close anyway - write those straight through
+            if self._framed or self.close_connection:
+                super().end_headers()
+                return
+            self._held_headers, self._headers_buffer = self._headers_buffer, []
+            self.wfile = io.BytesIO()
+
+        def parse_request(self):
+            self.server.connection_busy(self.connection)
+            return super().parse_request()
+
+        def handle_one_request(self):
+            self._framed = False
+            self._held_headers = None
+            socket_wfile = self.wfile
+            self.server.connection_idle(self.connection)
+            try:
+                super().handle_one_request()
+            finally:
+                body = self.wfile.getvalue() if self._held_headers is not None else None
+                self.wfile = socket_wfile
+            if body is not None:
+                self._headers_buffer = self._held_headers
+                self.send_header('Content-Length', str(len(body)))
+                super().end_headers()
+                self.wfile.write(body)
+                self.wfile.flush()
+
+        def finish(self):
+            self.server.connection_busy(self.connection)
+            super().finish()
+
+    KeepAliveHandler.__name__ = handler_class.__name__
+    KeepAliveHandler.__qualname__ = handler_class.__qualname__
+    return KeepAliveHandler
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands connections to a bounded thread pool and sheds load past a queue depth limit"""
+
+    allow_reuse_address = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, server_address, handler_class, threads=None, max_queue=None, bind_and_activate=True):
+        super().__init__(server_address, keep_alive(handler_class), bind_and_activate)
+        self.threads = threads or SERVER_THREADS
+        self.max_queue = SERVER_MAX_QUEUE if max_queue is None else max_queue
+        self.pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='http')
+        self.lock = threading.Lock()
+        self.draining = threading.Event()
+        # Connections handed to the pool and not yet closed (running or waiting for a thread)
+        self.active = 0
+        # Keep-alive connections parked between requests, woken up on shutdown
+        self.idle = set()
+        self.counters = {
+            'connections': 0,
+            'requests_rejected': 0,
+            'connections_completed': 0,
+            'errors': 0
+        }
+
+    def adopt_socket(self, listener):
+        """Serve from a listening socket opened by the parent process (pre-fork)"""
+        self.socket.close()
+        self.socket = listener
+        self.server_address = listener.getsockname()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            rejected = self.draining.is_set() or self.active >= self.threads + self.max_queue
+            if rejected:
+                self.counters['requests_rejected'] += 1
+            else:
+                self.active += 1
+                self.counters['connections'] += 1
+        if rejected:
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            with self.lock:
+                self.counters['errors'] += 1
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self.lock:
+                self.idle.discard(request)
+                self.active -= 1
+                self.counters['connections_completed'] += 1
+
+    def connection_idle(self, connection):
+        with self.lock:
+            self.idle.add(connection)
+
+    def connection_busy(self, connection):
+        with self.lock:
+            self.idle.discard(connection)
+
+    def should_close(self):
+        """Drop keep-alive when shutting down or when other connections are waiting for a thread"""
+        return self.draining.is_set() or self.active > self.threads
+
+    def drain(self, timeout=None):
+        """Stop serving: wake idle keep-alive connections and wait for in-flight requests"""
+        self.draining.set()
+        deadline = time.monotonic() + (DRAIN_SECONDS if timeout is None else timeout)
+        while time.monotonic() < deadline:
+            with self.lock:
+                idle, active = list(self.idle), self.active
+            if not active:
+                break
+            for connection in idle:
+                try:
+                    connection.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+            time.sleep(0.05)
+        with self.lock:
+            unfinished = self.active
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.server_close()
+        return unfinished
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['active_connections'] = self.active
+            snapshot['idle_connections'] = len(self.idle)
+        snapshot['threads'] = self.threads
+        snapshot['max_queue'] = self.max_queue
+        snapshot['queued_connections'] = max(snapshot['active_connections'] - self.threads, 0)
+        snapshot['draining'] = self.draining.is_set()
+        return snapshot
+
+
+def _stop_on_signals(server):
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it cannot run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+
+def run_worker(server, label):
+    """Serve until SIGTERM/SIGINT, then drain; returns the process exit code"""
+    _stop_on_signals(server)
+    server.serve_forever()
+    print(f"🛑 {label} draining {server.stats()['active_connections']} connection(s)")
+    unfinished = server.drain()
+    if unfinished:
+        print(f"⚠️ {label} stopped with {unfinished} request(s) still running")
+    return 0
+
+
+def run_prefork(listener, workers, make_server):
+    """Fork workers that accept on one shared socket; respawn crashed ones until told to stop"""
+    children = {}
+    stopping = []
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = run_worker(make_server(listener), f"Worker {os.getpid()}")
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        print(f"⚠️ Worker {pid} exited ({os.waitstatus_to_exitcode(status)}) - respawning")
+        if time.monotonic() - started < 1:
+            # Crashing on startup - don't spin
+            time.sleep(1)
+        spawn()
+    listener.close()
+    return 0
+
+
+def load_handler(app):
+    """`handler` class of a scanner module in api/ (production, scanner_enhanced, ...)"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in (root, os.path.join(root, 'api')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    module_name, _, attr = app.partition(':')
+    module = importlib.import_module(module_name.replace('/', '.').removesuffix('.py').removeprefix('api.'))
+    return getattr(module, attr or 'handler')
+
+
+def serve(handler_class, host='0.0.0.0', port=8000, threads=None, workers=None, max_queue=None):
+    """Serve handler_class from a thread pool, pre-forking when workers > 1"""
+    workers = workers or SERVER_WORKERS
+    server = PooledHTTPServer((host, port), handler_class, threads, max_queue)
+    print(f"🚀 Serving {handler_class.__module__} at http://{host}:{server.server_address[1]} "
+          f"({workers} worker(s) x {server.threads} threads, queue {server.max_queue})")
+    if workers <= 1:
+        return run_worker(server, 'Server')
+
+    def worker_server(listener):
+        worker = PooledHTTPServer((host, port), handler_class, threads, max_queue, bind_and_activate=False)
+        worker.adopt_socket(listener)
+        return worker
+
+    # Non-blocking so the workers that lose an accept race go back to polling instead of blocking
+    server.socket.setblocking(False)
+    return run_prefork(server.socket, workers, worker_server)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Threaded / pre-forked server for a scanner handler')
+    parser.add_argument('app', nargs='?', default='production', help='scanner module in api/, optionally module:attr')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--threads', type=int, default=SERVER_THREADS, help='requests served concurrently per worker')
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS, help='pre-forked worker processes')
+    parser.add_argument('--max-queue', type=int, default=SERVER_MAX_QUEUE, help='connections waiting for a thread before 503')
+    args = parser.parse_args()
+    return serve(load_handler(args.app), args.host, args.port, args.threads, args.workers, args.max_queue)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Incremental rescoring on price-only updates
+Ortex short-interest inputs change a few times a day; quotes move all day. Full scans
+remember each ticker's Ortex snapshot, per-profile partial scores (SI/util/CTB/DTC
+subtotals) are computed once per snapshot, and a quote refresh only re-runs the
+momentum/volume terms. Partials are recomputed only when the Ortex inputs change
+"""
+
+import os
+import threading
+
+from scanner_core.cache import TTLCache
+from scanner_core.scoring_profiles import ORTEX_FIELDS, as_metrics
+
+# How long a snapshot may stand in for Ortex in quote-refresh mode (matches the SI/DTC cache TTL)
+SNAPSHOT_TTL = int(os.environ.get('INCREMENTAL_SNAPSHOT_TTL', 6 * 3600))
+
+QUOTE_REFRESH = 'quote_refresh'
+
+
+def ortex_signature(ortex_data):
+    """The Ortex inputs the profiles read; partials stay valid while this is unchanged"""
+    ortex_data = ortex_data or {}
+    return tuple(ortex_data.get(field, 0) for field in ORTEX_FIELDS)
+
+
+def is_quote_refresh(mode):
+    return (mode or '').lower().replace('-', '_') == QUOTE_REFRESH
+
+
+class IncrementalScorer:
+    """Per-ticker Ortex snapshots with cached per-profile partial scores"""
+
+    def __init__(self, ttl=None, max_entries=None):
+        self.ttl = SNAPSHOT_TTL if ttl is None else ttl
+        # ticker -> {'ortex_data', 'signature', 'partials': {profile name: partial}}
+        self.snapshots = TTLCache(max_entries=max_entries, default_ttl=self.ttl)
+        self.lock = threading.Lock()
+        self.counters = {
+            'snapshots_stored': 0,
+            'snapshots_changed': 0,
+            'partials_computed': 0,
+            'partials_reused': 0,
+            'refreshes': 0,
+            'refresh_misses': 0
+        }
+
+    def remember(self, ticker, ortex_data):
+        """Record a full scan's Ortex data; cached partials survive only if the inputs are unchanged"""
+        signature = ortex_signature(ortex_data)
+        entry = self.snapshots.get(ticker)
+        changed = entry is None or entry['signature'] != signature
+        partials = {} if changed else entry['partials']
+        self.snapshots.set(ticker, {'ortex_data': ortex_data, 'signature': signature, 'partials': partials})
+        with self.lock:
+            self.counters['snapshots_stored'] += 1
+            if changed and entry is not None:
+                self.counters['snapshots_changed'] += 1
+
+    def remember_many(self, ortex_by_ticker):
+        for ticker, ortex_data in ortex_by_ticker.items():
+            self.remember(ticker, ortex_data)
+
+    def snapshot(self, ticker):
+        """Last remembered Ortex data for a ticker, or None"""
+        entry = self.snapshots.get(ticker)
+        return entry['ortex_data'] if entry else None
+
+    def split(self, tickers):
+        """(tickers with a live snapshot, tickers that need a full scan)"""
+        known, missing = [], []
+        for ticker in tickers:
+            (known if self.snapshots.contains(ticker) else missing).append(ticker)
+        return known, missing
+
+    def _partial(self, entry, profile):
+        partial = entry['partials'].get(profile.name)
+        if partial is not None:
+            with self.lock:
+                self.counters['partials_reused'] += 1
+            return partial
+        partial = profile.partials(entry['ortex_data'])
+        entry['partials'][profile.name] = partial
+        with self.lock:
+            self.counters['partials_computed'] += 1
+        return partial
+
+    def rescore(self, ticker, profiles, price_data):
+        """{profile name: evaluation} from cached partials and new quotes, or None without a snapshot"""
+        entry = self.snapshots.get(ticker)
+        if entry is None:
+            with self.lock:
+                self.counters['refresh_misses'] += 1
+            return None
+        scores = {}
+        for profile in profiles:
+            try:
+                scores[profile.name] = profile.refresh(self._partial(entry, profile), price_data)
+            except Exception as e:
+                scores[profile.name] = {'score': 0, 'level': 'Error', 'breakdown': {}, 'risk_factors': [], 'error': str(e)}
+        with self.lock:
+            self.counters['refreshes'] += 1
+        return scores
+
+    def rescore_metrics(self, ticker, profile, price_data):
+        """rescore() for one profile in the squeeze_metrics shape the scan loops consume"""
+        scores = self.rescore(ticker, [profile], price_data)
+        return as_metrics(profile.name, scores[profile.name]) if scores else None
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+        snapshot['tickers'] = len(self.snapshots)
+        snapshot['snapshot_ttl'] = self.ttl
+        return snapshot
+
+
+# Process-wide snapshot store shared by the scan paths
+incremental_scorer = IncrementalScorer()
@@ -0,0 +1,163 @@
+"""
+JSON response encoding
+orjson when it is installed, else the stdlib encoder with compact separators. Bodies of
+JSON_GZIP_MIN_BYTES or more are gzipped for clients that accept it, and a request can opt
+in to a columnar result list ("format": "columnar" or ?format=columnar): field names once,
+one array of values per row, with nested objects such as ortex_data flattened into dotted
+fields ("ortex_data.short_interest")
+"""
+
+import gzip
+import json
+import os
+import threading
+import urllib.parse
+
+from scanner_core.static_assets import choose_encoding
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+GZIP_MIN_BYTES = int(os.environ.get('JSON_GZIP_MIN_BYTES', 8192))
+# Every response is compressed on the fly, so favour speed over ratio
+GZIP_LEVEL = int(os.environ.get('JSON_GZIP_LEVEL', 5))
+COLUMNAR = 'columnar'
+
+
+def dumps(data):
+    """Compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Values orjson refuses (ints past 64 bits, ...) get the stdlib's verdict
+            pass
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def to_columns(rows):
+    """{"fields": [...], "rows": [[...], ...]} for a list of result dicts; absent values are null"""
+    order, nested, plain = [], {}, set()
+    for row in rows:
+        for name, value in row.items():
+            if name not in nested and name not in plain:
+                order.append(name)
+            if isinstance(value, dict) and name not in plain:
+                keys = nested.setdefault(name, {})
+                for key in value:
+                    keys[key] = None
+            elif value is not None:
+                # A field is only flattened when every value it has is an object
+                plain.add(name)
+                nested.pop(name, None)
+
+    columns = []
+    for name in order:
+        if nested.get(name):
+            columns.extend((name, key) for key in nested[name])
+        else:
+            columns.append((name, None))
+
+    table = []
+    for row in rows:
+        values = []
+        for name, key in columns:
+            value = row.get(name)
+            if key is not None:
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append(value)
+        table.append(values)
+    return {
+        'fields': [name if key is None else f"{name}.{key}" for name, key in columns],
+        'rows': table
+    }
+
+
+def from_columns(table):
+    """Result dicts back from to_columns(); null nested values are left out of their object"""
+    columns = [field.split('.', 1) for field in table['fields']]
+    rows = []
+    for values in table['rows']:
+        row = {}
+        for column, value in zip(columns, values):
+            if len(column) == 1:
+                row[column[0]] = value
+            elif value is not None:
+                row.setdefault(column[0], {})[column[1]] = value
+        rows.append(row)
+    return rows
+
+
+def wants_columnar(data=None, path=None):
+    """Opt-in from the request body ("format": "columnar") or the query string (?format=columnar)"""
+    if isinstance(data, dict) and data.get('format') == COLUMNAR:
+        return True
+    query = urllib.parse.urlsplit(path or '').query
+    return urllib.parse.parse_qs(query).get('format', [None])[0] == COLUMNAR
+
+
+class JsonResponder:
+    """Serializes API responses and keeps size/compression counters"""
+
+    def __init__(self, gzip_min_bytes=GZIP_MIN_BYTES, gzip_level=GZIP_LEVEL):
+        self.gzip_min_bytes = gzip_min_bytes
+        self.gzip_level = gzip_level
+        self.lock = threading.Lock()
+        self.counters = {
+            'responses': 0,
+            'gzipped': 0,
+            'columnar': 0,
+            'bytes_encoded': 0,
+            'bytes_sent': 0
+        }
+
+    def columnar(self, response, key):
+        """Copy of response with the result list under key in columnar form"""
+        rows = response.get(key)
+        if not isinstance(rows, list):
+            return response
+        with self.lock:
+            self.counters['columnar'] += 1
+        return dict(response, **{key: to_columns(rows), 'format': COLUMNAR})
+
+    def encode(self, data, accept_encoding=None):
+        """(body, headers) - gzipped when the body is large and the client accepts gzip"""
+        body = dumps(data)
+        encoded_size = len(body)
+        headers = [('Content-Type', 'application/json')]
+        compressed = False
+        if encoded_size >= self.gzip_min_bytes:
+            headers.append(('Vary', 'Accept-Encoding'))
+            if choose_encoding(accept_encoding, ('gzip',)) == 'gzip':
+                body = gzip.compress(body, self.gzip_level, mtime=0)
+                headers.append(('Content-Encoding', 'gzip'))
+                compressed = True
+        headers.append(('Content-Length', str(len(body))))
+        with self.lock:
+            self.counters['responses'] += 1
+            self.counters['gzipped'] += compressed
+            self.counters['bytes_encoded'] += encoded_size
+            self.counters['bytes_sent'] += len(body)
+        return body, headers
+
+    def send(self, handler, data, status=200, headers=()):
+        """Write data as the JSON response of a BaseHTTPRequestHandler"""
+        body, json_headers = self.encode(data, handler.headers.get('Accept-Encoding'))
+        handler.send_response(status)
+        for name, value in json_headers + list(headers):
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+        snapshot['backend'] = 'orjson' if orjson is not None else 'json'
+        snapshot['gzip_min_bytes'] = self.gzip_min_bytes
+        return snapshot
+
+
+# Process-wide responder shared by every handler in the process
+json_responses = JsonResponder()
@@ -0,0 +1,57 @@
+"""
+US equity market sessions in exchange (New York) time
+Weekends and the dates in MARKET_HOLIDAYS (comma-separated YYYY-MM-DD) are closed;
+there is no built-in holiday calendar
+"""
+
+import os
+from datetime import datetime, time, timedelta, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+    MARKET_TZ = ZoneInfo('America/New_York')
+except Exception:
+    # No tz database: EST all year, an hour off during daylight saving time
+    MARKET_TZ = timezone(timedelta(hours=-5), 'EST')
+
+PRE_MARKET_OPEN = time(4, 0)
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+AFTER_HOURS_CLOSE = time(20, 0)
+
+CLOSED = 'closed'
+PRE_MARKET = 'pre_market'
+REGULAR = 'regular'
+AFTER_HOURS = 'after_hours'
+
+HOLIDAYS = frozenset(day.strip() for day in os.environ.get('MARKET_HOLIDAYS', '').split(',') if day.strip())
+
+
+def market_now(now=None):
+    """Current (or given, naive = local) time in exchange time"""
+    return (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+
+
+def is_trading_day(now=None):
+    now = market_now(now)
+    return now.weekday() < 5 and now.date().isoformat() not in HOLIDAYS
+
+
+def session(now=None):
+    """'pre_market', 'regular', 'after_hours' or 'closed'"""
+    now = market_now(now)
+    if not is_trading_day(now):
+        return CLOSED
+    clock = now.time()
+    if clock < PRE_MARKET_OPEN or clock >= AFTER_HOURS_CLOSE:
+        return CLOSED
+    if clock < REGULAR_OPEN:
+        return PRE_MARKET
+    if clock < REGULAR_CLOSE:
+        return REGULAR
+    return AFTER_HOURS
+
+
+def is_extended_session(now=None):
+    """4 AM - 8 PM ET on trading days: the window the browser monitor used to poll in"""
+    return session(now) != CLOSED
@@ -0,0 +1,234 @@
+"""
+Shared Ortex fetch path
+Walks URL templates for a (ticker, data_type) in endpoint-memo order, skips templates whose
+circuit breaker is open, classifies each response and records which templates work, for both
+sync handlers and the async scan engine. Each (ticker, data_type) fetch is charged to the
+credit budget first; a refused one returns (BUDGET_EXHAUSTED, None) without a request
+"""
+
+import asyncio
+import functools
+import json
+import threading
+import time
+import urllib.parse
+
+from scanner_core.circuit_breaker import ortex_breakers
+from scanner_core.credit_budget import BUDGET_EXHAUSTED, credit_budget
+from scanner_core.endpoint_memo import endpoint_memo
+from scanner_core.http_client import http_client
+from scanner_core.scan_engine import scan_engine
+
+
+def ortex_headers(ortex_key, user_agent='Ultimate-Squeeze-Scanner/2.0'):
+    return {
+        'Ortex-Api-Key': ortex_key,
+        'User-Agent': user_agent,
+        'Accept': 'application/json'
+    }
+
+
+def classify_response(response):
+    """Return ('ok', data), ('dead', reason) for 404/HTML, or ('retry', reason) for transient failures"""
+    if response.status == 404:
+        return 'dead', '404'
+    if response.status != 200:
+        return 'retry', str(response.status)
+
+    content_type = response.headers.get('Content-Type', '')
+    text = response.body.decode('utf-8', errors='replace')
+    if 'text/html' in content_type or text.lstrip()[:15].lower().startswith(('<!doctype', '<html')):
+        return 'dead', 'html'
+    try:
+        return 'ok', json.loads(text)
+    except ValueError:
+        return 'dead', 'non_json'
+
+
+class OrtexClient:
+    """Memo-aware Ortex fetcher shared by every scanner variant"""
+
+    def __init__(self, memo=None, breakers=None):
+        self.memo = memo or endpoint_memo
+        self.breakers = breakers or ortex_breakers
+        self.lock = threading.Lock()
+        self.counters = {
+            'requests': 0,
+            'json_responses': 0,
+            'dead_responses': 0,
+            'transient_failures': 0,
+            'breaker_rejections': 0,
+            'budget_rejections': 0,
+            'abandoned_requests': 0
+        }
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def _plan(self, ticker, data_type, templates, timeout, deadline=None):
+        """Yield (template, url, timeout) in memo order for templates whose breaker allows a call"""
+        for template in self.memo.order(ticker, data_type, templates):
+            if deadline is not None and deadline.expired():
+                return
+            if not self.breakers.allow(template):
+                self._count('breaker_rejections')
+                continue
+            attempt_timeout = self.breakers.timeout_for(template, timeout)
+            if deadline is not None:
+                attempt_timeout = deadline.timeout(attempt_timeout)
+            yield template, template.format(ticker=ticker), attempt_timeout
+
+    def _handle(self, ticker, data_type, template, latency, response=None, error=None):
+        """Record one attempt in the memo and breaker; returns parsed JSON on success"""
+        self._count('requests')
+        if error is not None:
+            self._count('transient_failures')
+            self.breakers.record_failure(template)
+            return None
+
+        outcome, value = classify_response(response)
+        # 404s and auth/rate-limit answers still prove the endpoint is up; HTML and 5xx do not
+        endpoint_healthy = outcome == 'ok' or value == '404' or (outcome == 'retry' and response.status < 500)
+        if endpoint_healthy:
+            self.breakers.record_success(template, latency)
+        else:
+            self.breakers.record_failure(template)
+
+        if outcome == 'ok':
+            self._count('json_responses')
+            self.memo.record_success(ticker, data_type, template)
+            return value
+        if outcome == 'dead':
+            self._count('dead_responses')
+            self.memo.record_failure(ticker, data_type, template, value)
+        else:
+            self._count('transient_failures')
+        return None
+
+    def _charge(self, data_type, credit_context):
+        if credit_budget.acquire(data_type, context=credit_context):
+            return True
+        self._count('budget_rejections')
+        return False
+
+    @staticmethod
+    def _settle(data_type, data, credit_context):
+        credits_used = data.get('creditsUsed', 0) if isinstance(data, dict) else 0
+        credit_budget.settle(data_type, credits_used, context=credit_context)
+
+    def fetch_json(self, ticker, data_type, templates, headers, timeout=8, deadline=None):
+        """Sync: return (url, json) from the first working template, else (None, None)"""
+        credit_context = credit_budget.current()
+        if not self._charge(data_type, credit_context):
+            return BUDGET_EXHAUSTED, None
+        data = None
+        try:
+            for template, url, attempt_timeout in self._plan(ticker, data_type, templates, timeout, deadline):
+                started = time.monotonic()
+                try:
+                    response = http_client.get(url, headers, attempt_timeout)
+                except Exception as e:
+                    self._handle(ticker, data_type, template, time.monotonic() - started, error=e)
+                    continue
+                data = self._handle(ticker, data_type, template, time.monotonic() - started, response)
+                if data is not None:
+                    return url, data
+            return None, None
+        finally:
+            self._settle(data_type, data, credit_context)
+
+    def _start_attempt(self, url, headers, timeout):
+        """Engine task for one GET, plus abandon(): True (and the GET is never sent) if it hasn't started yet"""
+        state = {'started': False, 'abandoned': False}
+
+        def get():
+            with self.lock:
+                if state['abandoned']:
+                    return None
+                state['started'] = True
+            return http_client.get(url, headers, timeout)
+
+        def abandon():
+            with self.lock:
+                if not state['started']:
+                    state['abandoned'] = True
+                return state['abandoned']
+
+        host = urllib.parse.urlsplit(url).hostname
+        return asyncio.ensure_future(scan_engine.run_blocking(host, get)), abandon
+
+    def _finish_abandoned(self, ticker, data_type, template, started, credit_context, request):
+        """Done callback for a GET the deadline cut off mid-flight: record how it really ended, then settle"""
+        data = None
+        try:
+            if request.cancelled():
+                self.breakers.release(template)
+            elif request.exception() is not None:
+                self._handle(ticker, data_type, template, time.monotonic() - started, error=request.exception())
+            else:
+                data = self._handle(ticker, data_type, template, time.monotonic() - started, request.result())
+        finally:
+            self._settle(data_type, data, credit_context)
+
+    async def fetch_json_async(self, ticker, data_type, templates, headers, timeout=8, deadline=None,
+                               credit_context=None):
+        """Async variant over the scan engine's pooled executor (credit_context: the submitting thread's caller)"""
+        credit_context = credit_context or credit_budget.current()
+        if not self._charge(data_type, credit_context):
+            return BUDGET_EXHAUSTED, None
+        data = None
+        settled_later = False
+        try:
+            for template, url, attempt_timeout in self._plan(ticker, data_type, templates, timeout, deadline):
+                started = time.monotonic()
+                request, abandon = self._start_attempt(url, headers, attempt_timeout)
+                try:
+                    # Shielded so a deadline cancel doesn't orphan a GET already running on an executor thread
+                    response = await asyncio.shield(request)
+                except asyncio.CancelledError:
+                    self._count('abandoned_requests')
+                    if abandon():
+                        request.cancel()
+                        self.breakers.release(template)
+                    else:
+                        settled_later = True
+                        request.add_done_callback(functools.partial(
+                            self._finish_abandoned, ticker, data_type, template, started, credit_context))
+                    raise
+                except Exception as e:
+                    self._handle(ticker, data_type, template, time.monotonic() - started, error=e)
+                    continue
+                data = self._handle(ticker, data_type, template, time.monotonic() - started, response)
+                if data is not None:
+                    return url, data
+            return None, None
+        finally:
+            if not settled_later:
+                self._settle(data_type, data, credit_context)
+
+    def fetch_batch(self, requests, headers, timeout=8, batch_timeout=None, deadline=None):
+        """Fan out {key: (ticker, data_type, templates)} in one pass; returns {key: (url, json)} minus keys cut off by the deadline"""
+        # The engine's loop thread doesn't inherit this thread's credit caller - pass it along
+        credit_context = credit_budget.current()
+
+        async def runner():
+            return await scan_engine.gather_keyed({
+                key: self.fetch_json_async(ticker, data_type, templates, headers, timeout, deadline, credit_context)
+                for key, (ticker, data_type, templates) in requests.items()
+            }, deadline.remaining() if deadline is not None else None)
+
+        results = scan_engine.run(runner(), batch_timeout)
+        return {key: (value if isinstance(value, tuple) else (None, None)) for key, value in results.items()}
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        counters['endpoint_memo'] = self.memo.stats()
+        counters['circuit_breakers'] = self.breakers.stats()
+        counters['credit_budget'] = credit_budget.stats()
+        return counters
+
+
+# Process-wide Ortex client
+ortex_client = OrtexClient()
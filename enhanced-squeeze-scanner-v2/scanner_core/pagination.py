@@ -0,0 +1,260 @@
+"""
+Top-K selection and cursor pagination for scan results
+Scans hand their unsorted results to the pager, which filters server-side (min score,
+risk factors, category, data quality) and picks one page with a bounded heap, so
+payload and serialization scale with the page size rather than the universe. When
+more pages remain the results are kept briefly and the cursor resumes from them
+without rescanning
+"""
+
+import base64
+import heapq
+import json
+import os
+import threading
+import uuid
+
+from scanner_core.cache import TTLCache, estimate_size
+
+# No limit keeps the old "every result, best first" response
+DEFAULT_PAGE_LIMIT = int(os.environ.get('SCAN_PAGE_DEFAULT_LIMIT', 0))
+MAX_PAGE_LIMIT = int(os.environ.get('SCAN_PAGE_MAX_LIMIT', 1000))
+# How long a scan's results stay resumable by cursor
+RESULTS_TTL = int(os.environ.get('SCAN_RESULTS_TTL', 600))
+# Result filters; the only keys a cursor may carry back
+FILTER_PARAMS = ('min_score', 'risk_factors', 'category', 'data_quality')
+# Request parameters that only shape the page, never the scan behind it
+PAGE_PARAMS = ('limit', 'cursor') + FILTER_PARAMS
+
+
+class CursorExpired(LookupError):
+    """The scan a cursor points into is gone (expired or evicted) - rerun the scan"""
+
+
+def _as_list(value):
+    if value is None or value == '' or value == []:
+        return None
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    if isinstance(value, (list, tuple, set)):
+        return [str(item) for item in value]
+    raise ValueError(f"Expected a string or list, got {type(value).__name__}")
+
+
+class PageQuery:
+    """Validated limit, cursor and result filters for one page request"""
+
+    def __init__(self, limit=None, cursor=None, min_score=None, risk_factors=None, category=None, data_quality=None):
+        self.limit = limit
+        self.cursor = cursor
+        self.min_score = min_score
+        self.risk_factors = risk_factors
+        self.category = category
+        self.data_quality = data_quality
+
+    @classmethod
+    def from_params(cls, params):
+        """Parse request params; raises ValueError with a client-facing message"""
+        params = params or {}
+        limit = params.get('limit', DEFAULT_PAGE_LIMIT)
+        try:
+            limit = int(limit) if limit not in (None, '') else 0
+        except (TypeError, ValueError):
+            raise ValueError(f"limit must be an integer, got {limit!r}")
+        if limit < 0 or limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 0 and {MAX_PAGE_LIMIT}")
+
+        min_score = params.get('min_score')
+        if min_score not in (None, ''):
+            try:
+                min_score = float(min_score)
+            except (TypeError, ValueError):
+                raise ValueError(f"min_score must be a number, got {min_score!r}")
+        else:
+            min_score = None
+
+        cursor = params.get('cursor') or None
+        if cursor is not None and not isinstance(cursor, str):
+            raise ValueError('cursor must be the string returned as page.next_cursor')
+
+        return cls(
+            limit=limit or None,
+            cursor=cursor,
+            min_score=min_score,
+            risk_factors=_as_list(params.get('risk_factors')),
+            category=_as_list(params.get('category')),
+            data_quality=_as_list(params.get('data_quality'))
+        )
+
+    def filters(self):
+        return {
+            'min_score': self.min_score,
+            'risk_factors': self.risk_factors,
+            'category': self.category,
+            'data_quality': self.data_quality
+        }
+
+    def matcher(self, categories=None):
+        """Predicate over one result dict; None when no filter is set"""
+        min_score = self.min_score
+        risk_factors = set(self.risk_factors) if self.risk_factors else None
+        wanted_categories = set(self.category) if self.category else None
+        data_quality = set(self.data_quality) if self.data_quality else None
+        if min_score is None and not risk_factors and not wanted_categories and not data_quality:
+            return None
+
+        category_tickers = None
+        if wanted_categories and categories:
+            category_tickers = set()
+            for name in wanted_categories:
+                category_tickers.update(categories.get(name, []))
+
+        def matches(result):
+            if min_score is not None and result.get('squeeze_score', 0) < min_score:
+                return False
+            # Any of the requested risk factors
+            if risk_factors and risk_factors.isdisjoint(result.get('risk_factors') or ()):
+                return False
+            if wanted_categories:
+                if 'category' in result:
+                    if result['category'] not in wanted_categories:
+                        return False
+                elif category_tickers is None or result.get('ticker') not in category_tickers:
+                    return False
+            if data_quality and (result.get('data_quality') or result.get('data_source')) not in data_quality:
+                return False
+            return True
+        return matches
+
+
+def encode_cursor(scan_id, after, query):
+    payload = {'scan': scan_id, 'after': list(after), 'limit': query.limit, 'filters': query.filters()}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(scan id, after key, limit, filters); raises ValueError for anything encode_cursor would not produce"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        scan_id, after = payload['scan'], tuple(payload['after'])
+        limit, filters = payload.get('limit'), payload.get('filters') or {}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError('Invalid cursor')
+    # The cursor is client input: every field is checked before it reaches the pager
+    if not isinstance(scan_id, str) or len(after) != 2:
+        raise ValueError('Invalid cursor')
+    if any(isinstance(value, bool) or not isinstance(value, (int, float)) for value in after):
+        raise ValueError('Invalid cursor')
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)):
+        raise ValueError('Invalid cursor')
+    if not isinstance(filters, dict) or not set(filters) <= set(FILTER_PARAMS):
+        raise ValueError('Invalid cursor')
+    return scan_id, after, limit, filters
+
+
+def select_page(results, query, categories=None, after=None):
+    """(page, matched count, last key) - best-first top-K via a heap of size limit + 1"""
+    matches = query.matcher(categories)
+    # Key (-score, position): best first, ties keep scan order - the same order the old full sort gave
+    if matches is None and after is None:
+        keys = [(-result.get('squeeze_score', 0), position) for position, result in enumerate(results)]
+        matched = len(keys)
+    else:
+        matched = 0
+        keys = []
+        for position, result in enumerate(results):
+            if matches is not None and not matches(result):
+                continue
+            matched += 1
+            key = (-result.get('squeeze_score', 0), position)
+            if after is None or key > after:
+                keys.append(key)
+
+    if query.limit is None:
+        keys.sort()
+        top = keys
+    else:
+        top = heapq.nsmallest(query.limit + 1, keys)
+    page_keys = top if query.limit is None else top[:query.limit]
+    has_more = query.limit is not None and len(top) > query.limit
+    return [results[position] for _, position in page_keys], matched, (page_keys[-1] if has_more else None)
+
+
+class ResultPager:
+    """Pages scan results and keeps multi-page scans resumable by cursor for RESULTS_TTL seconds"""
+
+    def __init__(self, ttl=None, max_scans=None):
+        self.ttl = RESULTS_TTL if ttl is None else ttl
+        self.scans = TTLCache(max_entries=max_scans or 64, default_ttl=self.ttl)
+        self.lock = threading.Lock()
+        self.counters = {
+            'pages': 0,
+            'resumed_pages': 0,
+            'stored_scans': 0,
+            'expired_cursors': 0,
+            'rows_returned': 0,
+            'rows_considered': 0
+        }
+
+    def query(self, params):
+        return PageQuery.from_params(params)
+
+    def paginate(self, query, results, scan_stats=None, categories=None):
+        """First page of a fresh scan: (page, page_info); stores the scan when more pages remain"""
+        page, matched, last_key = select_page(results, query, categories)
+        scan_id = None
+        if last_key is not None:
+            scan_id = uuid.uuid4().hex
+            # Walking every row for the byte estimate would cost more than the page itself; extrapolate
+            sample = results[:16]
+            size = estimate_size(sample) * len(results) // len(sample) + estimate_size(scan_stats)
+            self.scans.set(scan_id, {'results': results, 'scan_stats': scan_stats, 'categories': categories}, size=size)
+            with self.lock:
+                self.counters['stored_scans'] += 1
+        return page, self._page_info(query, page, matched, len(results), scan_id, last_key, resumed=False)
+
+    def resume(self, query):
+        """Next page from a stored scan: (page, page_info, scan_stats); raises CursorExpired"""
+        scan_id, after, limit, filters = decode_cursor(query.cursor)
+        entry = self.scans.get(scan_id)
+        if entry is None:
+            with self.lock:
+                self.counters['expired_cursors'] += 1
+            raise CursorExpired('Cursor expired - rerun the scan')
+        # Filters travel with the cursor; the request may only change the page size. They go
+        # through the same validation as request params, so a tampered cursor is a 400 too
+        resumed = PageQuery.from_params(dict(filters, limit=query.limit or limit, cursor=query.cursor))
+        results = entry['results']
+        page, matched, last_key = select_page(results, resumed, entry['categories'], after)
+        page_info = self._page_info(resumed, page, matched, len(results), scan_id if last_key else None,
+                                    last_key, resumed=True)
+        return page, page_info, entry['scan_stats']
+
+    def _page_info(self, query, page, matched, total, scan_id, last_key, resumed):
+        with self.lock:
+            self.counters['pages'] += 1
+            self.counters['resumed_pages'] += 1 if resumed else 0
+            self.counters['rows_returned'] += len(page)
+            self.counters['rows_considered'] += total
+        return {
+            'limit': query.limit,
+            'returned': len(page),
+            'total_matched': matched,
+            'total_results': total,
+            'has_more': last_key is not None,
+            'next_cursor': encode_cursor(scan_id, last_key, query) if last_key is not None else None,
+            'filters': {name: value for name, value in query.filters().items() if value is not None}
+        }
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+        snapshot['resumable_scans'] = len(self.scans)
+        snapshot['results_ttl'] = self.ttl
+        snapshot['max_page_limit'] = MAX_PAGE_LIMIT
+        return snapshot
+
+
+# Process-wide pager shared by the scan routes
+result_pager = ResultPager()
@@ -0,0 +1,245 @@
+"""
+Market-hours-aware cache pre-warming
+A background scheduler runs on cron-style rules evaluated in New York time (trading days
+only) and pushes the registered ticker sources - universe categories, watchlists - through
+the server's warm function in small, spaced batches, highest previously seen scores first,
+so the first scan after the open finds Ortex data already cached. Warming without an
+Ortex key would fill nothing, so such runs are recorded as skipped (no_ortex_key) instead
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from scanner_core.market_hours import is_trading_day, market_now, session
+
+# ';'-separated "minute hour day-of-month month day-of-week" rules (ET, 0 = Sunday):
+# half-hourly from pre-market to the close, plus a final pass just before the open
+DEFAULT_SCHEDULE = '*/30 4-15 * * 1-5; 25 9 * * 1-5'
+SCHEDULE = os.environ.get('PREWARM_SCHEDULE', DEFAULT_SCHEDULE)
+BATCH_SIZE = int(os.environ.get('PREWARM_BATCH_SIZE', 10))
+# Pause between batches so a warm pass never bursts past upstream rate limits
+BATCH_INTERVAL = float(os.environ.get('PREWARM_BATCH_INTERVAL', 2.0))
+MAX_TICKERS = int(os.environ.get('PREWARM_MAX_TICKERS', 300))
+RUN_HISTORY = 20
+
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+def _cron_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        part, _, step = part.partition('/')
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-'))
+        else:
+            start = end = int(part)
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field '{text}' outside {low}-{high}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return frozenset(values)
+
+
+def parse_schedule(spec):
+    """List of (minutes, hours, days, months, weekdays) sets; raises ValueError on a bad rule"""
+    rules = []
+    for rule in spec.split(';'):
+        fields = rule.split()
+        if not fields:
+            continue
+        if len(fields) != 5:
+            raise ValueError(f"Cron rule '{rule.strip()}' needs 5 fields")
+        rules.append(tuple(_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)))
+    if not rules:
+        raise ValueError('Prewarm schedule has no rules')
+    return rules
+
+
+def matches(rules, moment):
+    weekday = (moment.weekday() + 1) % 7
+    return any(
+        moment.minute in minutes and moment.hour in hours and moment.day in days
+        and moment.month in months and weekday in weekdays
+        for minutes, hours, days, months, weekdays in rules
+    )
+
+
+def next_run(rules, after=None, horizon_days=8):
+    """Next minute (ET) a rule matches on a trading day, or None within the horizon"""
+    moment = market_now(after).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(horizon_days * 24 * 60):
+        if matches(rules, moment) and is_trading_day(moment):
+            return moment
+        moment += timedelta(minutes=1)
+    return None
+
+
+class PrewarmScheduler:
+    """Cron-driven warm passes over registered ticker sources, prioritised by last known score"""
+
+    def __init__(self, schedule=None, batch_size=None, batch_interval=None, max_tickers=None):
+        self.schedule = schedule or SCHEDULE
+        self.rules = parse_schedule(self.schedule)
+        self.batch_size = batch_size or BATCH_SIZE
+        self.batch_interval = BATCH_INTERVAL if batch_interval is None else batch_interval
+        self.max_tickers = max_tickers or MAX_TICKERS
+        self.sources = {}
+        self.warmer = None
+        self.key_func = None
+        # Latest score per ticker from warm passes and interactive scans
+        self.last_scores = {}
+        self.runs = deque(maxlen=RUN_HISTORY)
+        self.thread = None
+        self.wake = threading.Event()
+        self.manual = threading.Event()
+        self.run_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.next_run_at = None
+        self.counters = {
+            'runs': 0,
+            'manual_runs': 0,
+            'tickers_warmed': 0,
+            'batches': 0,
+            'batch_errors': 0,
+            'skipped_overlaps': 0,
+            'skipped_no_key': 0
+        }
+
+    def add_source(self, name, tickers_func):
+        """tickers_func() -> iterable of tickers to keep warm"""
+        self.sources[name] = tickers_func
+
+    def set_warmer(self, warmer, key_func):
+        """warmer(tickers, ortex_key) -> {ticker: score}, key_func() -> Ortex key or None; starts the scheduler thread"""
+        self.warmer = warmer
+        self.key_func = key_func
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._loop, name='prewarm-scheduler', daemon=True)
+                self.thread.start()
+
+    def record_scores(self, results):
+        """Feed scan results in so the next pass warms the hottest tickers first"""
+        with self.lock:
+            for result in results:
+                if 'ticker' in result and 'squeeze_score' in result:
+                    self.last_scores[result['ticker']] = result['squeeze_score']
+
+    def plan(self):
+        """Tickers for one pass: every source, deduped, best previous score first, capped at max_tickers"""
+        tickers, origins = [], {}
+        for name, tickers_func in self.sources.items():
+            try:
+                source_tickers = list(tickers_func())
+            except Exception as e:
+                print(f"⚠️ Prewarm source {name} failed: {e}")
+                continue
+            for ticker in source_tickers:
+                if ticker not in origins:
+                    origins[ticker] = name
+                    tickers.append(ticker)
+        with self.lock:
+            scores = dict(self.last_scores)
+        # Stable sort: unscored tickers keep source order behind the scored ones
+        tickers.sort(key=lambda ticker: -scores.get(ticker, -1))
+        return tickers[:self.max_tickers]
+
+    def trigger(self):
+        """Start a pass now (in the scheduler thread)"""
+        self.manual.set()
+        self.wake.set()
+
+    def _loop(self):
+        while True:
+            self.next_run_at = next_run(self.rules)
+            delay = (self.next_run_at - market_now()).total_seconds() if self.next_run_at else 3600
+            self.wake.wait(max(0.0, delay))
+            self.wake.clear()
+            manual = self.manual.is_set()
+            self.manual.clear()
+            if manual or (self.next_run_at is not None and market_now() >= self.next_run_at):
+                try:
+                    self.run_once('manual' if manual else 'schedule')
+                except Exception as e:
+                    print(f"⚠️ Prewarm run failed: {e}")
+
+    def run_once(self, trigger='manual'):
+        """One warm pass over plan(), batch by batch; returns the run record"""
+        if self.warmer is None:
+            return None
+        if not self.run_lock.acquire(blocking=False):
+            with self.lock:
+                self.counters['skipped_overlaps'] += 1
+            return None
+        try:
+            ortex_key = self.key_func()
+            tickers = self.plan()
+            started = time.monotonic()
+            run = {
+                'trigger': trigger,
+                'session': session(),
+                'started_at': datetime.now().isoformat(),
+                'tickers': len(tickers),
+                'batches': 0,
+                'warmed': 0,
+                'errors': 0
+            }
+            if not ortex_key:
+                run['skipped'] = 'no_ortex_key'
+                run['finished_at'] = run['started_at']
+                with self.lock:
+                    self.runs.append(run)
+                    self.counters['skipped_no_key'] += 1
+                print(f"⚠️ Prewarm ({trigger}) skipped: no Ortex API key to warm the cache with")
+                return run
+            for index in range(0, len(tickers), self.batch_size):
+                if index and self.batch_interval:
+                    time.sleep(self.batch_interval)
+                batch = tickers[index:index + self.batch_size]
+                run['batches'] += 1
+                try:
+                    scores = self.warmer(batch, ortex_key)
+                except Exception as e:
+                    run['errors'] += 1
+                    run['last_error'] = str(e)
+                    continue
+                run['warmed'] += len(scores)
+                with self.lock:
+                    self.last_scores.update(scores)
+            run['duration_seconds'] = round(time.monotonic() - started, 2)
+            run['finished_at'] = datetime.now().isoformat()
+            with self.lock:
+                self.runs.append(run)
+                self.counters['runs'] += 1
+                self.counters['manual_runs'] += 1 if trigger == 'manual' else 0
+                self.counters['tickers_warmed'] += run['warmed']
+                self.counters['batches'] += run['batches']
+                self.counters['batch_errors'] += run['errors']
+            print(f"🔥 Prewarm ({trigger}): {run['warmed']}/{run['tickers']} tickers in {run['duration_seconds']}s")
+            return run
+        finally:
+            self.run_lock.release()
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['recent_runs'] = list(self.runs)
+            snapshot['scored_tickers'] = len(self.last_scores)
+        snapshot['schedule'] = self.schedule
+        snapshot['next_run'] = self.next_run_at.isoformat() if self.next_run_at else None
+        snapshot['running'] = self.run_lock.locked()
+        snapshot['sources'] = list(self.sources)
+        snapshot['batch_size'] = self.batch_size
+        snapshot['batch_interval'] = self.batch_interval
+        snapshot['max_tickers'] = self.max_tickers
+        snapshot['scheduler_running'] = bool(self.thread and self.thread.is_alive())
+        snapshot['status'] = 'ok' if self.key_func and self.key_func() else 'no_ortex_key'
+        return snapshot
+
+
+# Process-wide scheduler; the server registers its sources and warm function
+prewarm_scheduler = PrewarmScheduler()
@@ -0,0 +1,188 @@
+"""
+Asyncio scan engine shared by the Flask scanners
+Fans out every (ticker, data_type, endpoint) request over one background event loop
+with a global concurrency limit and per-host semaphores
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import urllib.parse
+
+from scanner_core.http_client import http_client
+
+
+class AsyncScanEngine:
+    """Single event loop driving pooled HTTP fetches for whole scans at once"""
+
+    def __init__(self, max_concurrency=None, per_host_limit=None):
+        self.max_concurrency = max_concurrency or int(os.environ.get('SCAN_MAX_CONCURRENCY', 32))
+        self.per_host_limit = per_host_limit or int(os.environ.get('SCAN_PER_HOST_LIMIT', 8))
+
+        # One long-lived I/O pool sized to the global limit - no per-scan thread churn
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix='scan-io'
+        )
+        self.loop = None
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.global_semaphore = None
+        self.host_semaphores = {}
+        self.stats_lock = threading.Lock()
+        self.counters = {
+            'batches': 0,
+            'requests': 0,
+            'failed_requests': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'deadline_cutoffs': 0,
+            'batch_timeouts': 0,
+            'abandoned_calls': 0,
+            'abandoned_in_flight': 0
+        }
+
+    def _ensure_loop(self):
+        """Start the background event loop thread on first use"""
+        if self.loop is not None:
+            return self.loop
+        with self.start_lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=loop.run_forever, name='scan-engine-loop', daemon=True)
+                self.thread.start()
+                self.loop = loop
+        return self.loop
+
+    def _host_semaphore(self, host):
+        # Only ever touched from the loop thread, so no locking needed
+        semaphore = self.host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self.host_semaphores[host] = semaphore
+        return semaphore
+
+    def _track(self, delta):
+        with self.stats_lock:
+            self.counters['in_flight'] += delta
+            if delta > 0:
+                self.counters['requests'] += 1
+                self.counters['peak_in_flight'] = max(self.counters['peak_in_flight'], self.counters['in_flight'])
+
+    def _abandon(self, delta):
+        with self.stats_lock:
+            self.counters['abandoned_in_flight'] += delta
+            if delta > 0:
+                self.counters['abandoned_calls'] += 1
+
+    async def run_blocking(self, host, func, *args):
+        """Run a blocking call on the I/O pool under the global and per-host limits"""
+        if self.global_semaphore is None:
+            self.global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        global_semaphore = self.global_semaphore
+        host_semaphore = self._host_semaphore(host)
+        await global_semaphore.acquire()
+        try:
+            await host_semaphore.acquire()
+        except BaseException:
+            global_semaphore.release()
+            raise
+        self._track(1)
+        call = asyncio.get_running_loop().run_in_executor(self.executor, lambda: func(*args))
+
+        def finished(call):
+            # Slots are held until the thread is free: cancelling a caller can't stop a blocking call
+            # already running, so abandoned calls keep counting against the limits instead of letting
+            # new work pile up behind them in the pool's queue
+            self._track(-1)
+            host_semaphore.release()
+            global_semaphore.release()
+            if not call.cancelled():
+                call.exception()
+        call.add_done_callback(finished)
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            if not call.done():
+                self._abandon(1)
+                call.add_done_callback(lambda _: self._abandon(-1))
+            raise
+
+    async def fetch(self, url, headers=None, timeout=8):
+        """Fetch one URL through the pooled client"""
+        host = urllib.parse.urlsplit(url).hostname
+        return await self.run_blocking(host, http_client.get, url, headers, timeout)
+
+    async def fetch_first_json(self, urls, headers=None, timeout=8):
+        """Walk fallback URLs in order and return (url, json) for the first JSON 200, else (None, None)"""
+        for url in urls:
+            try:
+                response = await self.fetch(url, headers, timeout)
+                if response.status == 200 and 'application/json' in response.headers.get('Content-Type', ''):
+                    return url, json.loads(response.body.decode('utf-8'))
+            except Exception:
+                with self.stats_lock:
+                    self.counters['failed_requests'] += 1
+        return None, None
+
+    async def gather_keyed(self, coroutines, budget=None):
+        """Await {key: coroutine}; with a budget, keys still running when it expires are left out"""
+        if budget is None:
+            keys = list(coroutines.keys())
+            results = await asyncio.gather(*coroutines.values(), return_exceptions=True)
+            return dict(zip(keys, results))
+
+        tasks = {asyncio.ensure_future(coroutine): key for key, coroutine in coroutines.items()}
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            task.cancel()
+        with self.stats_lock:
+            self.counters['deadline_cutoffs'] += len(pending)
+        return {tasks[task]: (task.exception() or task.result()) for task in done}
+
+    def run(self, coroutine, timeout=None):
+        """Sync wrapper: run a coroutine on the engine loop from a Flask/worker thread"""
+        loop = self._ensure_loop()
+        with self.stats_lock:
+            self.counters['batches'] += 1
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Don't leave the batch running on the loop after the caller has given up on it
+            future.cancel()
+            with self.stats_lock:
+                self.counters['batch_timeouts'] += 1
+            raise
+
+    def map_blocking(self, calls, timeout=None, budget=None):
+        """Run {key: (host, func, args)} concurrently; errors come back as values, calls past the budget are omitted"""
+        async def runner():
+            return await self.gather_keyed({
+                key: self.run_blocking(host, func, *args) for key, (host, func, args) in calls.items()
+            }, budget)
+        return self.run(runner(), timeout)
+
+    def fetch_json_batch(self, url_lists, headers=None, timeout=8, batch_timeout=None, budget=None):
+        """Fan out {key: [fallback urls]} in one pass; returns {key: (url, json)}"""
+        async def runner():
+            return await self.gather_keyed({
+                key: self.fetch_first_json(urls, headers, timeout) for key, urls in url_lists.items()
+            }, budget)
+        results = self.run(runner(), batch_timeout)
+        return {key: (value if isinstance(value, tuple) else (None, None)) for key, value in results.items()}
+
+    def stats(self):
+        with self.stats_lock:
+            counters = dict(self.counters)
+        counters['max_concurrency'] = self.max_concurrency
+        counters['per_host_limit'] = self.per_host_limit
+        counters['loop_running'] = bool(self.loop and self.loop.is_running())
+        return counters
+
+
+# Process-wide engine shared by all routes
+scan_engine = AsyncScanEngine()
@@ -0,0 +1,314 @@
+"""
+Background scan jobs
+POST a scan, get a job ID back immediately and poll it: worker threads run the scan,
+each scored ticker lands in the job's partial results, and finished jobs are kept for
+SCAN_JOB_TTL seconds. Queue depth is bounded, queued or running jobs can be cancelled,
+and with SCAN_JOB_DB set jobs are written through to SQLite so a restart re-runs the
+ones it had accepted and still serves the finished ones
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+JOB_WORKERS = int(os.environ.get('SCAN_JOB_WORKERS', 2))
+MAX_QUEUED_JOBS = int(os.environ.get('SCAN_JOB_QUEUE_DEPTH', 16))
+# How long a finished job (result, error or cancellation) stays pollable
+JOB_TTL = int(os.environ.get('SCAN_JOB_TTL', 3600))
+# SQLite file for jobs that survive restarts; unset keeps jobs in memory only
+JOB_DB_PATH = os.environ.get('SCAN_JOB_DB') or None
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobQueueFull(RuntimeError):
+    """Too many jobs waiting - retry later"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running scan once its job has been cancelled"""
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class SQLiteJobStore:
+    """Write-through job records (the queue strips partial results and secrets before saving)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS scan_jobs ('
+                'id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, '
+                'created_at REAL NOT NULL, expires_at REAL, record TEXT NOT NULL)'
+            )
+
+    def load_all(self, now):
+        """Every unexpired job, oldest first; expired rows are dropped on the way"""
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM scan_jobs WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+            rows = self.connection.execute('SELECT record FROM scan_jobs ORDER BY created_at').fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def save(self, record):
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO scan_jobs (id, kind, status, created_at, expires_at, record) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (record['id'], record['kind'], record['status'], record['created_at'], record['expires_at'],
+                 json.dumps(record))
+            )
+
+    def delete(self, job_ids):
+        with self.lock, self.connection:
+            self.connection.executemany('DELETE FROM scan_jobs WHERE id = ?', [(job_id,) for job_id in job_ids])
+
+
+class JobContext:
+    """What a runner sees of its job: progress, partial results and the cancel flag"""
+
+    def __init__(self, jobs, job):
+        self.jobs = jobs
+        self.job = job
+        self.secrets = job.get('secrets') or {}
+
+    def set_total(self, total):
+        with self.jobs.lock:
+            self.job['progress']['total'] = total
+
+    def cancelled(self):
+        return self.job['cancel_requested']
+
+    def add_result(self, result):
+        """on_result callback for the scan; raises JobCancelled so a cancelled scan stops at its next result"""
+        if self.job['cancel_requested']:
+            raise JobCancelled()
+        with self.jobs.lock:
+            self.job['partial_results'].append(result)
+            self.job['progress']['completed'] += 1
+
+
+class ScanJobQueue:
+    """Bounded FIFO of scan jobs drained by a small pool of worker threads"""
+
+    def __init__(self, workers=None, max_queued=None, ttl=None, db_path=None):
+        self.workers = workers or JOB_WORKERS
+        self.max_queued = max_queued or MAX_QUEUED_JOBS
+        self.ttl = JOB_TTL if ttl is None else ttl
+        self.queue = queue.Queue()
+        self.runners = {}
+        self.threads = []
+        self.lock = threading.Lock()
+        self.counters = {
+            'submitted': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'recovered': 0,
+            'expired': 0
+        }
+        self.store = SQLiteJobStore(db_path) if db_path else None
+        # job id -> record; in SQLite mode seeded with what the last process left behind
+        self.jobs = {}
+        # Unfinished jobs loaded from the store, waiting for their kind's runner to be registered
+        self.orphans = set()
+        if self.store is not None:
+            for job in self.store.load_all(time.time()):
+                job['partial_results'] = []
+                self.jobs[job['id']] = job
+                if job['status'] in (QUEUED, RUNNING):
+                    self.orphans.add(job['id'])
+
+    def register(self, kind, runner):
+        """Install runner(params, context) -> result for a job kind and requeue its unfinished jobs"""
+        self.runners[kind] = runner
+        with self.lock:
+            # Accepted by a previous process but never finished - scans are idempotent, so run them again
+            recovered = sorted((self.jobs[job_id] for job_id in self.orphans
+                                if job_id in self.jobs and self.jobs[job_id]['kind'] == kind),
+                               key=lambda job: job['created_at'])
+            for job in recovered:
+                self.orphans.discard(job['id'])
+                job.update(status=QUEUED, started_at=None, recovered=True)
+                job['progress']['completed'] = 0
+                self.counters['recovered'] += 1
+        for job in recovered:
+            self._persist(job)
+            self.queue.put(job['id'])
+        if recovered:
+            self._ensure_workers()
+
+    def _ensure_workers(self):
+        with self.lock:
+            self.threads = [thread for thread in self.threads if thread.is_alive()]
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"scan-job-{len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def _persist(self, job):
+        if self.store is None:
+            return
+        # Snapshot under the lock - a worker may be updating progress while this is written
+        with self.lock:
+            record = {key: value for key, value in job.items() if key not in ('partial_results', 'secrets')}
+            record['progress'] = dict(job['progress'])
+        self.store.save(record)
+
+    def _sweep(self, now):
+        # Caller holds self.lock
+        expired = [job_id for job_id, job in self.jobs.items() if job['expires_at'] and job['expires_at'] <= now]
+        for job_id in expired:
+            del self.jobs[job_id]
+        self.counters['expired'] += len(expired)
+        return expired
+
+    def submit(self, kind, params, secrets=None):
+        """Queue a job and return its view; raises JobQueueFull past the depth bound"""
+        if kind not in self.runners:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        now = time.time()
+        with self.lock:
+            expired = self._sweep(now)
+            waiting = sum(1 for job in self.jobs.values() if job['status'] == QUEUED)
+            if waiting >= self.max_queued:
+                self.counters['rejected'] += 1
+                raise JobQueueFull(f"Scan queue is full ({waiting} jobs waiting) - retry later")
+            job = {
+                'id': uuid.uuid4().hex,
+                'kind': kind,
+                'params': params,
+                'secrets': secrets or {},
+                'status': QUEUED,
+                'created_at': now,
+                'started_at': None,
+                'finished_at': None,
+                'expires_at': None,
+                'cancel_requested': False,
+                'progress': {'completed': 0, 'total': None},
+                'partial_results': [],
+                'result': None,
+                'error': None
+            }
+            self.jobs[job['id']] = job
+            self.counters['submitted'] += 1
+        if expired and self.store is not None:
+            self.store.delete(expired)
+        self._persist(job)
+        self.queue.put(job['id'])
+        self._ensure_workers()
+        return self.view(job)
+
+    def get(self, job_id, since=0):
+        """Job view with partial results from index `since` on, or None if unknown or expired"""
+        with self.lock:
+            self._sweep(time.time())
+            job = self.jobs.get(job_id)
+            return self.view(job, since) if job is not None else None
+
+    def cancel(self, job_id):
+        """Cancel a queued job now or ask a running one to stop; finished jobs are left as they are"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == QUEUED:
+                self._finish(job, CANCELLED)
+            elif job['status'] == RUNNING:
+                job['cancel_requested'] = True
+        self._persist(job)
+        return self.get(job_id)
+
+    def _finish(self, job, status, result=None, error=None):
+        # Caller holds self.lock
+        now = time.time()
+        job.update(status=status, result=result, error=error, finished_at=now, expires_at=now + self.ttl)
+        if status == COMPLETED:
+            # The final result carries every row; drop the duplicate partial list
+            job['partial_results'] = []
+            job['progress']['total'] = job['progress']['total'] or job['progress']['completed']
+        job['secrets'] = {}
+        self.counters[status] += 1
+
+    def _work(self):
+        while True:
+            job_id = self.queue.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None or job['status'] != QUEUED:
+                    continue
+                job.update(status=RUNNING, started_at=time.time())
+            self._persist(job)
+            self._run(job)
+
+    def _run(self, job):
+        context = JobContext(self, job)
+        try:
+            result = self.runners[job['kind']](job['params'], context)
+            outcome = (COMPLETED, result, None)
+        except JobCancelled:
+            outcome = (CANCELLED, None, None)
+        except Exception as e:
+            outcome = (FAILED, None, str(e))
+        with self.lock:
+            self._finish(job, *outcome)
+        self._persist(job)
+        print(f"📋 Scan job {job['id'][:8]} {job['status']}")
+
+    def view(self, job, since=0):
+        """Client-facing job state (no secrets); partial results only until the job completes"""
+        progress = dict(job['progress'])
+        if progress['total']:
+            progress['percent'] = round(progress['completed'] / progress['total'] * 100, 1)
+        view = {
+            'job_id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'cancel_requested': job['cancel_requested'],
+            'progress': progress,
+            'created_at': _iso(job['created_at']),
+            'started_at': _iso(job['started_at']),
+            'finished_at': _iso(job['finished_at']),
+            'expires_at': _iso(job['expires_at']),
+            'recovered': job.get('recovered', False)
+        }
+        if job['status'] == COMPLETED:
+            view['result'] = job['result']
+        else:
+            view['partial_results'] = job['partial_results'][since:]
+            view['next_since'] = len(job['partial_results'])
+        if job['error']:
+            view['error'] = job['error']
+        return view
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            statuses = [job['status'] for job in self.jobs.values()]
+        for status in (QUEUED, RUNNING) + FINISHED:
+            snapshot[f"{status}_jobs"] = statuses.count(status)
+        snapshot['workers'] = self.workers
+        snapshot['max_queued'] = self.max_queued
+        snapshot['job_ttl'] = self.ttl
+        snapshot['persistence'] = 'sqlite' if self.store is not None else 'memory'
+        return snapshot
+
+
+# Process-wide job queue; runners are registered by the scanner that owns the job kind
+scan_jobs = ScanJobQueue(db_path=JOB_DB_PATH)
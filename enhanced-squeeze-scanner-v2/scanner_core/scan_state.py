@@ -0,0 +1,166 @@
+"""
+Process-wide state for the BaseHTTPRequestHandler scanners
+The handler is instantiated per request, so anything it learns on self is gone when the
+request ends. One ScannerState per scanner module holds what should outlive a request:
+recent scans keyed by their filter set (an identical scan within SCAN_REUSE_SECONDS is
+served from memory and identical concurrent scans share one run), an EWMA of seconds per
+ticker that sizes scans, and the last scan time. With SCANNER_STATE_DIR set it is written
+to disk so warm serverless instances and restarts start from what the last process learned
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from scanner_core.cache import TTLCache
+from scanner_core.single_flight import SingleFlight
+
+SCAN_REUSE_SECONDS = int(os.environ.get('SCAN_REUSE_SECONDS', 60))
+# Weight of the newest scan in the seconds-per-ticker average
+LATENCY_EWMA_ALPHA = float(os.environ.get('SCAN_LATENCY_EWMA_ALPHA', 0.3))
+# Directory for <scanner>_state.json; unset keeps state in memory only
+STATE_DIR = os.environ.get('SCANNER_STATE_DIR') or None
+MAX_REUSED_SCANS = 32
+# Floor for the per-ticker estimate - a fully cached scan can finish in ~0s
+MIN_TICKER_TIME = 0.01
+
+
+def scan_signature(filters, ortex_key=None, ignore=()):
+    """Stable key for a scan: the filters that shape it plus which Ortex key (hashed) it ran with"""
+    shaping = {key: value for key, value in (filters or {}).items() if key not in ignore}
+    key_hash = hashlib.sha256(ortex_key.encode()).hexdigest()[:12] if ortex_key else None
+    return json.dumps([shaping, key_hash], sort_keys=True, default=str)
+
+
+class ScannerState:
+    """Results reuse, latency model and last-scan bookkeeping shared by one scanner's handlers"""
+
+    def __init__(self, name, default_ticker_time=2.5, reuse_seconds=None, alpha=None, state_dir=STATE_DIR):
+        self.name = name
+        self.reuse_seconds = SCAN_REUSE_SECONDS if reuse_seconds is None else reuse_seconds
+        self.alpha = alpha or LATENCY_EWMA_ALPHA
+        self.path = os.path.join(state_dir, f"{name}_state.json") if state_dir else None
+        self.lock = threading.Lock()
+        self.flight = SingleFlight(f"{name}_scans")
+        # signature -> (scan_results, finished_at wall clock)
+        self.scans = TTLCache(max_entries=MAX_REUSED_SCANS, default_ttl=self.reuse_seconds)
+        self.ticker_time = default_ticker_time
+        self.latency_samples = 0
+        self.last_scan_time = None
+        self.counters = {
+            'scans_recorded': 0,
+            'reuse_hits': 0,
+            'reuse_misses': 0,
+            'coalesced_scans': 0,
+            'restored_scans': 0,
+            'save_errors': 0
+        }
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable scanner state {self.path}: {e}")
+            return
+        self.ticker_time = saved.get('ticker_time', self.ticker_time)
+        self.latency_samples = saved.get('latency_samples', 0)
+        self.last_scan_time = saved.get('last_scan_time')
+        now = time.time()
+        for signature, (scan_results, finished_at) in saved.get('scans', {}).items():
+            remaining = finished_at + self.reuse_seconds - now
+            if remaining > 0:
+                self.scans.set(signature, (scan_results, finished_at), remaining)
+                self.counters['restored_scans'] += 1
+
+    def _save(self):
+        if not self.path:
+            return
+        with self.lock:
+            snapshot = {
+                'ticker_time': self.ticker_time,
+                'latency_samples': self.latency_samples,
+                'last_scan_time': self.last_scan_time,
+                'scans': dict(self.scans.items())
+            }
+        temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            with self.lock:
+                self.counters['save_errors'] += 1
+            print(f"⚠️ Could not save scanner state {self.path}: {e}")
+
+    def avg_ticker_time(self):
+        with self.lock:
+            return self.ticker_time
+
+    def record_latency(self, tickers, seconds):
+        """Fold one scan's seconds-per-ticker into the EWMA (the first sample replaces the default)"""
+        if tickers <= 0:
+            return
+        sample = max(seconds / tickers, MIN_TICKER_TIME)
+        with self.lock:
+            if self.latency_samples:
+                self.ticker_time = self.alpha * sample + (1 - self.alpha) * self.ticker_time
+            else:
+                self.ticker_time = sample
+            self.latency_samples += 1
+
+    def reuse(self, signature):
+        """(scan_results, age_seconds) of an identical recent scan, else None"""
+        entry = self.scans.get(signature) if self.reuse_seconds else None
+        with self.lock:
+            self.counters['reuse_hits' if entry else 'reuse_misses'] += 1
+        if entry is None:
+            return None
+        scan_results, finished_at = entry
+        return scan_results, round(time.time() - finished_at, 1)
+
+    def remember(self, signature, scan_results):
+        """Store a finished scan for reuse and persist the state"""
+        finished_at = time.time()
+        if self.reuse_seconds:
+            self.scans.set(signature, (scan_results, finished_at))
+        with self.lock:
+            self.last_scan_time = datetime.fromtimestamp(finished_at).isoformat()
+            self.counters['scans_recorded'] += 1
+        self._save()
+
+    def run(self, signature, scan, fresh=False):
+        """(scan_results, age_seconds) from a recent identical scan, an identical one in flight, or scan(); age is None for a new scan"""
+        if not fresh:
+            reused = self.reuse(signature)
+            if reused is not None:
+                return reused
+        future, is_leader = self.flight.claim(signature)
+        if not is_leader:
+            with self.lock:
+                self.counters['coalesced_scans'] += 1
+            return future.result(), 0.0
+        try:
+            scan_results = scan()
+        except Exception as e:
+            self.flight.fail(signature, e)
+            raise
+        self.remember(signature, scan_results)
+        self.flight.resolve(signature, scan_results)
+        return scan_results, None
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['avg_ticker_time'] = round(self.ticker_time, 3)
+            snapshot['latency_samples'] = self.latency_samples
+            snapshot['last_scan_time'] = self.last_scan_time
+        snapshot['reusable_scans'] = len(self.scans)
+        snapshot['reuse_seconds'] = self.reuse_seconds
+        snapshot['persistence'] = 'file' if self.path else 'memory'
+        return snapshot
@@ -0,0 +1,552 @@
+"""
+Scoring-profile registry
+Every squeeze formula in the scanner is declared here as data (linear weights and caps,
+piecewise breakpoints, step ladders, flag rules, multipliers, level labels), validated and
+sorted once at registration and interpreted per ticker by a few plain functions. Scans
+pick a profile by name, and several profiles can be scored in one pass over the same
+ortex/price data. Interpreting costs about twice a hand-written scorer, so each scanner
+keeps its own scorer (or batch model) as the default and only runs profiles on request
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+
+ORTEX_FIELDS = ('short_interest', 'utilization', 'cost_to_borrow', 'days_to_cover')
+PRICE_FIELDS = ('price_change_pct', 'price_change', 'volume')
+
+LINEAR_COMPONENTS = [
+    {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'linear', 'weight': 1.2, 'cap': 35}]},
+    {'name': 'utilization', 'terms': [{'field': 'utilization', 'kind': 'linear', 'weight': 0.25, 'cap': 25}]},
+    {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'linear', 'weight': 0.8, 'cap': 20}]},
+    {'name': 'days_to_cover', 'terms': [{'field': 'days_to_cover', 'kind': 'linear', 'weight': 1.5, 'cap': 15}]},
+    {'name': 'momentum', 'terms': [{'field': 'price_change_pct', 'kind': 'linear', 'weight': 0.3, 'positive_only': True}]}
+]
+
+LINEAR_LEVELS = [[80, 'Extreme Squeeze Risk'], [65, 'High Squeeze Risk'], [45, 'Moderate Squeeze Risk']]
+
+# Built-in profiles - one per scorer that exists in the scanner variants
+PROFILES = {
+    'production': {
+        'description': 'Linear weights with per-factor caps (api/production.py)',
+        'components': LINEAR_COMPONENTS,
+        'flags': [
+            {'field': 'short_interest', 'above': [[25, 'EXTREME_SHORT_INTEREST']]},
+            {'field': 'utilization', 'above': [[90, 'HIGH_UTILIZATION']]},
+            {'field': 'cost_to_borrow', 'above': [[20, 'HIGH_BORROWING_COSTS']]},
+            {'field': 'days_to_cover', 'above': [[7, 'LONG_COVER_TIME']]},
+            {'field': 'price_change_pct', 'above': [[15, 'STRONG_MOMENTUM']]}
+        ],
+        'total': {'truncate': True},
+        'breakdown_truncate': True,
+        'levels': LINEAR_LEVELS,
+        'default_level': 'Low Risk'
+    },
+    'optimized': {
+        'description': 'Production weights with the short risk list (api/scanner_optimized.py)',
+        'components': LINEAR_COMPONENTS,
+        'flags': [
+            {'field': 'short_interest', 'above': [[25, 'EXTREME_SHORT_INTEREST']]},
+            {'field': 'utilization', 'above': [[90, 'HIGH_UTILIZATION']]},
+            {'field': 'cost_to_borrow', 'above': [[20, 'HIGH_BORROWING_COSTS']]}
+        ],
+        'total': {'truncate': True},
+        'breakdown_truncate': True,
+        'levels': LINEAR_LEVELS,
+        'default_level': 'Low Risk'
+    },
+    'advanced': {
+        'description': 'Piecewise-linear bands capped at 100 (api/scanner_enhanced.py)',
+        'components': [
+            {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'piecewise',
+                                                  'segments': [[30, 35, 0], [20, 25, 1.0], [10, 15, 1.0]],
+                                                  'below_slope': 1.5}]},
+            {'name': 'utilization', 'terms': [{'field': 'utilization', 'kind': 'piecewise',
+                                               'segments': [[95, 25, 0], [80, 18, 0.47], [60, 10, 0.4]],
+                                               'below_slope': 0.17}]},
+            {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'piecewise',
+                                                  'segments': [[50, 20, 0], [20, 15, 0.17], [5, 8, 0.47]],
+                                                  'below_slope': 1.6}]},
+            {'name': 'days_to_cover', 'terms': [{'field': 'days_to_cover', 'kind': 'piecewise',
+                                                 'segments': [[10, 15, 0], [5, 10, 1.0], [2, 5, 1.67]],
+                                                 'below_slope': 2.5}]},
+            {'name': 'momentum', 'terms': [{'field': 'price_change_pct', 'kind': 'piecewise', 'strict': True,
+                                            'segments': [[10, 5, 0], [5, 3, 0.4], [0, 0, 0.6]]}]}
+        ],
+        'flags': [
+            {'field': 'short_interest', 'above': [[30, 'EXTREME_SHORT_INTEREST'], [20, 'HIGH_SHORT_INTEREST']]},
+            {'field': 'utilization', 'above': [[90, 'HIGH_UTILIZATION']]},
+            {'field': 'cost_to_borrow', 'above': [[20, 'HIGH_BORROWING_COSTS']]},
+            {'field': 'days_to_cover', 'above': [[7, 'LONG_COVER_TIME']]},
+            {'field': 'price_change_pct', 'above': [[15, 'STRONG_UPWARD_MOMENTUM']]}
+        ],
+        'total': {'truncate': True, 'max': 100},
+        'breakdown_truncate': True,
+        'levels': [[80, 'Extreme Squeeze Risk'], [65, 'High Squeeze Risk'], [45, 'Moderate Squeeze Risk'],
+                   [25, 'Low Squeeze Risk']],
+        'default_level': 'Minimal Risk'
+    },
+    'simplified': {
+        'description': 'Heavier SI/CTB/DTC weights, 30-point SI cap (api/simplified.py)',
+        'components': [
+            {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'linear', 'weight': 1.5, 'cap': 30}]},
+            {'name': 'utilization', 'terms': [{'field': 'utilization', 'kind': 'linear', 'weight': 0.3, 'cap': 20}]},
+            {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'linear', 'weight': 1.2, 'cap': 20}]},
+            {'name': 'days_to_cover', 'terms': [{'field': 'days_to_cover', 'kind': 'linear', 'weight': 2, 'cap': 20}]},
+            {'name': 'momentum', 'terms': [{'field': 'price_change_pct', 'kind': 'linear', 'weight': 0.5,
+                                            'positive_only': True}]}
+        ],
+        'flags': [
+            {'field': 'short_interest', 'above': [[20, 'HIGH_SHORT_INTEREST']], 'min_score': 70}
+        ],
+        'total': {'truncate': True},
+        'breakdown_truncate': True,
+        'levels': [[70, 'High Squeeze Risk'], [50, 'Moderate Squeeze Risk'], [30, 'Low Squeeze Risk']],
+        'default_level': 'Minimal Risk'
+    },
+    'enhanced': {
+        'description': 'Original integrated-server weighting, SI/CTB/DTC plus capped momentum (enhanced_integrated_server.py)',
+        'components': [
+            {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'linear', 'weight': 1.3, 'cap': 40}]},
+            {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'linear', 'weight': 1.2, 'cap': 25}]},
+            {'name': 'days_to_cover', 'terms': [{'field': 'days_to_cover', 'kind': 'linear', 'weight': 2.5, 'cap': 20}]},
+            {'name': 'momentum', 'terms': [{'field': 'price_change_pct', 'kind': 'linear', 'weight': 0.8, 'cap': 15,
+                                            'positive_only': True}]}
+        ],
+        'flags': [],
+        'total': {'truncate': True, 'max': 100},
+        'breakdown_truncate': True,
+        'levels': [[80, 'EXTREME SQUEEZE RISK'], [60, 'HIGH SQUEEZE RISK'], [40, 'MODERATE SQUEEZE RISK']],
+        'default_level': 'Low Risk'
+    },
+    'index': {
+        'description': 'SI/CTB weights with capped positive momentum (the root Vercel app, api/index.py)',
+        'components': [
+            {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'linear', 'weight': 1.5, 'cap': 40}]},
+            {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'linear', 'weight': 1.2, 'cap': 25}]},
+            {'name': 'momentum', 'terms': [{'field': 'price_change_pct', 'kind': 'linear', 'weight': 0.8, 'cap': 15,
+                                            'positive_only': True}]}
+        ],
+        'flags': [],
+        'total': {'truncate': True, 'max': 100},
+        'breakdown_truncate': True,
+        'levels': [[80, 'EXTREME SQUEEZE RISK'], [60, 'HIGH SQUEEZE RISK'], [40, 'MODERATE SQUEEZE RISK']],
+        'default_level': 'Low Risk'
+    },
+    'professional': {
+        'description': 'Step ladders with volume bonus and double/triple-threat multipliers (api/index_backup.py)',
+        'components': [
+            {'name': 'short_interest', 'terms': [{'field': 'short_interest', 'kind': 'steps', 'steps': [
+                [40, 35, 'EXTREME_SHORT_INTEREST'], [30, 30, 'VERY_HIGH_SHORT_INTEREST'],
+                [20, 25, 'HIGH_SHORT_INTEREST'], [15, 15], [10, 8], [5, 3]]}]},
+            {'name': 'utilization', 'terms': [{'field': 'utilization', 'kind': 'steps', 'steps': [
+                [98, 25, 'MAXED_UTILIZATION'], [95, 22, 'CRITICAL_UTILIZATION'], [90, 20], [85, 18],
+                [80, 15], [75, 12], [60, 8], [40, 4]]}]},
+            {'name': 'cost_to_borrow', 'terms': [{'field': 'cost_to_borrow', 'kind': 'steps', 'steps': [
+                [50, 25, 'EXTREME_BORROW_COST'], [30, 22, 'VERY_HIGH_BORROW_COST'], [20, 20], [15, 18],
+                [10, 15], [8, 12], [5, 10], [3, 6], [1, 3]]}]},
+            {'name': 'days_to_cover', 'terms': [{'field': 'days_to_cover', 'kind': 'steps', 'steps': [
+                [10, 15, 'EXTREME_DAYS_TO_COVER'], [7, 13], [5, 11], [4, 10], [3, 8], [2, 5], [1, 2]]}]},
+            {'name': 'momentum', 'requires_price': True, 'clamp': [-5, 10], 'terms': [
+                {'field': 'price_change', 'kind': 'steps', 'strict': True,
+                 'steps': [[10, 10, 'STRONG_UPWARD_MOMENTUM'], [5, 7], [2, 4], [0, 2]], 'under': [-10, -5]},
+                {'field': 'volume', 'kind': 'steps', 'strict': True,
+                 'steps': [[50000000, 2, 'HIGH_VOLUME'], [20000000, 1]]}
+            ]}
+        ],
+        'flags': [],
+        'multipliers': {
+            'flags': ['EXTREME_SHORT_INTEREST', 'MAXED_UTILIZATION', 'EXTREME_BORROW_COST', 'EXTREME_DAYS_TO_COVER'],
+            'tiers': [[3, 1.1, 'TRIPLE_THREAT_MULTIPLIER'], [2, 1.05, 'DOUBLE_THREAT_MULTIPLIER']]
+        },
+        'total': {'truncate': False, 'min': 0, 'max': 100},
+        'breakdown_truncate': False,
+        'levels': [[80, 'EXTREME SQUEEZE RISK'], [60, 'High Squeeze Risk'], [40, 'Moderate Squeeze Risk']],
+        'default_level': 'Low Squeeze Risk'
+    }
+}
+
+
+class RiskFlags:
+    """One bit per risk-factor name, in the order a profile appends them; a mask is decoded to names once"""
+
+    def __init__(self, names):
+        self.order = tuple(dict.fromkeys(names))
+        self.bits = {name: 1 << position for position, name in enumerate(self.order)}
+        self.decoded = {0: ()}
+
+    def mask(self, names):
+        mask = 0
+        for name in names:
+            mask |= self.bits[name]
+        return mask
+
+    def names(self, mask):
+        names = self.decoded.get(mask)
+        if names is None:
+            names = self.decoded[mask] = tuple(name for name in self.order if mask & self.bits[name])
+        return list(names)
+
+
+def _linear(term, value):
+    """value * weight, optionally only for positive values and capped"""
+    if term['positive_only'] and not value > 0:
+        return 0, 0
+    points = value * term['weight']
+    return (points if term['cap'] is None else min(points, term['cap'])), 0
+
+
+def _piecewise(term, value):
+    """Bands of base + (value - at) * slope, highest breakpoint first; below the last band value * below_slope"""
+    strict = term['strict']
+    for at, base, slope in term['segments']:
+        if (value > at) if strict else (value >= at):
+            return (base + (value - at) * slope if slope else base), 0
+    return (value * term['below_slope'] if term['below_slope'] is not None else 0), 0
+
+
+def _steps(term, value):
+    """Step ladder resolved with bisect over ascending thresholds instead of an if/elif chain"""
+    # NaN compares false everywhere, like the original ladders
+    index = term['search'](term['thresholds'], value) if value == value else 0
+    if index:
+        return term['points'][index], term['bits'][index]
+    under = term['under']
+    if under is not None and value < under[0]:
+        return under[1], 0
+    return 0, 0
+
+
+def _prepare_linear(spec, flags):
+    return {'weight': spec['weight'], 'cap': spec.get('cap'), 'positive_only': spec.get('positive_only', False)}
+
+
+def _prepare_piecewise(spec, flags):
+    return {
+        'segments': [tuple(segment) for segment in sorted(spec['segments'], key=lambda segment: segment[0], reverse=True)],
+        'strict': spec.get('strict', False),
+        'below_slope': spec.get('below_slope')
+    }
+
+
+def _prepare_steps(spec, flags):
+    steps = sorted(spec['steps'], key=lambda step: step[0])
+    # Index 0 is "below every step"; bisect returns the band index directly
+    return {
+        'thresholds': [step[0] for step in steps],
+        'points': [0] + [step[1] for step in steps],
+        'bits': [0] + [flags.bits[step[2]] if len(step) > 2 and step[2] else 0 for step in steps],
+        'search': bisect_left if spec.get('strict', False) else bisect_right,
+        'under': spec.get('under')
+    }
+
+
+def step_flag_names(spec):
+    """Risk-factor names a step term can raise, highest band first (the order a ladder checks them)"""
+    steps = sorted(spec['steps'], key=lambda step: step[0], reverse=True)
+    return [step[2] for step in steps if len(step) > 2 and step[2]]
+
+
+# kind -> (prepare(spec, flags) -> term, evaluate(term, value) -> (points, risk bits))
+TERM_KINDS = {
+    'linear': (_prepare_linear, _linear),
+    'piecewise': (_prepare_piecewise, _piecewise),
+    'steps': (_prepare_steps, _steps)
+}
+
+
+class ScoringProfile:
+    """A profile spec validated and sorted once, then interpreted per ticker by plain functions"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.description = spec.get('description', '')
+        fields = []
+
+        def use(field):
+            if field not in ORTEX_FIELDS + PRICE_FIELDS:
+                raise ValueError(f"Profile '{name}': unknown field '{field}'")
+            if field not in fields:
+                fields.append(field)
+            return field
+
+        multipliers = spec.get('multipliers') or {}
+        tiers = sorted(multipliers.get('tiers') or [], key=lambda tier: tier[0], reverse=True)
+        rules = [(rule, sorted(rule['above'], key=lambda band: band[0], reverse=True)) for rule in spec.get('flags', [])]
+        # Bits follow the order risk factors are raised in, so decoding a mask lists them as appended
+        flag_names = [name for component in spec['components'] for term in component['terms']
+                      if term['kind'] == 'steps' for name in step_flag_names(term)]
+        flag_names += [flag for _, bands in rules for _, flag in bands]
+        flag_names += [flag for _, _, flag in tiers]
+        self.risk_flags = RiskFlags(flag_names)
+
+        breakdown_truncate = spec.get('breakdown_truncate', True)
+        self.components = []
+        # Components before the first price-dependent one only read Ortex fields: partials()
+        # scores them once and refresh() runs the rest on new quotes
+        self.split = None
+        for component in spec['components']:
+            terms = []
+            for term in component['terms']:
+                if term['kind'] not in TERM_KINDS:
+                    raise ValueError(f"Profile '{name}': unknown term kind '{term['kind']}'")
+                prepare, evaluate = TERM_KINDS[term['kind']]
+                terms.append((evaluate, use(term['field']), prepare(term, self.risk_flags)))
+            requires_price = component.get('requires_price', False)
+            if self.split is None and (requires_price or any(f in PRICE_FIELDS for _, f, _ in terms)):
+                self.split = len(self.components)
+            clamp = component.get('clamp')
+            self.components.append((component['name'], terms, requires_price,
+                                    tuple(clamp) if clamp else None, breakdown_truncate))
+        if self.split is None:
+            self.split = len(self.components)
+
+        total = spec.get('total', {})
+        self.truncate = total.get('truncate', True)
+        self.max_score = total.get('max')
+        self.min_score = total.get('min')
+        self.flags = [
+            (use(rule['field']), [(threshold, self.risk_flags.bits[flag]) for threshold, flag in bands], rule.get('min_score'))
+            for rule, bands in rules
+        ]
+        # Extreme factors are counted with a popcount of mask & multiplier_mask
+        self.multiplier_mask = self.risk_flags.mask(name for name in multipliers.get('flags', [])
+                                                    if name in self.risk_flags.bits)
+        self.multiplier_tiers = [(count, multiplier, self.risk_flags.bits[flag]) for count, multiplier, flag in tiers]
+        self.levels = sorted(spec.get('levels', []), key=lambda level: level[0], reverse=True)
+        self.default_level = spec.get('default_level', 'Low Risk')
+        self.ortex_fields = [f for f in fields if f in ORTEX_FIELDS]
+        self.price_fields = [f for f in fields if f in PRICE_FIELDS]
+        self.fields = fields
+
+    @staticmethod
+    def _score(components, values, has_price, score, breakdown, mask):
+        """(score, risk mask) after adding components to a running total"""
+        for name, terms, requires_price, clamp, truncate in components:
+            if requires_price and not has_price:
+                continue
+            component = 0
+            for evaluate, field, term in terms:
+                points, bits = evaluate(term, values[field])
+                component += points
+                mask |= bits
+            score += max(clamp[0], min(clamp[1], component)) if clamp else component
+            breakdown[name] = int(component) if truncate else component
+        return score, mask
+
+    def _finish(self, score, breakdown, mask, values):
+        if self.truncate:
+            score = int(score)
+        for field, bands, min_score in self.flags:
+            if min_score is not None and not score >= min_score:
+                continue
+            for threshold, bit in bands:
+                if values[field] > threshold:
+                    mask |= bit
+                    break
+        if self.multiplier_tiers:
+            extreme = bin(mask & self.multiplier_mask).count('1')
+            for count, multiplier, bit in self.multiplier_tiers:
+                if extreme >= count:
+                    score = score * multiplier if self.max_score is None else min(self.max_score, score * multiplier)
+                    mask |= bit
+                    break
+        if self.max_score is not None:
+            score = min(self.max_score, score)
+        if self.min_score is not None:
+            score = max(self.min_score, score)
+        level = self.default_level
+        for threshold, label in self.levels:
+            if score >= threshold:
+                level = label
+                break
+        # Names only appear here, when the result is built
+        return {'score': score, 'level': level, 'breakdown': breakdown, 'risk_factors': self.risk_flags.names(mask)}
+
+    def evaluate(self, ortex_data, price_data):
+        """Score one ticker: {'score', 'level', 'breakdown', 'risk_factors'}"""
+        has_price = bool(price_data)
+        ortex_data = ortex_data or {}
+        price_data = price_data or {}
+        values = {field: ortex_data.get(field, 0) for field in self.ortex_fields}
+        for field in self.price_fields:
+            values[field] = price_data.get(field, 0)
+        return self.evaluate_values(values, has_price)
+
+    def evaluate_values(self, values, has_price=True):
+        breakdown = {}
+        score, mask = self._score(self.components, values, has_price, 0, breakdown, 0)
+        return self._finish(score, breakdown, mask, values)
+
+    def partials(self, ortex_data):
+        """Ortex-only subtotals (score, breakdown, risk mask so far) plus the Ortex values read"""
+        ortex_data = ortex_data or {}
+        values = {field: ortex_data.get(field, 0) for field in self.ortex_fields}
+        breakdown = {}
+        score, mask = self._score(self.components[:self.split], values, True, 0, breakdown, 0)
+        return {'score': score, 'breakdown': breakdown, 'risk_mask': mask, 'values': values}
+
+    def refresh(self, partial, price_data):
+        """Finish a partials() result with new quotes - same evaluation as evaluate(), Ortex terms skipped"""
+        has_price = bool(price_data)
+        price_data = price_data or {}
+        values = dict(partial['values'])
+        for field in self.price_fields:
+            values[field] = price_data.get(field, 0)
+        breakdown = dict(partial['breakdown'])
+        score, mask = self._score(self.components[self.split:], values, has_price, partial['score'], breakdown,
+                                  partial['risk_mask'])
+        return self._finish(score, breakdown, mask, values)
+
+    def metrics(self, ortex_data, price_data):
+        """Evaluation in the squeeze_metrics shape the scan loops already consume"""
+        try:
+            evaluation = self.evaluate(ortex_data, price_data)
+        except Exception as e:
+            evaluation = {'score': 0, 'level': 'Error', 'breakdown': {}, 'risk_factors': [], 'error': str(e)}
+        return as_metrics(self.name, evaluation)
+
+
+def as_metrics(name, evaluation):
+    """Profile evaluation -> squeeze_metrics dict (squeeze_score, squeeze_type, risk_factors, score_breakdown)"""
+    metrics = {
+        'squeeze_score': evaluation['score'],
+        'squeeze_type': evaluation['level'],
+        'risk_factors': evaluation['risk_factors'],
+        'score_breakdown': evaluation['breakdown'],
+        'scoring_profile': name
+    }
+    if 'error' in evaluation:
+        metrics['error'] = evaluation['error']
+    return metrics
+
+
+def summarize(scores):
+    """Compact per-profile view for scan results: {name: {score, level, risk_factors}}"""
+    return {
+        name: {'score': evaluation['score'], 'level': evaluation['level'], 'risk_factors': evaluation['risk_factors']}
+        for name, evaluation in scores.items()
+    }
+
+
+def extract_values(ortex_data, price_data):
+    """The raw inputs every profile reads, pulled out of the ticker dicts once"""
+    ortex_data = ortex_data or {}
+    price_data = price_data or {}
+    values = {field: ortex_data.get(field, 0) for field in ORTEX_FIELDS}
+    values.update({field: price_data.get(field, 0) for field in PRICE_FIELDS})
+    return values
+
+
+def score_profiles(profiles, ortex_data, price_data):
+    """Evaluate resolved profiles over one ticker, extracting the inputs once"""
+    values = extract_values(ortex_data, price_data)
+    has_price = bool(price_data)
+    scores = {}
+    for profile in profiles:
+        try:
+            scores[profile.name] = profile.evaluate_values(values, has_price)
+        except Exception as e:
+            scores[profile.name] = {'score': 0, 'level': 'Error', 'breakdown': {}, 'risk_factors': [], 'error': str(e)}
+    return scores
+
+
+class ProfileRegistry:
+    """Named scoring profiles; extra profiles load from SCORING_PROFILES_PATH (JSON)"""
+
+    def __init__(self, profiles=None, path=None):
+        self.lock = threading.Lock()
+        self.profiles = {}
+        self.counters = {
+            'evaluations': 0,
+            'scan_passes': 0
+        }
+        for name, spec in (profiles if profiles is not None else PROFILES).items():
+            self.register(name, spec)
+
+        path = path if path is not None else os.environ.get('SCORING_PROFILES_PATH')
+        if path:
+            self.load(path)
+
+    def register(self, name, spec):
+        """Validate and add (or replace) a profile; raises ValueError for malformed specs"""
+        try:
+            profile = ScoringProfile(name, spec)
+        except (KeyError, TypeError, IndexError) as e:
+            raise ValueError(f"Profile '{name}' is malformed: {e}")
+        with self.lock:
+            self.profiles[name] = profile
+        return profile
+
+    def load(self, path):
+        try:
+            with open(path) as f:
+                specs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load scoring profiles from {path}: {e}")
+            return
+        for name, spec in specs.items():
+            try:
+                self.register(name, spec)
+            except ValueError as e:
+                print(f"⚠️  Skipping scoring profile: {e}")
+
+    def get(self, name):
+        with self.lock:
+            profile = self.profiles.get(name)
+        if profile is None:
+            raise ValueError(f"Unknown scoring profile '{name}' (available: {', '.join(self.names())})")
+        return profile
+
+    def names(self):
+        with self.lock:
+            return sorted(self.profiles)
+
+    def resolve(self, names):
+        """Validate a list of profile names up front so a scan fails before fetching anything"""
+        return [self.get(name) for name in dict.fromkeys(name for name in names if name)]
+
+    def metrics(self, name, ortex_data, price_data):
+        return self.get(name).metrics(ortex_data, price_data)
+
+    def selection(self, filters):
+        """Resolve filters['scoring_profile'] and filters['profiles'] before any fetch: (primary or None, profiles)"""
+        filters = filters or {}
+        primary = self.get(filters['scoring_profile']) if filters.get('scoring_profile') else None
+        extra = filters.get('profiles') or []
+        if isinstance(extra, str):
+            extra = [name.strip() for name in extra.split(',')]
+        return primary, self.resolve(([primary.name] if primary else []) + list(extra))
+
+    def score_rows(self, profiles, ortex_rows, price_rows):
+        """One pass over a scan's rows computing every requested profile per ticker"""
+        rows = [score_profiles(profiles, ortex_row, price_row) for ortex_row, price_row in zip(ortex_rows, price_rows)]
+        self.record_pass(len(rows), len(profiles))
+        return rows
+
+    def score_many(self, names, ortex_data, price_data):
+        """Several profiles by name over one ticker (resolve once and use score_profiles in loops)"""
+        return score_profiles(self.resolve(names), ortex_data, price_data)
+
+    def record_pass(self, rows, profiles):
+        """Count one scan's scoring pass; kept out of the per-ticker path"""
+        with self.lock:
+            self.counters['evaluations'] += rows * profiles
+            self.counters['scan_passes'] += 1
+
+    def describe(self):
+        with self.lock:
+            profiles = dict(self.profiles)
+        return {name: {'description': profile.description, 'spec': profile.spec} for name, profile in sorted(profiles.items())}
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['profiles'] = sorted(self.profiles)
+        return snapshot
+
+
+# Process-wide registry shared by every scan path
+profile_registry = ProfileRegistry()
@@ -0,0 +1,74 @@
+"""
+Single-flight request coalescing for upstream fetches
+Concurrent callers asking for the same key share one in-flight fetch instead of each hitting Ortex/Yahoo
+"""
+
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    """Tracks in-flight keys; the first caller leads, later callers wait on its future"""
+
+    def __init__(self, name):
+        self.name = name
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.counters = {
+            'leaders': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+
+    def claim(self, key):
+        """Return (future, is_leader); the leader must call resolve() or fail() for the key"""
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.counters['coalesced'] += 1
+                return future, False
+            future = concurrent.futures.Future()
+            self.in_flight[key] = future
+            self.counters['leaders'] += 1
+            return future, True
+
+    def resolve(self, key, result):
+        """Publish the leader's result to every waiter and release the key"""
+        with self.lock:
+            future = self.in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def fail(self, key, error):
+        """Propagate the leader's error to every waiter and release the key"""
+        with self.lock:
+            future = self.in_flight.pop(key, None)
+            self.counters['errors'] += 1
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    def do(self, key, func, *args, timeout=None):
+        """Run func(*args) once per key across concurrent callers and share the result"""
+        future, is_leader = self.claim(key)
+        if not is_leader:
+            return future.result(timeout)
+        try:
+            result = func(*args)
+        except Exception as e:
+            self.fail(key, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+            counters['in_flight'] = len(self.in_flight)
+        total = counters['leaders'] + counters['coalesced']
+        counters['coalesce_rate'] = round(counters['coalesced'] / total * 100, 1) if total else 0.0
+        return counters
+
+
+# Process-wide groups: Ortex keys are (ticker, data_type), Yahoo keys are tickers
+ortex_flight = SingleFlight('ortex')
+price_flight = SingleFlight('yahoo')
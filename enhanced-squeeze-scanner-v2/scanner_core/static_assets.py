@@ -0,0 +1,222 @@
+"""
+Precompressed in-memory pages and static files
+Each page or file is encoded, gzipped and (with the optional brotli package) brotli-compressed
+once per process and then served from memory: the encoding is picked from Accept-Encoding,
+every representation carries a strong ETag, a matching If-None-Match gets a 304, and files
+under static/ requested with their ?v=<content hash> URL are cacheable for a year
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this go out uncompressed - the framing costs more than it saves
+MIN_COMPRESS_BYTES = int(os.environ.get('ASSET_MIN_COMPRESS_BYTES', 512))
+GZIP_LEVEL = 9
+# Versioned static URLs change whenever the file does, so they never need revalidating
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Pages and unversioned files: keep a copy but revalidate with the ETag every time
+REVALIDATE_CACHE = 'no-cache'
+ENCODING_PREFERENCE = ('br', 'gzip')
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+ETAG_SUFFIXES = {'identity': '', 'gzip': '-gz', 'br': '-br'}
+
+
+def accepted_encodings(accept_encoding):
+    """{coding: q} parsed from an Accept-Encoding header"""
+    codings = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().lower().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.strip()] = q
+    return codings
+
+
+def choose_encoding(accept_encoding, available):
+    """Available encoding with the highest q the client gives (ties go to br, then gzip), else identity"""
+    codings = accepted_encodings(accept_encoding)
+    best, best_q = 'identity', 0.0
+    for coding in ENCODING_PREFERENCE:
+        q = codings.get(coding, codings.get('*', 0.0))
+        if coding in available and q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class Asset:
+    """One response body in every encoding worth sending, keyed by its content hash"""
+
+    def __init__(self, body, content_type, source=None, mtime=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.content_type = content_type
+        self.source = source
+        self.mtime = mtime
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+        self.bodies = {'identity': body}
+        if len(body) >= MIN_COMPRESS_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+            self.bodies['gzip'] = gzip.compress(body, GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                self.bodies['br'] = brotli.compress(body)
+        # Each encoding is a different byte sequence, so each gets its own strong ETag
+        self.etags = {coding: f'"{self.version}{ETAG_SUFFIXES[coding]}"' for coding in self.bodies}
+
+    def matches(self, if_none_match):
+        """If-None-Match uses weak comparison: any representation of this content is a match"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or not tags.isdisjoint(self.etags.values())
+
+    def respond(self, accept_encoding=None, if_none_match=None, cache_control=REVALIDATE_CACHE):
+        """(status, headers, body) for a request carrying these headers"""
+        coding = choose_encoding(accept_encoding, self.bodies)
+        headers = [
+            ('Content-Type', self.content_type),
+            ('ETag', self.etags[coding]),
+            ('Cache-Control', cache_control),
+            ('Vary', 'Accept-Encoding')
+        ]
+        if self.matches(if_none_match):
+            return 304, headers, b''
+        body = self.bodies[coding]
+        if coding != 'identity':
+            headers.append(('Content-Encoding', coding))
+        headers.append(('Content-Length', str(len(body))))
+        return 200, headers, body
+
+    def sizes(self):
+        return {coding: len(body) for coding, body in self.bodies.items()}
+
+
+def send_asset(handler, response):
+    """Write a (status, headers, body) response from a BaseHTTPRequestHandler"""
+    status, headers, body = response
+    handler.send_response(status)
+    for name, value in headers:
+        handler.send_header(name, value)
+    handler.end_headers()
+    if body:
+        handler.wfile.write(body)
+
+
+class PageCache:
+    """HTML pages built by the handlers, encoded and compressed once per process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages = {}
+        self.counters = {
+            'builds': 0,
+            'served': 0,
+            'not_modified': 0
+        }
+
+    def page(self, name, html, content_type='text/html; charset=utf-8'):
+        """Asset for a page whose source is a constant string - rebuilt only if the string changes"""
+        asset = self.pages.get(name)
+        if asset is not None and asset.source is html:
+            return asset
+        return self._store(name, Asset(html, content_type, source=html))
+
+    def render(self, name, build, content_type='text/html; charset=utf-8'):
+        """Asset for a rendered page (a template): build() runs on first use only"""
+        asset = self.pages.get(name)
+        if asset is not None:
+            return asset
+        return self._store(name, Asset(build(), content_type))
+
+    def _store(self, name, asset):
+        with self.lock:
+            self.pages[name] = asset
+            self.counters['builds'] += 1
+        return asset
+
+    def respond(self, asset, accept_encoding=None, if_none_match=None):
+        response = asset.respond(accept_encoding, if_none_match)
+        with self.lock:
+            self.counters['not_modified' if response[0] == 304 else 'served'] += 1
+        return response
+
+    def send(self, handler, name, html):
+        """Serve a page from a BaseHTTPRequestHandler"""
+        response = self.respond(self.page(name, html), handler.headers.get('Accept-Encoding'),
+                                handler.headers.get('If-None-Match'))
+        send_asset(handler, response)
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            pages = dict(self.pages)
+        snapshot['pages'] = {name: asset.sizes() for name, asset in pages.items()}
+        snapshot['brotli_available'] = brotli is not None
+        return snapshot
+
+
+class StaticFiles:
+    """Files under a static/ directory, loaded and compressed up front and reloaded when they change on disk"""
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        self.lock = threading.Lock()
+        self.assets = {}
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                self.get(os.path.relpath(os.path.join(directory, name), self.root))
+
+    def _resolve(self, path):
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        if not full_path.startswith(self.root + os.sep) or not os.path.isfile(full_path):
+            return None
+        return full_path
+
+    def get(self, path):
+        """Asset for a path relative to the root, or None if it is missing or outside the root"""
+        full_path = self._resolve(path)
+        if full_path is None:
+            return None
+        mtime = os.stat(full_path).st_mtime_ns
+        asset = self.assets.get(full_path)
+        if asset is None or asset.mtime != mtime:
+            with open(full_path, 'rb') as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+            if content_type.startswith('text/') or content_type == 'application/javascript':
+                content_type += '; charset=utf-8'
+            asset = Asset(body, content_type, mtime=mtime)
+            with self.lock:
+                self.assets[full_path] = asset
+        return asset
+
+    def version(self, path):
+        """Content hash for ?v= cache busting, or None for an unknown file"""
+        asset = self.get(path)
+        return asset.version if asset else None
+
+    def respond(self, path, version=None, accept_encoding=None, if_none_match=None):
+        """(status, headers, body), or None when the file doesn't exist; a current ?v= makes it immutable"""
+        asset = self.get(path)
+        if asset is None:
+            return None
+        cache_control = IMMUTABLE_CACHE if version == asset.version else REVALIDATE_CACHE
+        return asset.respond(accept_encoding, if_none_match, cache_control)
+
+
+# Process-wide page cache shared by every handler in the process
+page_cache = PageCache()
@@ -0,0 +1,186 @@
+"""
+Precompiled step-function scoring tables
+Turns the step ladders of the professional profile (scoring_profiles.PROFILES['professional'],
+index_backup's calculate_squeeze_score) into sorted threshold tables: bisect per ticker,
+NumPy searchsorted for batches. Risk factors are integer bit flags - the extreme-factor
+count is a popcount - and only turn into names when a result is serialized
+"""
+
+from bisect import bisect_left, bisect_right
+
+from scanner_core.scoring_profiles import ORTEX_FIELDS, PROFILES, RiskFlags, step_flag_names
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class StepTable:
+    """One ladder: ascending thresholds, with points and risk bits per band (index 0 = below every band)"""
+
+    def __init__(self, field, steps, flags, strict=False, under=None):
+        steps = sorted(steps, key=lambda step: step[0])
+        self.field = field
+        self.thresholds = tuple(step[0] for step in steps)
+        self.points = (0,) + tuple(step[1] for step in steps)
+        self.flag_bits = (0,) + tuple(flags.bits[step[2]] if len(step) > 2 and step[2] else 0 for step in steps)
+        # value >= threshold -> bisect_right / side='right'; value > threshold -> bisect_left / side='left'
+        self.strict = strict
+        self.search = bisect_left if strict else bisect_right
+        self.under = tuple(under) if under else None
+        if np is not None:
+            self.threshold_array = np.array(self.thresholds, dtype=np.float64)
+            self.point_array = np.array(self.points, dtype=np.int64)
+            self.bit_array = np.array(self.flag_bits, dtype=np.int64)
+
+    def lookup_array(self, values):
+        """Vectorized lookup: (points, risk bits) arrays via searchsorted"""
+        index = np.searchsorted(self.threshold_array, values, side='left' if self.strict else 'right')
+        index = np.where(np.isnan(values), 0, index)
+        points = self.point_array[index]
+        if self.under is not None:
+            points = np.where((index == 0) & (values < self.under[0]), self.under[1], points)
+        return points, self.bit_array[index]
+
+
+class StepScorer:
+    """The professional ladders compiled into StepTables, a multiplier mask and one straight-line score()"""
+
+    def __init__(self, spec):
+        for component in spec['components']:
+            for term in component['terms']:
+                if term['kind'] != 'steps':
+                    raise ValueError(f"StepScorer only handles step ladders, got '{term['kind']}'")
+        multipliers = spec.get('multipliers') or {}
+        tiers = sorted(multipliers.get('tiers', []), key=lambda tier: tier[0], reverse=True)
+        self.flags = RiskFlags([name for component in spec['components'] for term in component['terms']
+                                for name in step_flag_names(term)] + [tier[2] for tier in tiers])
+
+        self.components = []
+        for component in spec['components']:
+            tables = [(term['field'] in ORTEX_FIELDS,
+                       StepTable(term['field'], term['steps'], self.flags, term.get('strict', False), term.get('under')))
+                      for term in component['terms']]
+            self.components.append((component['name'], tables, component.get('requires_price', False),
+                                    component.get('clamp')))
+
+        self.extreme_mask = self.flags.mask(multipliers.get('flags', []))
+        self.tiers = [(count, multiplier, self.flags.bits[flag]) for count, multiplier, flag in tiers]
+        total = spec.get('total', {})
+        self.total_min = total.get('min')
+        self.total_max = total.get('max')
+        self.score = self._compile()
+
+    def _compile(self):
+        """score(ortex_data, price_data) -> (score, breakdown, risk mask) with every table bound as a local"""
+        shape = [(len(tables), requires_price, all(from_ortex for from_ortex, _ in tables))
+                 for _, tables, requires_price, _ in self.components]
+        if shape != [(1, False, True)] * 4 + [(2, True, False)] or len(self.tiers) != 2 \
+                or self.components[4][1][1][1].under is not None or None in (self.total_min, self.total_max):
+            raise ValueError('StepScorer compiles four Ortex ladders, one two-term price component, '
+                             'two multiplier tiers and a bounded total')
+        (n1, ((_, t1),), _, _), (n2, ((_, t2),), _, _), (n3, ((_, t3),), _, _), (n4, ((_, t4),), _, _), \
+            (n5, ((_, t5), (_, t6)), _, clamp) = self.components
+        f1, s1, T1, P1, B1 = t1.field, t1.search, t1.thresholds, t1.points, t1.flag_bits
+        f2, s2, T2, P2, B2 = t2.field, t2.search, t2.thresholds, t2.points, t2.flag_bits
+        f3, s3, T3, P3, B3 = t3.field, t3.search, t3.thresholds, t3.points, t3.flag_bits
+        f4, s4, T4, P4, B4 = t4.field, t4.search, t4.thresholds, t4.points, t4.flag_bits
+        f5, s5, T5, P5, B5 = t5.field, t5.search, t5.thresholds, t5.points, t5.flag_bits
+        f6, s6, T6, P6, B6 = t6.field, t6.search, t6.thresholds, t6.points, t6.flag_bits
+        under_at, under_points = t5.under if t5.under is not None else (float('-inf'), 0)
+        low, high = clamp if clamp else (float('-inf'), float('inf'))
+        extreme_mask = self.extreme_mask
+        (count1, multiplier1, bit1), (count2, multiplier2, bit2) = self.tiers
+        total_min, total_max = self.total_min, self.total_max
+
+        def score(ortex_data, price_data):
+            """(score, breakdown, risk mask) for one ticker"""
+            get = ortex_data.get
+            # NaN compares false everywhere, like the original ladders: it lands below every band
+            value = get(f1, 0)
+            index = s1(T1, value) if value == value else 0
+            p1, mask = P1[index], B1[index]
+            value = get(f2, 0)
+            index = s2(T2, value) if value == value else 0
+            p2 = P2[index]
+            mask |= B2[index]
+            value = get(f3, 0)
+            index = s3(T3, value) if value == value else 0
+            p3 = P3[index]
+            mask |= B3[index]
+            value = get(f4, 0)
+            index = s4(T4, value) if value == value else 0
+            p4 = P4[index]
+            mask |= B4[index]
+            total = p1 + p2 + p3 + p4
+            breakdown = {n1: p1, n2: p2, n3: p3, n4: p4}
+            if price_data:
+                value = price_data.get(f5, 0)
+                index = s5(T5, value) if value == value else 0
+                component = under_points if not index and value < under_at else P5[index]
+                mask |= B5[index]
+                value = price_data.get(f6, 0)
+                index = s6(T6, value) if value == value else 0
+                component += P6[index]
+                mask |= B6[index]
+                breakdown[n5] = component
+                total += low if component <= low else high if component >= high else component
+            if mask & extreme_mask:
+                extreme = bin(mask & extreme_mask).count('1')
+                if extreme >= count1:
+                    total *= multiplier1
+                    mask |= bit1
+                elif extreme >= count2:
+                    total *= multiplier2
+                    mask |= bit2
+            # Same result types as min(max, max(min, score)): the bound itself when reached
+            total = total_max if total >= total_max else total_min if total <= total_min else total
+            return total, breakdown, mask
+
+        return score
+
+    def score_columns(self, columns):
+        """Vectorized score over batch_scoring.build_columns output: scores, breakdown arrays, risk masks, multiplied"""
+        rows = len(columns['short_interest'])
+        score = np.zeros(rows, dtype=np.float64)
+        mask = np.zeros(rows, dtype=np.int64)
+        breakdown = {}
+        for name, tables, requires_price, clamp in self.components:
+            component_score = np.zeros(rows, dtype=np.int64)
+            for from_ortex, table in tables:
+                points, bits = table.lookup_array(columns[table.field])
+                component_score = component_score + points
+                if requires_price:
+                    bits = np.where(columns['price_nonempty'], bits, 0)
+                mask |= bits
+            contribution = np.clip(component_score, clamp[0], clamp[1]) if clamp else component_score
+            if requires_price:
+                contribution = np.where(columns['price_nonempty'], contribution, 0)
+            score += contribution
+            breakdown[name] = component_score
+
+        extreme = np.zeros(rows, dtype=np.int64)
+        for bit in self.flags.bits.values():
+            if bit & self.extreme_mask:
+                extreme += (mask & bit) != 0
+        applied = np.zeros(rows, dtype=bool)
+        for count, multiplier, bit in self.tiers:
+            hit = (extreme >= count) & ~applied
+            scaled = score * multiplier
+            if self.total_max is not None:
+                scaled = np.minimum(self.total_max, scaled)
+            score = np.where(hit, scaled, score)
+            mask = np.where(hit, mask | bit, mask)
+            applied |= hit
+
+        if self.total_max is not None:
+            score = np.minimum(self.total_max, score)
+        if self.total_min is not None:
+            score = np.maximum(self.total_min, score)
+        # Rows no multiplier touched are whole numbers (ints in the per-ticker scorer)
+        return {'scores': score, 'breakdown': breakdown, 'risk_mask': mask, 'multiplied': applied}
+
+
+# Precompiled once at import from the declared professional ladders (index_backup's scorer)
+professional_scorer = StepScorer(PROFILES['professional'])
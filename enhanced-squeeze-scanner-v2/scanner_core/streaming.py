@@ -0,0 +1,194 @@
+"""
+Streaming scan responses (NDJSON or Server-Sent Events)
+A streamed scan fetches and scores its tickers chunk by chunk and hands each result to
+the stream as soon as it is scored; the client sees one 'result' event per ticker and
+a final 'summary' event carrying scan_stats instead of waiting for the whole document
+"""
+
+import json
+import os
+import queue
+import threading
+
+NDJSON = 'ndjson'
+SSE = 'sse'
+CONTENT_TYPES = {NDJSON: 'application/x-ndjson', SSE: 'text/event-stream'}
+
+# Tickers fetched and scored per step of a streamed scan - smaller means earlier first results
+STREAM_CHUNK_SIZE = int(os.environ.get('SCAN_STREAM_CHUNK_SIZE', 10))
+# Idle seconds before a keep-alive is written so proxies don't drop a slow scan
+HEARTBEAT_SECONDS = float(os.environ.get('SCAN_STREAM_HEARTBEAT', 15))
+
+_DONE = object()
+
+
+def stream_format(accept=None, param=None):
+    """'ndjson' or 'sse' from a stream param or the Accept header; None means a plain JSON response"""
+    if param not in (None, '', False):
+        value = str(param).lower()
+        if value in ('sse', 'event-stream', 'text/event-stream'):
+            return SSE
+        if value in ('ndjson', 'true', '1', 'application/x-ndjson'):
+            return NDJSON
+        if value in ('false', '0', 'json'):
+            return None
+        raise ValueError(f"stream must be 'ndjson' or 'sse', got {param!r}")
+    accept = (accept or '').lower()
+    if 'text/event-stream' in accept:
+        return SSE
+    if 'application/x-ndjson' in accept:
+        return NDJSON
+    return None
+
+
+def stream_chunks(tickers, size=None):
+    size = size or STREAM_CHUNK_SIZE
+    return [tickers[i:i + size] for i in range(0, len(tickers), size)]
+
+
+def format_event(fmt, event, data, event_id=None):
+    """One encoded event: an NDJSON line {"event", "data"} or an SSE frame"""
+    payload = json.dumps(data, separators=(',', ':'))
+    if fmt == SSE:
+        frame = f"event: {event}\n"
+        if event_id is not None:
+            frame += f"id: {event_id}\n"
+        return (frame + f"data: {payload}\n\n").encode()
+    return f'{{"event":"{event}","data":{payload}}}\n'.encode()
+
+
+def heartbeat(fmt):
+    # SSE comments are ignored by EventSource; NDJSON readers get an explicit event to skip
+    return b": keep-alive\n\n" if fmt == SSE else b'{"event":"heartbeat"}\n'
+
+
+class ScanStream:
+    """Bridges a scan running on a worker thread to the response writer, one event per scored ticker"""
+
+    def __init__(self, streamer, fmt, matcher=None, heartbeat_seconds=None):
+        self.streamer = streamer
+        self.fmt = fmt
+        self.matcher = matcher
+        self.heartbeat_seconds = heartbeat_seconds or HEARTBEAT_SECONDS
+        self.queue = queue.Queue()
+        self.closed = threading.Event()
+        self.emitted = 0
+
+    @property
+    def content_type(self):
+        return CONTENT_TYPES[self.fmt]
+
+    def emit(self, result):
+        """on_result callback for the scan: queue one result (server-side filters apply, dropped after a disconnect)"""
+        if self.closed.is_set():
+            return
+        if self.matcher is None or self.matcher(result):
+            self.emitted += 1
+            self.queue.put(('result', result))
+
+    def _run(self, scan):
+        try:
+            scan_stats = scan(self.emit)
+            self.queue.put(('summary', {'success': True, 'streamed_results': self.emitted, 'scan_stats': scan_stats}))
+        except Exception as e:
+            self.queue.put(('error', {'success': False, 'error': str(e)}))
+        self.queue.put((_DONE, None))
+
+    def events(self, scan):
+        """Run scan(emit) -> scan_stats on a worker thread and yield encoded events as they arrive"""
+        worker = threading.Thread(target=self._run, args=(scan,), name='scan-stream', daemon=True)
+        worker.start()
+        self.streamer.opened()
+        sequence = 0
+        finished = False
+        try:
+            while True:
+                try:
+                    event, data = self.queue.get(timeout=self.heartbeat_seconds)
+                except queue.Empty:
+                    yield heartbeat(self.fmt)
+                    continue
+                if event is _DONE:
+                    finished = True
+                    break
+                sequence += 1
+                self.streamer.sent(event)
+                yield format_event(self.fmt, event, data, sequence)
+        finally:
+            # Generator closed early = client went away; the scan finishes but emits nothing more
+            self.closed.set()
+            self.streamer.closed(finished)
+
+
+class ScanStreamer:
+    """Creates scan streams and keeps process-wide counters for them"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {
+            'streams_opened': 0,
+            'streams_completed': 0,
+            'client_disconnects': 0,
+            'result_events': 0,
+            'summary_events': 0,
+            'error_events': 0,
+            'active_streams': 0
+        }
+
+    def open(self, fmt, matcher=None):
+        return ScanStream(self, fmt, matcher)
+
+    def opened(self):
+        with self.lock:
+            self.counters['streams_opened'] += 1
+            self.counters['active_streams'] += 1
+
+    def sent(self, event):
+        with self.lock:
+            self.counters[f"{event}_events"] += 1
+
+    def closed(self, finished):
+        with self.lock:
+            self.counters['active_streams'] -= 1
+            self.counters['streams_completed' if finished else 'client_disconnects'] += 1
+
+    def send(self, handler, stream, scan):
+        """Write a stream from a BaseHTTPRequestHandler: no Content-Length, flush per event, close when done"""
+        handler.send_response(200)
+        handler.send_header('Content-Type', stream.content_type)
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.send_header('X-Accel-Buffering', 'no')
+        handler.send_header('Access-Control-Allow-Origin', '*')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.close_connection = True
+        events = stream.events(scan)
+        try:
+            for chunk in events:
+                handler.wfile.write(chunk)
+                handler.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            events.close()
+
+    def buffered(self, fmt, results, scan_stats, matcher=None):
+        """The same events as one body, for handlers that must return the whole response at once"""
+        stream = self.open(fmt, matcher)
+
+        def scan(emit):
+            for result in results:
+                emit(result)
+            return scan_stats
+        return b''.join(stream.events(scan)).decode()
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+        snapshot['chunk_size'] = STREAM_CHUNK_SIZE
+        snapshot['heartbeat_seconds'] = HEARTBEAT_SECONDS
+        return snapshot
+
+
+# Process-wide streamer shared by the scan routes
+scan_streamer = ScanStreamer()
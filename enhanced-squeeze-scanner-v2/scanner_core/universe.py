@@ -0,0 +1,96 @@
+"""
+Immutable ticker universe registry
+Built once per process at import: category -> ticker tuples, the deduplicated master list,
+a frozenset for membership and a ticker -> categories reverse index. Behaves as a read-only
+mapping of categories so existing `universe[category]` / `.items()` code keeps working.
+TICKER_UNIVERSE_PATH replaces the built-in categories with a JSON ({category: [tickers]})
+or CSV (ticker,category rows) file
+"""
+
+import csv
+import json
+import os
+from collections.abc import Mapping
+from types import MappingProxyType
+
+UNIVERSE_PATH = os.environ.get('TICKER_UNIVERSE_PATH') or None
+
+
+def _symbol(ticker):
+    return str(ticker).strip().upper()
+
+
+class TickerUniverse(Mapping):
+    """Read-only category -> tuple(tickers) mapping with precomputed lookups"""
+
+    def __init__(self, categories, source='builtin'):
+        self.source = source
+        self._categories = MappingProxyType({
+            name: tuple(dict.fromkeys(_symbol(t) for t in tickers if _symbol(t)))
+            for name, tickers in categories.items()
+        })
+        # Category order, first appearance wins - the order scans walk the universe in
+        self.tickers = tuple(dict.fromkeys(t for tickers in self._categories.values() for t in tickers))
+        self.ticker_set = frozenset(self.tickers)
+        by_ticker = {}
+        for name, tickers in self._categories.items():
+            for ticker in tickers:
+                by_ticker.setdefault(ticker, []).append(name)
+        self.by_ticker = MappingProxyType({ticker: tuple(names) for ticker, names in by_ticker.items()})
+        self._category_sets = {name: frozenset(tickers) for name, tickers in self._categories.items()}
+
+    @classmethod
+    def from_file(cls, path):
+        """JSON {category: [tickers]} or CSV with ticker,category columns (header optional)"""
+        if path.lower().endswith('.csv'):
+            categories = {}
+            with open(path, newline='') as f:
+                for row in csv.reader(f):
+                    if len(row) < 2 or not row[0].strip() or row[0].strip().lower() == 'ticker':
+                        continue
+                    categories.setdefault(row[1].strip(), []).append(row[0])
+        else:
+            with open(path) as f:
+                categories = json.load(f)
+            if not isinstance(categories, dict):
+                raise ValueError(f"{path}: expected an object of category -> tickers")
+        return cls(categories, source=path)
+
+    def __getitem__(self, category):
+        return self._categories[category]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def has_ticker(self, ticker):
+        return ticker in self.ticker_set
+
+    def categories_of(self, ticker):
+        return self.by_ticker.get(ticker, ())
+
+    def in_category(self, ticker, category):
+        category_set = self._category_sets.get(category)
+        return category_set is not None and ticker in category_set
+
+    def select(self, categories):
+        """Tickers of the named categories, deduplicated in universe order; unknown names are ignored"""
+        wanted = [self._category_sets[name] for name in categories if name in self._category_sets]
+        return [ticker for ticker in self.tickers if any(ticker in category_set for category_set in wanted)]
+
+    def describe(self, sample=5):
+        return {
+            'categories': {name: len(tickers) for name, tickers in self._categories.items()},
+            'total_tickers': len(self.tickers),
+            'sample_tickers': {name: list(tickers[:sample]) for name, tickers in self._categories.items()},
+            'source': self.source
+        }
+
+
+def load_universe(default_categories, path=UNIVERSE_PATH):
+    """The scanner's built-in categories, or the TICKER_UNIVERSE_PATH file when one is configured"""
+    if path:
+        return TickerUniverse.from_file(path)
+    return TickerUniverse(default_categories)
@@ -0,0 +1,322 @@
+"""
+Server-side watchlist monitor
+Clients register watchlists (ticker + target score) under a client ID; one background
+poller scores every unique watched ticker once per interval, however many clients or
+tabs watch it, and pushes threshold crossings to subscribers over Server-Sent Events.
+An alert fires when a score reaches its target and re-arms only after the score drops
+RESET_MARGIN below the target (the hysteresis the browser monitor used). Polls spend the
+server's own Ortex key, never a client's; without one they are skipped and reported as
+no_ortex_key in stats and on the stream
+"""
+
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+from scanner_core.market_hours import is_extended_session
+from scanner_core.streaming import HEARTBEAT_SECONDS, SSE, format_event, heartbeat
+
+POLL_SECONDS = int(os.environ.get('WATCHLIST_POLL_SECONDS', 60))
+RESET_MARGIN = float(os.environ.get('WATCHLIST_RESET_MARGIN', 10))
+DEFAULT_TARGET_SCORE = 60
+# JSON file the watchlists are saved to; unset keeps them in memory only
+WATCHLIST_FILE = os.environ.get('WATCHLIST_FILE') or None
+# Events a slow subscriber may fall behind by before the oldest are dropped
+MAX_BACKLOG = 100
+MAX_CLIENT_ID_LENGTH = 64
+# Caps on what clients can make the poller scan: tickers per client, client IDs, watched items overall
+MAX_TICKERS_PER_CLIENT = int(os.environ.get('WATCHLIST_MAX_TICKERS', 50))
+MAX_CLIENTS = int(os.environ.get('WATCHLIST_MAX_CLIENTS', 500))
+MAX_WATCHED_ITEMS = int(os.environ.get('WATCHLIST_MAX_ITEMS', 2000))
+NO_ORTEX_KEY = 'no_ortex_key'
+
+
+def alert_type(score):
+    return 'critical' if score >= 80 else 'high' if score >= 60 else 'moderate'
+
+
+class WatchlistFull(RuntimeError):
+    """A watchlist cap is reached - remove tickers before adding new ones"""
+
+
+def _client(client_id):
+    client_id = str(client_id or '').strip()
+    if not client_id or len(client_id) > MAX_CLIENT_ID_LENGTH:
+        raise ValueError(f"client_id must be 1-{MAX_CLIENT_ID_LENGTH} characters")
+    return client_id
+
+
+class WatchlistMonitor:
+    """Per-client watchlists, a shared per-ticker poller and SSE fan-out of alerts and scores"""
+
+    def __init__(self, poll_seconds=None, path=None, market_hours_only=True):
+        self.poll_seconds = poll_seconds or POLL_SECONDS
+        self.path = path
+        self.market_hours_only = market_hours_only
+        # client id -> {ticker: item}
+        self.watchlists = {}
+        # client id -> [subscriber queues]
+        self.subscribers = {}
+        self.scorer = None
+        self.default_key = None
+        self.key_missing = False
+        self.thread = None
+        self.wake = threading.Event()
+        self.lock = threading.Lock()
+        self.last_poll = None
+        self.counters = {
+            'polls': 0,
+            'closed_market_skips': 0,
+            'tickers_polled': 0,
+            'items_checked': 0,
+            'alerts': 0,
+            'poll_errors': 0,
+            'no_key_skips': 0,
+            'events_dropped': 0,
+            'rejected_adds': 0
+        }
+        if path and os.path.exists(path):
+            self.watchlists = self._load(path)
+
+    @staticmethod
+    def _load(path):
+        # A corrupt or unreadable file must not stop the server importing; start empty instead
+        try:
+            with open(path) as f:
+                watchlists = json.load(f)
+            if not isinstance(watchlists, dict) or not all(isinstance(items, dict) for items in watchlists.values()):
+                raise ValueError('expected {client_id: {ticker: item}}')
+            return watchlists
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load watchlists from {path}, starting empty: {e}")
+            return {}
+
+    def set_scorer(self, scorer, default_key=None):
+        """scorer(tickers, ortex_key) -> {ticker: score}, scored with the server's default_key; starts the poller"""
+        self.scorer = scorer
+        self.default_key = default_key
+        self.start()
+
+    def ortex_key(self):
+        """The server key polls are billed to, or None"""
+        return self.default_key or None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._loop, name='watchlist-monitor', daemon=True)
+                self.thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                with self.lock:
+                    self.counters['poll_errors'] += 1
+                print(f"⚠️ Watchlist poll failed: {e}")
+            self.wake.wait(self.poll_seconds)
+            self.wake.clear()
+
+    def _save(self):
+        # Caller holds self.lock
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.watchlists, f)
+        os.replace(temp_path, self.path)
+
+    def add(self, client_id, ticker, target_score=None, price_target=None):
+        """Add or update one watched ticker; returns the item, raises WatchlistFull past a cap"""
+        client_id = _client(client_id)
+        ticker = str(ticker or '').strip().upper()
+        if not ticker:
+            raise ValueError('ticker is required')
+        try:
+            target_score = float(DEFAULT_TARGET_SCORE if target_score in (None, '') else target_score)
+            price_target = None if price_target in (None, '') else float(price_target)
+        except (TypeError, ValueError):
+            raise ValueError('target_score and price_target must be numbers')
+
+        with self.lock:
+            items = self.watchlists.get(client_id, {})
+            if ticker not in items:
+                self._check_caps(client_id, items)
+            items = self.watchlists.setdefault(client_id, items)
+            item = items.get(ticker)
+            if item is None:
+                item = items[ticker] = {
+                    'ticker': ticker,
+                    'added_at': datetime.now().isoformat(),
+                    'last_check': None,
+                    'last_score': None,
+                    'triggered': False
+                }
+            elif item['target_score'] != target_score:
+                # New target, fresh hysteresis
+                item['triggered'] = False
+            item.update(target_score=target_score, price_target=price_target)
+            self._save()
+            item = dict(item)
+        # New tickers get a score on the next pass rather than a minute later
+        self.wake.set()
+        return item
+
+    def _check_caps(self, client_id, items):
+        # Caller holds self.lock; updates to tickers already watched are always allowed
+        if not items and len(self.watchlists) >= MAX_CLIENTS:
+            reason = f"Watchlist server is full ({MAX_CLIENTS} clients)"
+        elif len(items) >= MAX_TICKERS_PER_CLIENT:
+            reason = f"Watchlist is full ({MAX_TICKERS_PER_CLIENT} tickers) - remove one first"
+        elif sum(len(watched) for watched in self.watchlists.values()) >= MAX_WATCHED_ITEMS:
+            reason = f"Watchlist server is full ({MAX_WATCHED_ITEMS} watched tickers)"
+        else:
+            return
+        self.counters['rejected_adds'] += 1
+        raise WatchlistFull(reason)
+
+    def remove(self, client_id, ticker):
+        client_id = _client(client_id)
+        with self.lock:
+            removed = self.watchlists.get(client_id, {}).pop(str(ticker).upper(), None) is not None
+            if client_id in self.watchlists and not self.watchlists[client_id]:
+                del self.watchlists[client_id]
+            if removed:
+                self._save()
+        return removed
+
+    def items(self, client_id):
+        client_id = _client(client_id)
+        with self.lock:
+            return [dict(item) for item in self.watchlists.get(client_id, {}).values()]
+
+    def tickers(self):
+        """Every ticker any client watches, once"""
+        with self.lock:
+            return sorted({ticker for items in self.watchlists.values() for ticker in items})
+
+    def poll_once(self, force=False):
+        """Score each watched ticker once and notify the clients watching it"""
+        if self.scorer is None:
+            return
+        if self.market_hours_only and not force and not is_extended_session():
+            with self.lock:
+                self.counters['closed_market_skips'] += 1
+            return
+        tickers = self.tickers()
+        if not tickers:
+            return
+        ortex_key = self.ortex_key()
+        if not ortex_key:
+            # Scoring without Ortex data gives every ticker 0 and no alert could ever fire
+            with self.lock:
+                self.counters['no_key_skips'] += 1
+                newly_missing, self.key_missing = not self.key_missing, True
+                clients = list(self.watchlists)
+            if newly_missing:
+                print("⚠️ Watchlist poll skipped: no Ortex API key (set ORTEX_API_KEY)")
+                for client_id in clients:
+                    self._publish(client_id, 'status', {'status': NO_ORTEX_KEY})
+            return
+        with self.lock:
+            self.key_missing = False
+
+        scores = self.scorer(tickers, ortex_key)
+        checked_at = datetime.now().isoformat()
+        notifications = []
+        with self.lock:
+            self.counters['polls'] += 1
+            self.counters['tickers_polled'] += len(tickers)
+            self.last_poll = checked_at
+            for client_id, items in self.watchlists.items():
+                alerts = []
+                for ticker, item in items.items():
+                    score = scores.get(ticker)
+                    if score is None:
+                        continue
+                    self.counters['items_checked'] += 1
+                    item['last_check'] = checked_at
+                    item['last_score'] = score
+                    if score >= item['target_score'] and not item['triggered']:
+                        item['triggered'] = True
+                        alerts.append({
+                            'ticker': ticker,
+                            'score': score,
+                            'target_score': item['target_score'],
+                            'type': alert_type(score),
+                            'timestamp': checked_at
+                        })
+                    elif score < item['target_score'] - RESET_MARGIN:
+                        item['triggered'] = False
+                self.counters['alerts'] += len(alerts)
+                notifications.append((client_id, alerts, [dict(item) for item in items.values()]))
+            self._save()
+
+        for client_id, alerts, items in notifications:
+            for alert in alerts:
+                self._publish(client_id, 'alert', alert)
+            self._publish(client_id, 'scores', {'items': items, 'checked_at': checked_at})
+
+    def _publish(self, client_id, event, data):
+        with self.lock:
+            subscribers = list(self.subscribers.get(client_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event, data))
+            except queue.Full:
+                # Slow reader: drop its oldest event rather than block the poller
+                try:
+                    subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+                subscriber.put_nowait((event, data))
+                with self.lock:
+                    self.counters['events_dropped'] += 1
+
+    def events(self, client_id, fmt=SSE, heartbeat_seconds=None):
+        """Generator of encoded events for one subscriber: the current watchlist, then scores and alerts"""
+        client_id = _client(client_id)
+        subscriber = queue.Queue(maxsize=MAX_BACKLOG)
+        with self.lock:
+            self.subscribers.setdefault(client_id, []).append(subscriber)
+        try:
+            yield format_event(fmt, 'watchlist', {'items': self.items(client_id)})
+            if self.key_missing:
+                yield format_event(fmt, 'status', {'status': NO_ORTEX_KEY})
+            while True:
+                try:
+                    event, data = subscriber.get(timeout=heartbeat_seconds or HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield heartbeat(fmt)
+                    continue
+                yield format_event(fmt, event, data)
+        finally:
+            with self.lock:
+                remaining = [q for q in self.subscribers.get(client_id, []) if q is not subscriber]
+                if remaining:
+                    self.subscribers[client_id] = remaining
+                else:
+                    self.subscribers.pop(client_id, None)
+
+    def stats(self):
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot['clients'] = len(self.watchlists)
+            snapshot['watched_items'] = sum(len(items) for items in self.watchlists.values())
+            snapshot['unique_tickers'] = len({t for items in self.watchlists.values() for t in items})
+            snapshot['subscribers'] = sum(len(queues) for queues in self.subscribers.values())
+            snapshot['last_poll'] = self.last_poll
+            snapshot['limits'] = {'tickers_per_client': MAX_TICKERS_PER_CLIENT, 'clients': MAX_CLIENTS,
+                                  'watched_items': MAX_WATCHED_ITEMS}
+            snapshot['status'] = NO_ORTEX_KEY if self.key_missing else 'ok'
+        snapshot['poll_seconds'] = self.poll_seconds
+        snapshot['poller_running'] = bool(self.thread and self.thread.is_alive())
+        snapshot['market_session_open'] = is_extended_session()
+        return snapshot
+
+
+# Process-wide monitor; the server that owns scoring installs the scorer
+watchlist_monitor = WatchlistMonitor(path=WATCHLIST_FILE)
@@ -0,0 +1,179 @@
+"""
+Batched Yahoo Finance price provider
+Fetches many symbols per request from the multi-symbol quote endpoint, falling back
+to the per-ticker chart endpoint for failed chunks or symbols missing from a response
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+from scanner_core.http_client import http_client
+from scanner_core.scan_engine import scan_engine
+from scanner_core.single_flight import price_flight
+
+# Statuses that mean the quote endpoint itself is unavailable (e.g. crumb required), not just one chunk
+QUOTE_DISABLE_STATUSES = (401, 403, 404)
+
+
+def build_price_entry(ticker, current_price, previous_close, volume, market_cap=0):
+    """Price dict in the shape calculate_squeeze_score and the scan handlers consume"""
+    current_price = current_price or 0
+    previous_close = previous_close or 0
+    price_change = current_price - previous_close if previous_close else 0
+    price_change_pct = (price_change / previous_close * 100) if previous_close else 0
+
+    return {
+        'ticker': ticker,
+        'current_price': round(current_price, 2),
+        'previous_close': round(previous_close, 2),
+        'price_change': round(price_change, 2),
+        'price_change_pct': round(price_change_pct, 2),
+        'volume': volume or 0,
+        'market_cap': market_cap or 0,
+        'success': True
+    }
+
+
+class YahooQuoteProvider:
+    """Multi-symbol quote fetcher with chunking and per-chunk chart fallback"""
+
+    def __init__(self, base_url=None, chunk_size=None, timeout=5, disable_seconds=300):
+        self.base_url = (base_url or os.environ.get('YAHOO_BASE_URL', 'https://query1.finance.yahoo.com')).rstrip('/')
+        self.chunk_size = chunk_size or int(os.environ.get('YAHOO_QUOTE_CHUNK_SIZE', 50))
+        self.timeout = timeout
+        self.disable_seconds = disable_seconds
+        self.host = urllib.parse.urlsplit(self.base_url).hostname
+        self.headers = {'User-Agent': 'Mozilla/5.0 (compatible; SqueezeScanner/1.0)'}
+        self.quote_disabled_until = 0
+        self.lock = threading.Lock()
+        self.counters = {
+            'batch_requests': 0,
+            'symbols_batched': 0,
+            'chunk_failures': 0,
+            'chart_fallbacks': 0,
+            'chart_failures': 0
+        }
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def quote_url(self, symbols):
+        return f"{self.base_url}/v7/finance/quote?symbols={urllib.parse.quote(','.join(symbols), safe=',')}"
+
+    def chart_url(self, ticker):
+        return f"{self.base_url}/v8/finance/chart/{urllib.parse.quote(ticker)}"
+
+    def fetch_chunk(self, symbols, timeout=None, deadline=None):
+        """Fetch one chunk from the quote endpoint; returns {ticker: entry} or None if the chunk failed"""
+        self._count('batch_requests')
+        # Capped when the call starts, not when it was queued, so it never outlives the scan
+        timeout = deadline.timeout(timeout or self.timeout) if deadline is not None else timeout
+        try:
+            response = http_client.get(self.quote_url(symbols), self.headers, timeout or self.timeout)
+        except Exception:
+            self._count('chunk_failures')
+            return None
+
+        if response.status != 200:
+            self._count('chunk_failures')
+            if response.status in QUOTE_DISABLE_STATUSES:
+                # Skip straight to the chart endpoint for a while instead of failing every chunk
+                self.quote_disabled_until = time.monotonic() + self.disable_seconds
+            return None
+
+        try:
+            rows = json.loads(response.body.decode('utf-8'))['quoteResponse']['result'] or []
+        except (ValueError, KeyError, TypeError):
+            self._count('chunk_failures')
+            return None
+
+        quotes = {}
+        for row in rows:
+            symbol = (row.get('symbol') or '').upper()
+            if symbol and row.get('regularMarketPrice') is not None:
+                quotes[symbol] = build_price_entry(
+                    symbol,
+                    row.get('regularMarketPrice'),
+                    row.get('regularMarketPreviousClose'),
+                    row.get('regularMarketVolume'),
+                    row.get('marketCap')
+                )
+        self._count('symbols_batched', len(quotes))
+        return quotes
+
+    def fetch_chart(self, ticker, timeout=None, deadline=None):
+        """Per-ticker chart lookup used as the fallback path"""
+        self._count('chart_fallbacks')
+        timeout = deadline.timeout(timeout or self.timeout) if deadline is not None else timeout
+        try:
+            response = http_client.get(self.chart_url(ticker), self.headers, timeout or self.timeout)
+            if response.status == 200:
+                data = json.loads(response.body.decode('utf-8'))
+                if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
+                    meta = data['chart']['result'][0].get('meta', {})
+                    return build_price_entry(
+                        ticker,
+                        meta.get('regularMarketPrice', 0),
+                        meta.get('previousClose', 0),
+                        meta.get('regularMarketVolume', 0),
+                        meta.get('marketCap', 0)
+                    )
+        except Exception:
+            pass
+
+        self._count('chart_failures')
+        return {'ticker': ticker, 'success': False}
+
+    def get_prices(self, tickers, timeout=None, deadline=None):
+        """Return {ticker: price entry} for every ticker that resolved, batching where possible"""
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        requested = {ticker.upper(): ticker for ticker in tickers}
+        price_data = {}
+        missing = tickers
+
+        def budget():
+            return deadline.remaining() if deadline is not None else None
+
+        if deadline is not None:
+            timeout = deadline.timeout(timeout or self.timeout)
+
+        if tickers and time.monotonic() >= self.quote_disabled_until:
+            chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+            chunk_results = scan_engine.map_blocking({
+                index: (self.host, self.fetch_chunk, (chunk, timeout, deadline)) for index, chunk in enumerate(chunks)
+            }, budget=budget())
+            for quotes in chunk_results.values():
+                if isinstance(quotes, dict):
+                    for symbol, entry in quotes.items():
+                        if symbol in requested:
+                            price_data[requested[symbol]] = dict(entry, ticker=requested[symbol])
+            missing = [ticker for ticker in tickers if ticker not in price_data]
+
+        if missing and not (deadline is not None and deadline.expired()):
+            # Failed chunks and symbols absent from a response fall back to the chart endpoint
+            if deadline is not None:
+                timeout = deadline.timeout(timeout)
+            chart_results = scan_engine.map_blocking({
+                ticker: (self.host, price_flight.do, (ticker, self.fetch_chart, ticker, timeout, deadline))
+                for ticker in missing
+            }, budget=budget())
+            for ticker, result in chart_results.items():
+                if isinstance(result, dict) and result.get('success'):
+                    price_data[ticker] = result
+
+        return price_data
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        counters['chunk_size'] = self.chunk_size
+        counters['quote_endpoint_enabled'] = time.monotonic() >= self.quote_disabled_until
+        return counters
+
+
+# Process-wide provider shared by every scanner variant
+yahoo_quotes = YahooQuoteProvider()
@@ -6,6 +6,8 @@ class SqueezeMonitor {
         this.priceTargets = {};
         this.soundEnabled = true;
         this.notificationPermission = false;
+        this.clientId = this.getClientId();
+        this.eventSource = null;
         this.init();
     }
 
@@ -23,7 +25,16 @@ class SqueezeMonitor {
         }
     }
 
-    // Advanced watchlist management
+    // Advanced watchlist management - the server stores watchlists and polls each ticker once for every client
+    getClientId() {
+        let clientId = localStorage.getItem('squeezeClientId');
+        if (!clientId) {
+            clientId = 'client-' + Math.random().toString(36).slice(2) + Date.now().toString(36);
+            localStorage.setItem('squeezeClientId', clientId);
+        }
+        return clientId;
+    }
+
     addToWatchlist(ticker, targetScore = 60, priceTarget = null) {
         if (!this.watchlist.find(item => item.ticker === ticker)) {
             const watchItem = {
@@ -38,6 +49,7 @@ class SqueezeMonitor {
             
             this.watchlist.push(watchItem);
             this.saveWatchlist();
+            this.saveToServer(watchItem);
             this.showToast(`${ticker} added to watchlist`, 'success');
             return true;
         }
@@ -47,10 +59,35 @@ class SqueezeMonitor {
     removeFromWatchlist(ticker) {
         this.watchlist = this.watchlist.filter(item => item.ticker !== ticker);
         this.saveWatchlist();
+        fetch(`/api/watchlist/${encodeURIComponent(ticker)}?client_id=${encodeURIComponent(this.clientId)}`, {
+            method: 'DELETE'
+        }).catch(error => console.error(`Error removing ${ticker}:`, error));
         this.showToast(`${ticker} removed from watchlist`, 'info');
     }
 
+    saveToServer(item) {
+        return fetch('/api/watchlist', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                client_id: this.clientId,
+                ticker: item.ticker,
+                target_score: item.targetScore,
+                price_target: item.priceTarget
+            })
+        }).then(response => {
+            if (response.status === 409) {
+                // Watchlist cap reached: drop the local copy the server refused
+                this.watchlist = this.watchlist.filter(watched => watched.ticker !== item.ticker);
+                this.saveWatchlist();
+                this.updateWatchlistDisplay();
+                response.json().then(data => this.showToast(data.error, 'warning'));
+            }
+        }).catch(error => console.error(`Error saving ${item.ticker}:`, error));
+    }
+
     saveWatchlist() {
+        // Local copy only renders the list before the server answers
         localStorage.setItem('squeezeWatchlist', JSON.stringify(this.watchlist));
     }
 
@@ -61,58 +98,56 @@ class SqueezeMonitor {
         }
     }
 
-    // Real-time monitoring
-    async startMonitoring() {
-        // Check every minute during market hours
-        setInterval(() => {
-            const now = new Date();
-            const hour = now.getHours();
-            const day = now.getDay();
-            
-            // Only monitor during extended market hours (4 AM - 8 PM ET, Mon-Fri)
-            if (day > 0 && day < 6 && hour >= 4 && hour <= 20) {
-                this.checkWatchlist();
-            }
-        }, 60000); // Check every minute
+    fromServer(item) {
+        return {
+            ticker: item.ticker,
+            targetScore: item.target_score,
+            priceTarget: item.price_target,
+            addedAt: item.added_at,
+            lastCheck: item.last_check,
+            lastScore: item.last_score,
+            triggered: item.triggered
+        };
     }
 
-    async checkWatchlist() {
-        if (this.watchlist.length === 0) return;
-        
-        for (const item of this.watchlist) {
-            // Skip if already triggered in last hour
-            if (item.triggered && 
-                new Date() - new Date(item.lastCheck) < 3600000) {
-                continue;
-            }
-            
-            try {
-                // Simulate API call - replace with actual API
-                const score = await this.getSqueezeScore(item.ticker);
-                
-                item.lastCheck = new Date().toISOString();
-                item.lastScore = score;
-                
-                // Check if alert should trigger
-                if (score >= item.targetScore && !item.triggered) {
-                    this.triggerAlert(item, score);
-                    item.triggered = true;
-                } else if (score < item.targetScore - 10) {
-                    // Reset trigger if score drops significantly
-                    item.triggered = false;
-                }
-            } catch (error) {
-                console.error(`Error checking ${item.ticker}:`, error);
-            }
-        }
-        
+    applyServerItems(items) {
+        this.watchlist = items.map(item => this.fromServer(item));
         this.saveWatchlist();
         this.updateWatchlistDisplay();
     }
 
-    async getSqueezeScore(ticker) {
-        // Simulate score - replace with actual API call
-        return Math.random() * 100;
+    // Real-time monitoring: alerts and scores are pushed over SSE (the server polls during market hours)
+    startMonitoring() {
+        const url = `/api/watchlist/stream?client_id=${encodeURIComponent(this.clientId)}`;
+        this.eventSource = new EventSource(url);
+        
+        this.eventSource.addEventListener('watchlist', event => {
+            const items = JSON.parse(event.data).items;
+            if (items.length === 0 && this.watchlist.length > 0) {
+                // First connection for a browser-only watchlist: move it to the server
+                this.watchlist.forEach(item => this.saveToServer(item));
+                return;
+            }
+            this.applyServerItems(items);
+        });
+        
+        this.eventSource.addEventListener('scores', event => {
+            this.applyServerItems(JSON.parse(event.data).items);
+        });
+        
+        this.eventSource.addEventListener('status', event => {
+            if (JSON.parse(event.data).status === 'no_ortex_key') {
+                this.showToast('Watchlist paused: the server has no Ortex API key configured', 'warning');
+            }
+        });
+        
+        this.eventSource.addEventListener('alert', event => {
+            const alert = JSON.parse(event.data);
+            this.triggerAlert({ ticker: alert.ticker, targetScore: alert.target_score }, alert.score);
+        });
+        
+        // EventSource reconnects on its own after errors
+        this.eventSource.onerror = () => console.log('Watchlist stream interrupted - reconnecting');
     }
 
     triggerAlert(item, score) {
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Bytes and encode time for a scan response under each JSON encoding
+Builds a comprehensive-scan response (ortex_data, score_breakdown, risk factors) for N
+tickers and serializes it the old way (default separators, an ISO timestamp per row) and
+through scanner_core.json_response: stdlib compact, orjson when installed, and columnar,
+each raw and gzipped. Also checks that the columnar table round-trips
+
+    python tools/json_benchmark.py                # 1,000 tickers
+    python tools/json_benchmark.py --tickers 5000 --repeat 20
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scanner_core import json_response
+from scanner_core.json_response import from_columns, to_columns
+from scanner_core.scoring_profiles import profile_registry
+
+
+def scan_response(count, per_row_timestamp, seed=42):
+    """Response shaped like /api/comprehensive-scan, scored with the advanced profile"""
+    rng = random.Random(seed)
+    profile = profile_registry.get('advanced')
+    results = []
+    for i in range(count):
+        ortex = {
+            'short_interest': round(rng.uniform(0, 60), 1),
+            'utilization': round(rng.uniform(0, 100), 1),
+            'cost_to_borrow': round(rng.uniform(0, 120), 2),
+            'days_to_cover': round(rng.uniform(0, 20), 2),
+            'data_quality': 'realistic_estimate',
+            'source': 'enhanced_modeling'
+        }
+        price = {
+            'current_price': round(rng.uniform(1, 500), 2),
+            'price_change': round(rng.uniform(-15, 15), 2),
+            'price_change_pct': round(rng.uniform(-30, 40), 2),
+            'volume': rng.randint(0, 80000000),
+            'market_cap': rng.randint(10 ** 7, 10 ** 12)
+        }
+        evaluation = profile.evaluate(ortex, price)
+        result = {
+            'ticker': f"T{i:04d}",
+            'squeeze_score': evaluation['score'],
+            'squeeze_type': evaluation['level'],
+            'current_price': price['current_price'],
+            'price_change': price['price_change'],
+            'price_change_pct': price['price_change_pct'],
+            'volume': price['volume'],
+            'market_cap': price['market_cap'],
+            'ortex_data': ortex,
+            'score_breakdown': evaluation['breakdown'],
+            'risk_factors': evaluation['risk_factors'],
+            'data_quality': ortex['data_quality']
+        }
+        if per_row_timestamp:
+            result['timestamp'] = datetime.now().isoformat()
+        results.append(result)
+    return {
+        'success': True,
+        'scan_results': results,
+        'scan_stats': {'total_scanned': count, 'scan_time_seconds': 4.2, 'timestamp': datetime.now().isoformat()}
+    }
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def stripped(rows):
+    """Rows as from_columns returns them: null members dropped from nested objects"""
+    return [{key: ({k: v for k, v in value.items() if v is not None} if isinstance(value, dict) else value)
+             for key, value in row.items()} for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON response encoding benchmark')
+    parser.add_argument('--tickers', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    before = scan_response(args.tickers, per_row_timestamp=True)
+    after = scan_response(args.tickers, per_row_timestamp=False)
+    compact_stdlib = lambda data: json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    variants = [('before: json.dumps, timestamp per row', before, lambda data: json.dumps(data).encode())]
+    variants.append(('stdlib compact', after, compact_stdlib))
+    if json_response.orjson is not None:
+        variants.append(('orjson compact', after, json_response.orjson.dumps))
+    backend = 'orjson' if json_response.orjson is not None else 'stdlib'
+    variants.append((f"columnar + {backend}", after,
+                     lambda data: json_response.dumps(dict(data, scan_results=to_columns(data['scan_results'])))))
+
+    print(f"📊 {args.tickers}-ticker scan response, best of {args.repeat}")
+    print(f"   {'encoding':40s} {'bytes':>10s} {'encode ms':>10s} {'gzip bytes':>11s} {'gzip ms':>8s}")
+    baseline = None
+    for label, data, encode in variants:
+        encode_time, body = timed(lambda: encode(data), args.repeat)
+        gzip_time, compressed = timed(lambda: gzip.compress(body, json_response.GZIP_LEVEL), args.repeat)
+        baseline = baseline or len(body)
+        print(f"   {label:40s} {len(body):10,d} {encode_time * 1000:10.2f} {len(compressed):11,d} "
+              f"{gzip_time * 1000:8.2f}   ({len(body) / baseline:5.1%} of before)")
+
+    rows = after['scan_results']
+    table = to_columns(rows)
+    round_trip = from_columns(table) == stripped(rows)
+    print(f"\n🧮 columnar: {len(table['fields'])} fields, round trip {'✅ identical' if round_trip else '❌ differs'}")
+    return 0 if round_trip else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
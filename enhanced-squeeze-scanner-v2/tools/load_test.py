@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Concurrent-scan load test for the BaseHTTPRequestHandler scanners
+Fires POST scans from N concurrent keep-alive clients and reports throughput, latency
+percentiles and 503s. By default it starts a Yahoo stub (with per-request latency so scans
+are I/O bound) and compares the scanner on a plain single-threaded HTTPServer with the
+same handler on scanner_core.http_server's pooled server, in-process
+
+    python tools/load_test.py                               # production, 16 clients
+    python tools/load_test.py --app scanner_enhanced --path /api/comprehensive-scan
+    python tools/load_test.py --clients 64 --threads 8 --max-queue 8   # show load shedding
+    python tools/load_test.py --url http://127.0.0.1:8000   # an already running server (e.g. --workers 4)
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import HTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_clients(url, path, body, clients, requests_per_client):
+    """Each client keeps one connection open and reconnects after a close or 503"""
+    target = urllib.parse.urlsplit(url)
+    payload = json.dumps(body).encode()
+    latencies, statuses, reconnects = [], {}, [0]
+    lock = threading.Lock()
+
+    def client():
+        connection = None
+        for _ in range(requests_per_client):
+            if connection is None:
+                connection = http.client.HTTPConnection(target.hostname, target.port, timeout=120)
+            start = time.perf_counter()
+            try:
+                connection.request('POST', path, payload, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                closed = response.will_close
+            except (OSError, http.client.HTTPException) as e:
+                status, closed = type(e).__name__, True
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+                if closed:
+                    reconnects[0] += 1
+            if closed:
+                connection.close()
+                connection = None
+        if connection is not None:
+            connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return {
+        'wall_seconds': wall,
+        'ok': len(latencies),
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'p50': percentile(latencies, 0.5),
+        'p95': percentile(latencies, 0.95),
+        'statuses': statuses,
+        'reconnects': reconnects[0]
+    }
+
+
+def report(label, result):
+    print(f"\n🎯 {label}")
+    print(f"   {result['ok']} scans in {result['wall_seconds']:.2f}s  ->  {result['throughput']:.1f} scans/s")
+    print(f"   latency p50 {result['p50'] * 1000:8.1f} ms   p95 {result['p95'] * 1000:8.1f} ms")
+    print(f"   statuses {result['statuses']}   reconnects {result['reconnects']}")
+
+
+def serve_in_thread(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent-scan load test')
+    parser.add_argument('--url', help='load an already running server instead of in-process ones')
+    parser.add_argument('--app', default='production', help='scanner module in api/ for in-process runs')
+    parser.add_argument('--path', default='/api/scan')
+    parser.add_argument('--body', default='{"filters": {"max_tickers": 10}}', help='JSON scan request')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=5, help='scans per client')
+    parser.add_argument('--threads', type=int, default=16, help='pooled server threads')
+    parser.add_argument('--max-queue', type=int, default=64, help='pooled server queue depth')
+    parser.add_argument('--stub-latency', type=float, default=0.1, help='seconds per Yahoo stub request')
+    parser.add_argument('--skip-single', action='store_true', help='only run the pooled server')
+    args = parser.parse_args()
+    body = json.loads(args.body)
+
+    if args.url:
+        report(args.url, run_clients(args.url, args.path, body, args.clients, args.requests))
+        return 0
+
+    from yahoo_stub_server import StubHandler, StubServer
+    StubHandler.latency = args.stub_latency
+    stub = StubServer(('127.0.0.1', 0), StubHandler)
+    os.environ['YAHOO_BASE_URL'] = serve_in_thread(stub)
+
+    from scanner_core.http_server import PooledHTTPServer, load_handler
+    handler_class = load_handler(args.app)
+    handler_class.log_message = lambda self, format, *log_args: None
+    print(f"🧪 {args.app} {args.path}: {args.clients} clients x {args.requests} scans, "
+          f"Yahoo stub latency {args.stub_latency}s")
+
+    if not args.skip_single:
+        single = HTTPServer(('127.0.0.1', 0), handler_class)
+        report('HTTPServer (single-threaded)', run_clients(serve_in_thread(single), args.path, body,
+                                                           args.clients, args.requests))
+        single.shutdown()
+        single.server_close()
+
+    pooled = PooledHTTPServer(('127.0.0.1', 0), handler_class, args.threads, args.max_queue)
+    result = run_clients(serve_in_thread(pooled), args.path, body, args.clients, args.requests)
+    report(f"PooledHTTPServer ({args.threads} threads, queue {args.max_queue}, keep-alive)", result)
+    print(f"   server {pooled.stats()}")
+    pooled.shutdown()
+    pooled.drain(timeout=5)
+    stub.shutdown()
+    return 0 if result['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
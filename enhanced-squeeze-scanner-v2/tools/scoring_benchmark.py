@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Benchmark and equivalence check for the batch scorer and the scoring-profile registry
+Scores the same random universe with each per-ticker scorer, with
+scanner_core.batch_scoring and with every scoring profile, asserts
+identical results, and prints timings
+
+    python tools/scoring_benchmark.py                 # 10k rows, every model and profile
+    python tools/scoring_benchmark.py --rows 50000 --model advanced
+    python tools/scoring_benchmark.py --profiles-only # no NumPy needed
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+
+from scanner_core import batch_scoring
+from scanner_core.scoring_profiles import profile_registry, score_profiles
+
+
+def load_scalar_scorers():
+    """The existing per-ticker scorers, keyed by batch model name (self is unused by all of them)"""
+    import production
+    import scanner_enhanced
+    import scanner_optimized
+
+    scorers = {
+        'production': lambda o, p: production.handler.calculate_squeeze_score(None, o, p),
+        'optimized': lambda o, p: scanner_optimized.handler.calculate_squeeze_score_optimized(None, o, p),
+        'advanced': lambda o, p: scanner_enhanced.handler.calculate_squeeze_score_advanced(None, o, p)
+    }
+    try:
+        import index_enhanced
+        scorers['enhanced'] = lambda o, p: index_enhanced.OptimizedSqueezeAPI.calculate_enhanced_score(None, o, p)
+    except ImportError as e:
+        print(f"⚠️  Skipping enhanced model ({e})")
+    return scorers
+
+
+def root_index_formula(ortex_data, price_data):
+    """The root Vercel app's (api/index.py) inline scan formula - the index profile's reference"""
+    short_interest = ortex_data.get('short_interest', 0)
+    cost_to_borrow = ortex_data.get('cost_to_borrow', 0)
+    price_change_pct = (price_data or {}).get('price_change_pct', 0)
+
+    score = 0
+    score += min(short_interest * 1.5, 40)  # Short Interest (0-40 points)
+    score += min(cost_to_borrow * 1.2, 25)  # Cost to Borrow (0-25 points)
+    score += min(max(0, price_change_pct) * 0.8, 15)  # Price momentum (0-15 points)
+    squeeze_score = min(int(score), 100)
+
+    if squeeze_score >= 80:
+        risk_type = "EXTREME SQUEEZE RISK"
+    elif squeeze_score >= 60:
+        risk_type = "HIGH SQUEEZE RISK"
+    elif squeeze_score >= 40:
+        risk_type = "MODERATE SQUEEZE RISK"
+    else:
+        risk_type = "Low Risk"
+    return (squeeze_score, risk_type, None, None)
+
+
+def professional_ladders(ortex_data, price_data):
+    """index_backup.calculate_squeeze_score as hand-written if/elif ladders - the professional profile's reference"""
+    if not ortex_data:
+        return 50  # Default score
+
+    score = 0
+    details = {'breakdown': {}, 'risk_factors': []}
+
+    # 1. Short Interest Analysis (0-35 points) - Most Important
+    si = ortex_data.get('short_interest', 0)
+    si_score = 0
+    if si >= 40:
+        si_score = 35
+        details['risk_factors'].append('EXTREME_SHORT_INTEREST')
+    elif si >= 30:
+        si_score = 30
+        details['risk_factors'].append('VERY_HIGH_SHORT_INTEREST')
+    elif si >= 20:
+        si_score = 25
+        details['risk_factors'].append('HIGH_SHORT_INTEREST')
+    elif si >= 15:
+        si_score = 15
+    elif si >= 10:
+        si_score = 8
+    elif si >= 5:
+        si_score = 3
+
+    score += si_score
+    details['breakdown']['short_interest'] = si_score
+
+    # 2. Utilization Rate (0-25 points)
+    util = ortex_data.get('utilization', 0)
+    util_score = 0
+    if util >= 98:
+        util_score = 25
+        details['risk_factors'].append('MAXED_UTILIZATION')
+    elif util >= 95:
+        util_score = 22
+        details['risk_factors'].append('CRITICAL_UTILIZATION')
+    elif util >= 90:
+        util_score = 20
+    elif util >= 85:
+        util_score = 18
+    elif util >= 80:
+        util_score = 15
+    elif util >= 75:
+        util_score = 12
+    elif util >= 60:
+        util_score = 8
+    elif util >= 40:
+        util_score = 4
+
+    score += util_score
+    details['breakdown']['utilization'] = util_score
+
+    # 3. Cost to Borrow (0-25 points)
+    ctb = ortex_data.get('cost_to_borrow', 0)
+    ctb_score = 0
+    if ctb >= 50:
+        ctb_score = 25
+        details['risk_factors'].append('EXTREME_BORROW_COST')
+    elif ctb >= 30:
+        ctb_score = 22
+        details['risk_factors'].append('VERY_HIGH_BORROW_COST')
+    elif ctb >= 20:
+        ctb_score = 20
+    elif ctb >= 15:
+        ctb_score = 18
+    elif ctb >= 10:
+        ctb_score = 15
+    elif ctb >= 8:
+        ctb_score = 12
+    elif ctb >= 5:
+        ctb_score = 10
+    elif ctb >= 3:
+        ctb_score = 6
+    elif ctb >= 1:
+        ctb_score = 3
+
+    score += ctb_score
+    details['breakdown']['cost_to_borrow'] = ctb_score
+
+    # 4. Days to Cover (0-15 points)
+    dtc = ortex_data.get('days_to_cover', 0)
+    dtc_score = 0
+    if dtc >= 10:
+        dtc_score = 15
+        details['risk_factors'].append('EXTREME_DAYS_TO_COVER')
+    elif dtc >= 7:
+        dtc_score = 13
+    elif dtc >= 5:
+        dtc_score = 11
+    elif dtc >= 4:
+        dtc_score = 10
+    elif dtc >= 3:
+        dtc_score = 8
+    elif dtc >= 2:
+        dtc_score = 5
+    elif dtc >= 1:
+        dtc_score = 2
+
+    score += dtc_score
+    details['breakdown']['days_to_cover'] = dtc_score
+
+    # 5. Price Action Momentum Bonus (0-10 points)
+    if price_data:
+        price_change = price_data.get('price_change', 0)
+        volume = price_data.get('volume', 0)
+
+        momentum_score = 0
+        if price_change > 10:  # Strong upward momentum
+            momentum_score = 10
+            details['risk_factors'].append('STRONG_UPWARD_MOMENTUM')
+        elif price_change > 5:
+            momentum_score = 7
+        elif price_change > 2:
+            momentum_score = 4
+        elif price_change > 0:
+            momentum_score = 2
+        elif price_change < -10:  # Strong downward pressure could indicate covering
+            momentum_score = -5
+
+        # Volume amplification
+        if volume > 50000000:  # High volume
+            momentum_score += 2
+            details['risk_factors'].append('HIGH_VOLUME')
+        elif volume > 20000000:
+            momentum_score += 1
+
+        score += max(-5, min(10, momentum_score))  # Cap between -5 and 10
+        details['breakdown']['momentum'] = momentum_score
+
+    # 6. Composite Risk Multiplier
+    # If multiple extreme factors are present, apply multiplier
+    extreme_factors = sum(1 for factor in ['EXTREME_SHORT_INTEREST', 'MAXED_UTILIZATION', 'EXTREME_BORROW_COST', 'EXTREME_DAYS_TO_COVER'] if factor in details['risk_factors'])
+
+    if extreme_factors >= 3:
+        score = min(100, score * 1.1)  # 10% bonus for triple threat
+        details['risk_factors'].append('TRIPLE_THREAT_MULTIPLIER')
+    elif extreme_factors >= 2:
+        score = min(100, score * 1.05)  # 5% bonus for double threat
+        details['risk_factors'].append('DOUBLE_THREAT_MULTIPLIER')
+
+    final_score = min(100, max(0, score))  # Ensure score is between 0-100
+    details['final_score'] = final_score
+
+    return final_score, details
+
+
+def load_profile_references():
+    """Per-ticker scorers each built-in profile must reproduce, normalized to (score, level, risks, breakdown)"""
+    import index_backup
+    import simplified
+
+    def from_metrics(result):
+        return (result['squeeze_score'], result['squeeze_type'], result.get('risk_factors'), result.get('score_breakdown'))
+
+    def professional(o, p):
+        score, details = professional_ladders(o, p)
+        return (score, index_backup.handler.get_squeeze_type(None, score), details['risk_factors'], details['breakdown'])
+
+    references = {name: (lambda scorer: lambda o, p: from_metrics(scorer(o, p)))(scorer)
+                  for name, scorer in load_scalar_scorers().items() if name != 'enhanced'}
+    references['simplified'] = lambda o, p: from_metrics(simplified.handler.calculate_squeeze_score(None, o, p))
+    references['professional'] = professional
+    references['index'] = root_index_formula
+    try:
+        import index_enhanced
+
+        def enhanced(o, p):
+            score = index_enhanced.OptimizedSqueezeAPI.calculate_enhanced_score(None, o, p)
+            return (score, None, None, None)
+        references['enhanced'] = enhanced
+    except ImportError:
+        pass
+    return references
+
+
+def check_profiles(ortex_rows, price_rows, repeat, only=None):
+    """Compare every profile against its per-ticker scorer on rows the scorer accepts"""
+    failures = 0
+    for name, reference in sorted(load_profile_references().items()):
+        if only and name != only:
+            continue
+        profile = profile_registry.get(name)
+
+        def evaluate(o, p):
+            evaluation = profile.evaluate(o, p)
+            if name == 'enhanced':
+                return (evaluation['score'], None, None, None)
+            if name == 'index':
+                return (evaluation['score'], evaluation['level'], None, None)
+            return (evaluation['score'], evaluation['level'], evaluation['risk_factors'], evaluation['breakdown'])
+
+        rows = [(o, p) for o, p in zip(ortex_rows, price_rows)
+                if not isinstance(scalar_or_error(reference, o, p), str)
+                and reference(o, p)[1] not in ('Error', 'Analysis Error')]
+        reference_time, expected = timed(lambda: [reference(o, p) for o, p in rows], repeat)
+        profile_time, actual = timed(lambda: [evaluate(o, p) for o, p in rows], repeat)
+
+        mismatches = [i for i, (a, b) in enumerate(zip(actual, expected)) if a != b]
+        failures += len(mismatches)
+        status = '✅ identical' if not mismatches else f"❌ {len(mismatches)} mismatches"
+        print(f"\n📐 profile {name}: {status} on {len(rows)} scoreable rows")
+        print(f"   per-ticker scorer   {reference_time * 1000:9.2f} ms")
+        print(f"   scoring profile     {profile_time * 1000:9.2f} ms")
+        if mismatches:
+            index = mismatches[0]
+            print(f"   row      {rows[index]}\n   expected {expected[index]}\n   actual   {actual[index]}")
+
+    profiles = profile_registry.resolve(profile_registry.names())
+    multi_time, _ = timed(lambda: [score_profiles(profiles, o, p) for o, p in zip(ortex_rows, price_rows)], repeat)
+    print(f"\n📐 all {len(profiles)} profiles in one pass: {multi_time * 1000:.2f} ms for {len(ortex_rows)} rows")
+    return failures
+
+
+def random_rows(count, seed=42):
+    """Random universe spanning every scoring band, plus edge rows the scalar scorers reject"""
+    rng = random.Random(seed)
+    ortex_rows, price_rows = [], []
+    for _ in range(count):
+        ortex_rows.append({
+            'short_interest': round(rng.uniform(0, 60), rng.choice((1, 2, 6))),
+            'utilization': round(rng.uniform(0, 100), 1),
+            'cost_to_borrow': rng.choice((round(rng.uniform(0, 120), 2), rng.randint(0, 60))),
+            'days_to_cover': round(rng.uniform(0, 20), 2)
+        })
+        price_rows.append({
+            'price_change_pct': round(rng.uniform(-30, 40), 2),
+            'price_change': round(rng.uniform(-15, 15), 2),
+            'volume': rng.randint(0, 80000000)
+        })
+
+    edge_cases = [
+        ({'short_interest': None}, {'price_change_pct': 1.0}),
+        ({'short_interest': 'n/a', 'utilization': 50}, {'price_change_pct': 1.0}),
+        ({'short_interest': float('nan')}, {'price_change_pct': 2.0}),
+        ({'short_interest': 10}, {'price_change_pct': float('nan')}),
+        ({'short_interest': 10}, {'price_change_pct': None}),
+        ({'short_interest': 10, 'days_to_cover': float('inf')}, {}),
+        ({}, {}),
+        ({'short_interest': 20, 'utilization': 80, 'cost_to_borrow': 20, 'days_to_cover': 5}, {'price_change_pct': 5}),
+        ({'short_interest': -4.5, 'days_to_cover': -1}, {'price_change_pct': -2}),
+        ({'short_interest': 12.5}, None)
+    ]
+    # Exact band edges, where >= vs > matters for the step ladders
+    for value in (40, 30, 20, 15, 10, 5, 2, 1, 0, -10, -10.01, 98, 95, 50):
+        edge_cases.append(({'short_interest': value, 'utilization': value, 'cost_to_borrow': value, 'days_to_cover': value},
+                           {'price_change': value, 'volume': 20000000 if value > 0 else 50000000}))
+    for ortex_row, price_row in edge_cases:
+        ortex_rows.append(ortex_row)
+        price_rows.append(price_row)
+    return ortex_rows, price_rows
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def scalar_or_error(scorer, ortex_row, price_row):
+    try:
+        return scorer(ortex_row, price_row)
+    except Exception as e:
+        return f"raised {type(e).__name__}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized scoring benchmark')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--model', help='benchmark a single model / profile')
+    parser.add_argument('--profiles-only', action='store_true', help='skip the NumPy batch scorer')
+    args = parser.parse_args()
+
+    ortex_rows, price_rows = random_rows(args.rows)
+    print(f"📊 {len(ortex_rows)} rows ({len(ortex_rows) - args.rows} edge cases), best of {args.repeat}")
+
+    failures = check_profiles(ortex_rows, price_rows, args.repeat, args.model)
+    if args.profiles_only:
+        return 1 if failures else 0
+    if not batch_scoring.available():
+        print("❌ NumPy is not installed - the batch scorer falls back to per-ticker scoring")
+        return 1
+
+    scorers = load_scalar_scorers()
+    for model, scalar in sorted(scorers.items()):
+        if args.model and model != args.model:
+            continue
+
+        scalar_time, expected = timed(
+            lambda: [scalar_or_error(scalar, o, p) for o, p in zip(ortex_rows, price_rows)], args.repeat
+        )
+        columns_time, columns = timed(lambda: batch_scoring.build_columns(ortex_rows, price_rows), args.repeat)
+        kernel_time, _ = timed(lambda: batch_scoring.score_batch(model, columns), args.repeat)
+        scorer = batch_scoring.BatchScorer(min_rows=0)
+        rows_time, actual = timed(
+            lambda: scorer.score_rows(model, ortex_rows, price_rows,
+                                      lambda o, p: scalar_or_error(scalar, o, p)),
+            args.repeat
+        )
+
+        mismatches = [i for i, (a, b) in enumerate(zip(actual, expected)) if a != b]
+        failures += len(mismatches)
+        status = '✅ identical' if not mismatches else f"❌ {len(mismatches)} mismatches (first at row {mismatches[0]})"
+        print(f"\n🎯 {model}: {status}")
+        print(f"   per-ticker scorer   {scalar_time * 1000:9.2f} ms")
+        print(f"   build_columns       {columns_time * 1000:9.2f} ms")
+        print(f"   score_batch kernel  {kernel_time * 1000:9.2f} ms  ({scalar_time / kernel_time:6.1f}x)")
+        print(f"   score_rows end-end  {rows_time * 1000:9.2f} ms  ({scalar_time / rows_time:6.1f}x)")
+        if mismatches:
+            index = mismatches[0]
+            print(f"   expected {expected[index]}\n   actual   {actual[index]}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
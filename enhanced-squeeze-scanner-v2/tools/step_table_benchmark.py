@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the precompiled step tables (scanner_core.step_tables)
+Scores a random universe and a typical low-band one with the original if/elif
+implementation of index_backup.calculate_squeeze_score (scoring_benchmark.professional_ladders),
+with the bisect tables it now uses and with the searchsorted batch model, asserts
+identical (score, details) output and prints timings
+
+    python tools/step_table_benchmark.py
+    python tools/step_table_benchmark.py --rows 100000 --repeat 3
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scanner_core import batch_scoring
+from scanner_core.step_tables import professional_scorer
+from scoring_benchmark import professional_ladders, random_rows, scalar_or_error, timed
+
+
+def typical_rows(count, seed=7):
+    """Most of a real universe sits in the bottom bands, where the if/elif ladders run longest"""
+    rng = random.Random(seed)
+    ortex_rows = [{
+        'short_interest': round(rng.uniform(0, 8), 2),
+        'utilization': round(rng.uniform(0, 50), 1),
+        'cost_to_borrow': round(rng.uniform(0, 2), 2),
+        'days_to_cover': round(rng.uniform(0, 2), 2)
+    } for _ in range(count)]
+    price_rows = [{'price_change': round(rng.uniform(-3, 3), 2), 'volume': rng.randint(0, 5000000)}
+                  for _ in range(count)]
+    return ortex_rows, price_rows
+
+
+def compare(name, expected, actual, rows):
+    """Exact comparison, including int vs float scores (they serialize differently)"""
+    mismatches = [i for i, (a, b) in enumerate(zip(actual, expected))
+                  if json.dumps(a, sort_keys=True) != json.dumps(b, sort_keys=True)]
+    status = '✅ identical' if not mismatches else f"❌ {len(mismatches)} mismatches"
+    print(f"   {name}: {status}")
+    if mismatches:
+        index = mismatches[0]
+        print(f"      row      {rows[index]}\n      expected {expected[index]}\n      actual   {actual[index]}")
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Step-table scoring micro-benchmark')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    import index_backup
+
+    def legacy(o, p):
+        return scalar_or_error(professional_ladders, o, p)
+
+    # The method never touches self
+    calculate = functools.partial(index_backup.handler.calculate_squeeze_score, None)
+
+    def tables(o, p):
+        return scalar_or_error(calculate, o, p)
+
+    failures = 0
+    for universe, (ortex_rows, price_rows) in (('random', random_rows(args.rows)), ('typical', typical_rows(args.rows))):
+        rows = list(zip(ortex_rows, price_rows))
+        print(f"\n📊 {universe}: {len(rows)} rows, best of {args.repeat}")
+
+        legacy_time, expected = timed(lambda: [legacy(o, p) for o, p in rows], args.repeat)
+        tables_time, actual = timed(lambda: [tables(o, p) for o, p in rows], args.repeat)
+        scoreable = [(o, p) for (o, p), result in zip(rows, expected) if isinstance(result, tuple)]
+        scoreable_time, _ = timed(lambda: [professional_ladders(o, p) for o, p in scoreable], args.repeat)
+        mask_time, _ = timed(lambda: [professional_scorer.score(o, p) for o, p in scoreable], args.repeat)
+
+        print("🪜 per-ticker")
+        failures += compare('bisect tables vs if/elif', expected, actual, rows)
+        print(f"   if/elif ladders       {legacy_time * 1000:9.2f} ms")
+        print(f"   bisect tables         {tables_time * 1000:9.2f} ms  ({legacy_time / tables_time:5.2f}x)")
+        print(f"   bit mask, no names    {mask_time * 1000:9.2f} ms  ({scoreable_time / mask_time:5.2f}x, scoreable rows)")
+
+        if not batch_scoring.available():
+            print("⚠️  NumPy is not installed - skipping the searchsorted batch model")
+            continue
+        scorer = batch_scoring.BatchScorer(min_rows=0)
+        columns_time, columns = timed(lambda: batch_scoring.build_columns(ortex_rows, price_rows), args.repeat)
+        kernel_time, _ = timed(lambda: batch_scoring.score_batch('professional', columns), args.repeat)
+        batch_time, batched = timed(lambda: scorer.score_rows('professional', ortex_rows, price_rows, legacy), args.repeat)
+
+        print("🧮 searchsorted batch")
+        failures += compare('batch vs if/elif', expected, batched, rows)
+        print(f"   build_columns         {columns_time * 1000:9.2f} ms")
+        print(f"   score_batch kernel    {kernel_time * 1000:9.2f} ms  ({legacy_time / kernel_time:5.1f}x)")
+        print(f"   score_rows end-end    {batch_time * 1000:9.2f} ms  ({legacy_time / batch_time:5.1f}x)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Local Yahoo Finance stub for testing the batched quote provider offline
+Serves /v7/finance/quote and /v8/finance/chart/<ticker> with deterministic prices
+
+    python tools/yahoo_stub_server.py --port 8765
+    YAHOO_BASE_URL=http://127.0.0.1:8765 python enhanced_integrated_server.py
+
+    python tools/yahoo_stub_server.py --check            # run the provider against the stub
+    python tools/yahoo_stub_server.py --check --fail-quote --drop AMC
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def stub_quote(ticker):
+    """Deterministic fake quote derived from the ticker"""
+    seed = zlib.crc32(ticker.encode('utf-8'))
+    previous_close = round(5 + seed % 50000 / 100, 2)
+    price = round(previous_close * (1 + ((seed >> 8) % 200 - 100) / 1000), 2)
+    return {
+        'symbol': ticker,
+        'regularMarketPrice': price,
+        'regularMarketPreviousClose': previous_close,
+        'regularMarketVolume': 100000 + seed % 5000000,
+        'marketCap': int(price * (1000000 + seed % 90000000))
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    fail_quote = False
+    drop = frozenset()
+    latency = 0.0
+    request_counts = {'quote': 0, 'chart': 0}
+    count_lock = threading.Lock()
+
+    def _count(self, name):
+        with self.count_lock:
+            self.request_counts[name] += 1
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urllib.parse.urlsplit(self.path)
+
+        if parsed.path == '/v7/finance/quote':
+            self._count('quote')
+            if self.fail_quote:
+                self._send_json(401, {'finance': {'error': {'code': 'Unauthorized'}}})
+                return
+            symbols = urllib.parse.parse_qs(parsed.query).get('symbols', [''])[0].split(',')
+            rows = [stub_quote(s.upper()) for s in symbols if s and s.upper() not in self.drop]
+            self._send_json(200, {'quoteResponse': {'result': rows, 'error': None}})
+            return
+
+        if parsed.path.startswith('/v8/finance/chart/'):
+            self._count('chart')
+            ticker = urllib.parse.unquote(parsed.path.rsplit('/', 1)[-1]).upper()
+            quote = stub_quote(ticker)
+            meta = {
+                'symbol': ticker,
+                'regularMarketPrice': quote['regularMarketPrice'],
+                'previousClose': quote['regularMarketPreviousClose'],
+                'regularMarketVolume': quote['regularMarketVolume']
+            }
+            self._send_json(200, {'chart': {'result': [{'meta': meta}], 'error': None}})
+            return
+
+        self._send_json(404, {'error': 'not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def run_check(port, tickers):
+    """Fetch prices through the real provider against the stub and print the outcome"""
+    from scanner_core.yahoo_quotes import YahooQuoteProvider
+
+    provider = YahooQuoteProvider(base_url=f'http://127.0.0.1:{port}', chunk_size=10)
+    start = time.time()
+    prices = provider.get_prices(tickers)
+    elapsed = time.time() - start
+
+    missing = [t for t in tickers if t not in prices]
+    mismatched = [t for t, entry in prices.items()
+                  if entry['current_price'] != stub_quote(t.upper())['regularMarketPrice']]
+    print(f"✅ {len(prices)}/{len(tickers)} tickers priced in {elapsed:.2f}s")
+    print(f"📡 Stub requests: {StubHandler.request_counts}")
+    print(f"📊 Provider stats: {provider.stats()}")
+    if missing or mismatched:
+        print(f"❌ Missing: {missing} | Mismatched: {mismatched}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yahoo Finance stub server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-quote', action='store_true', help='return 401 from the multi-symbol quote endpoint')
+    parser.add_argument('--drop', default='', help='comma-separated symbols to omit from quote responses')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of delay per request')
+    parser.add_argument('--check', action='store_true', help='run the provider against the stub and exit')
+    parser.add_argument('--tickers', type=int, default=120, help='number of tickers for --check')
+    args = parser.parse_args()
+
+    StubHandler.fail_quote = args.fail_quote
+    StubHandler.drop = frozenset(s.strip().upper() for s in args.drop.split(',') if s.strip())
+    StubHandler.latency = args.latency
+
+    server = StubServer(('127.0.0.1', args.port), StubHandler)
+    if not args.check:
+        print(f"🧪 Yahoo stub listening on http://127.0.0.1:{args.port}")
+        server.serve_forever()
+        return 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    tickers = [f'T{i:03d}' for i in range(args.tickers)] + sorted(StubHandler.drop)
+    try:
+        return run_check(args.port, tickers)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    sys.exit(main())